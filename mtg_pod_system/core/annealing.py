@@ -0,0 +1,118 @@
+import math
+import random
+import time
+from typing import List, Optional, Sequence
+
+class AnnealingOptimizer:
+    """Simulated annealing over pod assignments with per-pod scores and two-pod swap deltas
+
+    The score of a pod is its repeat pairings plus a seat-balance penalty for
+    putting players who already sat in many short pods into another one.
+    """
+
+    def __init__(self, matrix: List[Sequence[int]], short_pod_counts: Optional[Sequence[int]] = None,
+                 balance_weight: float = 1.0):
+        self.matrix = matrix
+        self.short_pod_counts = short_pod_counts or [0] * len(matrix)
+        self.balance_weight = balance_weight
+        self.last_moves = 0
+        self.last_schedule = 0
+
+    def pod_cost(self, members: Sequence[int], short: bool) -> float:
+        """Score of a single pod"""
+        matrix = self.matrix
+        cost = 0
+        for i, a in enumerate(members):
+            row = matrix[a]
+            for b in members[i + 1:]:
+                cost += row[b]
+        if short:
+            cost += self.balance_weight * sum(self.short_pod_counts[p] for p in members)
+        return cost
+
+    def total_cost(self, groups: List[List[int]], target_size: int) -> float:
+        """Score of a whole assignment"""
+        return sum(self.pod_cost(members, len(members) < target_size) for members in groups)
+
+    def optimize(self, groups: List[List[int]], target_size: int, time_budget: float = 0.5,
+                 start_temperature: float = 2.0, end_temperature: float = 0.05,
+                 max_moves: Optional[int] = None, rng=None,
+                 stop_after: Optional[int] = None) -> List[List[int]]:
+        """Anneal from start to end temperature over the time budget and return the best assignment seen
+
+        Cooling follows the move count: without max_moves, the first 1024
+        moves estimate how many fit in the budget. The moves run and that
+        schedule are kept in last_moves and last_schedule; passing them back
+        as stop_after and max_moves replays the run exactly.
+        """
+        self.last_moves = 0
+        self.last_schedule = max_moves or 0
+        if len(groups) < 2:
+            return groups
+
+        rng = rng if rng is not None else random
+        matrix = self.matrix
+        short_counts = self.short_pod_counts
+        weight = self.balance_weight
+
+        short = [len(members) < target_size for members in groups]
+        location = {}
+        for g, members in enumerate(groups):
+            for slot, player in enumerate(members):
+                location[player] = (g, slot)
+
+        players = list(location)
+        cost = self.total_cost(groups, target_size)
+        best_cost, best_groups = cost, [list(members) for members in groups]
+
+        started = time.perf_counter()
+        cooling = math.log(end_temperature / start_temperature)
+        temperature = start_temperature
+        moves = 0
+        schedule = max_moves
+
+        while best_cost > 0 and (stop_after is None or moves < stop_after):
+            if schedule and moves >= schedule:
+                break
+            if moves & 1023 == 1023:
+                elapsed = time.perf_counter() - started
+                if not schedule and elapsed > 0 and math.isfinite(time_budget):
+                    schedule = max(2048, int(moves * time_budget / elapsed))
+                if elapsed >= time_budget:
+                    break
+                # Geometric cooling by the fraction of scheduled moves made
+                if schedule:
+                    temperature = start_temperature * math.exp(cooling * min(moves / schedule, 1.0))
+            moves += 1
+
+            a = rng.choice(players)
+            b = rng.choice(players)
+            ga, slot_a = location[a]
+            gb, slot_b = location[b]
+            if ga == gb:
+                continue
+            pod_a, pod_b = groups[ga], groups[gb]
+            row_a, row_b = matrix[a], matrix[b]
+
+            # Swap delta only depends on the two affected pods
+            delta_a = sum(row_b[x] for x in pod_a) - row_b[a] - sum(row_a[x] for x in pod_a)
+            delta_b = sum(row_a[y] for y in pod_b) - row_a[b] - sum(row_b[y] for y in pod_b)
+            if short[ga] != short[gb]:
+                moved = weight * (short_counts[b] - short_counts[a])
+                delta_a += moved if short[ga] else 0
+                delta_b -= moved if short[gb] else 0
+            delta = delta_a + delta_b
+
+            if delta <= 0 or rng.random() < math.exp(-delta / temperature):
+                pod_a[slot_a] = b
+                pod_b[slot_b] = a
+                location[a] = (gb, slot_b)
+                location[b] = (ga, slot_a)
+                cost += delta
+                if cost < best_cost:
+                    best_cost, best_groups = cost, [list(members) for members in groups]
+
+        self.last_moves = moves
+        self.last_schedule = schedule or 0
+        groups[:] = best_groups
+        return groups
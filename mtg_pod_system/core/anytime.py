@@ -0,0 +1,101 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+class AnytimeSearch:
+    """Background search that always holds a valid best-so-far assignment
+
+    Each improvement is put on the updates queue and passed to the optional
+    callback as {"pods", "repeat_pairs", "elapsed", "final"}. The search
+    stops at its deadline, when no repeats are left, when it can make no
+    further progress, or when cancelled.
+    """
+
+    def __init__(self, pods: List[Any], cost: int,
+                 callback: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.updates: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self.callback = callback
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._finished = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pods = pods
+        self._cost = cost
+        self.initial_repeat_pairs = cost
+        self._publish(pods, cost, final=False)
+
+    def _publish(self, pods: List[Any], cost: int, final: bool):
+        """Record a new best assignment and report it"""
+        with self._lock:
+            self._pods, self._cost = pods, cost
+        update = {
+            "pods": pods,
+            "repeat_pairs": cost,
+            "elapsed": time.perf_counter() - self.started,
+            "final": final
+        }
+        self.updates.put(update)
+        if self.callback is not None:
+            self.callback(update)
+
+    def start(self, step: Callable[[], Optional[int]], snapshot: Callable[[], List[Any]], time_budget: float,
+              on_finish: Optional[Callable[[List[Any]], None]] = None, max_steps: Optional[int] = None):
+        """Run step() repeatedly on a daemon thread; snapshot() builds pods whenever it improved
+
+        step() returns the new cost, or None when it can change nothing, such
+        as with a single pod, which ends the search. With max_steps the search
+        stops after that many steps at the latest.
+        """
+        deadline = self.started + time_budget
+
+        def run():
+            steps = 0
+            try:
+                while self._cost > 0 and not self._cancelled.is_set() and time.perf_counter() < deadline:
+                    if max_steps is not None and steps >= max_steps:
+                        break
+                    steps += 1
+                    cost = step()
+                    if cost is None:
+                        break
+                    if cost < self._cost:
+                        self._publish(snapshot(), cost, final=False)
+            finally:
+                if on_finish is not None:
+                    on_finish(self._pods)
+                self._publish(self._pods, self._cost, final=True)
+                self._finished.set()
+
+        self._thread = threading.Thread(target=run, name="anytime-pod-search", daemon=True)
+        self._thread.start()
+
+    def finish(self):
+        """Mark a search that needs no background work as complete"""
+        self._publish(self._pods, self._cost, final=True)
+        self._finished.set()
+
+    @property
+    def pods(self) -> List[Any]:
+        """Best assignment found so far"""
+        with self._lock:
+            return self._pods
+
+    @property
+    def repeat_pairs(self) -> int:
+        """Repeat pairings in the best assignment so far"""
+        with self._lock:
+            return self._cost
+
+    @property
+    def done(self) -> bool:
+        return self._finished.is_set()
+
+    def cancel(self):
+        """Stop improving; the best assignment so far is kept"""
+        self._cancelled.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the search has stopped, returns False on timeout"""
+        return self._finished.wait(timeout)
@@ -0,0 +1,83 @@
+import random
+from typing import List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; scoring falls back to plain Python
+    np = None
+
+class BatchEvaluator:
+    """Scores many candidate assignments for repeat pairings at once"""
+
+    def __init__(self, matrix: List[Sequence[int]], sizes: Sequence[int]):
+        self.sizes = list(sizes)
+        self.player_count = sum(self.sizes)
+        # Sparse rows from very large rosters are scored in plain Python
+        self.use_numpy = np is not None and all(isinstance(row, list) for row in matrix[:1])
+        if self.use_numpy:
+            self.matrix = np.asarray(matrix, dtype=np.int32).reshape(self.player_count, self.player_count)
+            # Consecutive pods of the same size are scored together
+            self.segments = []
+            start = 0
+            for size in self.sizes:
+                if self.segments and self.segments[-1][1] == size:
+                    seg_start, seg_size, count = self.segments[-1]
+                    self.segments[-1] = (seg_start, seg_size, count + 1)
+                else:
+                    self.segments.append((start, size, 1))
+                start += size
+        else:
+            self.matrix = matrix
+
+    def random_candidates(self, count: int, rng=None):
+        """Build a (count, n) batch of random player orders"""
+        rng = rng if rng is not None else random
+        if self.use_numpy:
+            generator = np.random.default_rng(rng.getrandbits(64))
+            return np.argsort(generator.random((count, self.player_count)), axis=1).astype(np.int32)
+
+        candidates = []
+        for _ in range(count):
+            order = list(range(self.player_count))
+            rng.shuffle(order)
+            candidates.append(order)
+        return candidates
+
+    def score(self, candidates) -> List[int]:
+        """Repeat pairings for each candidate order split by the planned pod sizes"""
+        if self.use_numpy:
+            return self._score_numpy(candidates).tolist()
+        return [self._score_python(order) for order in candidates]
+
+    def _score_numpy(self, candidates):
+        """Vectorized scoring over every candidate and every pod of a size at once"""
+        candidates = np.asarray(candidates)
+        costs = np.zeros(candidates.shape[0], dtype=np.int64)
+        for start, size, count in self.segments:
+            # (K, pods, size) block of player indices
+            block = candidates[:, start:start + size * count].reshape(-1, count, size)
+            for i in range(size):
+                for j in range(i + 1, size):
+                    costs += self.matrix[block[:, :, i], block[:, :, j]].sum(axis=1)
+        return costs
+
+    def _score_python(self, order: Sequence[int]) -> int:
+        """Score one candidate order"""
+        matrix = self.matrix
+        cost = 0
+        start = 0
+        for size in self.sizes:
+            members = order[start:start + size]
+            for i, a in enumerate(members):
+                row = matrix[a]
+                for b in members[i + 1:]:
+                    cost += row[b]
+            start += size
+        return cost
+
+    def best_of(self, count: int, rng=None) -> Tuple[int, List[int]]:
+        """Generate a batch of candidates and return the lowest cost with its order"""
+        candidates = self.random_candidates(count, rng)
+        costs = self.score(candidates)
+        best = min(range(len(costs)), key=costs.__getitem__)
+        return costs[best], [int(p) for p in candidates[best]]
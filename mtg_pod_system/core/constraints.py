@@ -0,0 +1,157 @@
+import random
+from typing import Dict, List, Optional, Sequence, Set
+
+class UnionFind:
+    """Disjoint sets over 0..n-1 with path halving and union by size"""
+
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+        self.size = [1] * n
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> int:
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return a
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        return a
+
+class PodConstraints:
+    """Keep-together groups and keep-apart pairs that pod assignments must respect
+
+    Names are matched case-insensitively; rules naming players who are not
+    in the current roster are ignored.
+    """
+
+    def __init__(self, keep_together: Sequence[Sequence[str]] = (),
+                 keep_apart: Sequence[Sequence[str]] = ()):
+        self.keep_together = [list(group) for group in keep_together]
+        self.keep_apart = [list(pair) for pair in keep_apart]
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "PodConstraints":
+        """Constraints stored in the configuration"""
+        return cls(config.get("keep_together", []), config.get("keep_apart", []))
+
+    def describe(self) -> Dict[str, List[List[str]]]:
+        """Rules in the configuration form, which from_config reads back"""
+        return {"keep_together": [list(group) for group in self.keep_together],
+                "keep_apart": [list(pair) for pair in self.keep_apart]}
+
+    def __bool__(self) -> bool:
+        return bool(self.keep_together or self.keep_apart)
+
+    def build_units(self, players: Sequence[str], max_size: int) -> List[List[str]]:
+        """Merge keep-together groups into units, rejecting contradictory rules"""
+        index = {name.casefold(): i for i, name in enumerate(players)}
+        sets = UnionFind(len(players))
+        for group in self.keep_together:
+            members = [index[name.casefold()] for name in group if name.casefold() in index]
+            for member in members[1:]:
+                sets.union(members[0], member)
+
+        for a, b in self._apart_pairs(index):
+            if sets.find(a) == sets.find(b):
+                raise ValueError(f"{players[a]} and {players[b]} must be kept both together and apart")
+
+        units: Dict[int, List[str]] = {}
+        for i, name in enumerate(players):
+            units.setdefault(sets.find(i), []).append(name)
+        for members in units.values():
+            if len(members) > max_size:
+                raise ValueError(f"Keep-together group is larger than {max_size} players: {', '.join(members)}")
+        return list(units.values())
+
+    def _apart_pairs(self, index: Dict[str, int]) -> List[Sequence[int]]:
+        """Keep-apart rules as roster positions, skipping absent players"""
+        pairs = []
+        for rule in self.keep_apart:
+            if len(rule) == 2 and rule[0].casefold() in index and rule[1].casefold() in index:
+                pairs.append((index[rule[0].casefold()], index[rule[1].casefold()]))
+        return pairs
+
+    def assign(self, players: Sequence[str], sizes: Sequence[int], rng=None,
+               attempts: int = 20) -> List[List[str]]:
+        """Split players into pods of the given sizes honouring every rule"""
+        rng = rng if rng is not None else random
+        max_size = max(sizes) if sizes else 0
+        units = self.build_units(players, max_size)
+
+        index = {name.casefold(): i for i, name in enumerate(players)}
+        unit_of = {}
+        for u, members in enumerate(units):
+            for name in members:
+                unit_of[index[name.casefold()]] = u
+        conflicts: List[Set[int]] = [set() for _ in units]
+        for a, b in self._apart_pairs(index):
+            conflicts[unit_of[a]].add(unit_of[b])
+            conflicts[unit_of[b]].add(unit_of[a])
+
+        for attempt in range(max(1, attempts)):
+            # Best fit first; retries place units into randomly chosen pods that fit
+            groups = self._place(units, conflicts, sizes, rng, best_fit=attempt == 0)
+            if groups is not None:
+                return groups
+        raise ValueError(f"Cannot satisfy pod constraints with pods of {min(sizes)}-{max_size} players")
+
+    @staticmethod
+    def _place(units: List[List[str]], conflicts: List[Set[int]], sizes: Sequence[int],
+               rng, best_fit: bool = True) -> Optional[List[List[str]]]:
+        """Biggest and most constrained units first, each into the fullest pod it fits without conflict"""
+        order = list(range(len(units)))
+        rng.shuffle(order)
+        order.sort(key=lambda u: (len(units[u]), len(conflicts[u])), reverse=True)
+
+        # Pods bucketed by free seats; position lets a pod leave its bucket in O(1)
+        max_size = max(sizes)
+        buckets: List[List[int]] = [[] for _ in range(max_size + 1)]
+        position = [0] * len(sizes)
+        free = list(sizes)
+        pod_ids = list(range(len(sizes)))
+        rng.shuffle(pod_ids)
+        for pod in pod_ids:
+            position[pod] = len(buckets[free[pod]])
+            buckets[free[pod]].append(pod)
+
+        groups: List[List[str]] = [[] for _ in sizes]
+        pod_of = [-1] * len(units)
+        for u in order:
+            need = len(units[u])
+            blocked = {pod_of[v] for v in conflicts[u] if pod_of[v] >= 0}
+            chosen = -1
+            levels = list(range(need, max_size + 1))
+            if not best_fit:
+                rng.shuffle(levels)
+            for seats in levels:
+                bucket = buckets[seats]
+                # At most len(blocked) pods are skipped before a usable one
+                for pod in bucket[:len(blocked) + 1]:
+                    if pod not in blocked:
+                        chosen = pod
+                        break
+                if chosen >= 0:
+                    break
+            if chosen < 0:
+                return None
+
+            bucket = buckets[free[chosen]]
+            last = bucket.pop()
+            if last != chosen:
+                bucket[position[chosen]] = last
+                position[last] = position[chosen]
+            free[chosen] -= need
+            position[chosen] = len(buckets[free[chosen]])
+            buckets[free[chosen]].append(chosen)
+
+            groups[chosen].extend(units[u])
+            pod_of[u] = chosen
+        return groups
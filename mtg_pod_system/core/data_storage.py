@@ -1,18 +1,43 @@
+import hashlib
 import json
 import os
+import re
 import shutil
+import threading
+from collections import deque
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
+
+from core.pair_counts import PairCounts
+from core.seating import SeatingEngine
+
+HISTORY_SEGMENT_PATTERN = re.compile(r"^history\.(\d+)\.jsonl$")
 
 class DataStorage:
     """Handles data storage and backup operations"""
     
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: str = "data", history_mode: str = "jsonl"):
         self.data_dir = data_dir
         self.backup_dir = os.path.join(data_dir, "backups")
+        self.backup_objects_dir = os.path.join(self.backup_dir, "objects")
+        self.backup_manifest_dir = os.path.join(self.backup_dir, "manifests")
         self.players_file = os.path.join(data_dir, "players.json")
         self.config_file = os.path.join(data_dir, "config.json")
         self.history_file = os.path.join(data_dir, "history.json")
+        self.history_log_file = os.path.join(data_dir, "history.jsonl")
+        self.schedule_file = os.path.join(data_dir, "schedule.json")
+        self.seat_counts_file = os.path.join(data_dir, "seat_counts.json")
+        self.history_mode = history_mode
+        self.max_history_items = 50
+        self.max_backups = 10
+        self._log_lines: Optional[int] = None
+        self._log_lock = threading.Lock()
+        # Parsed file contents keyed by path, valid while (st_mtime_ns, st_size) match
+        self._cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+        # Recent history log entries keyed by limit, valid while the log signature matches
+        self._recent_cache: Dict[int, Tuple[Any, List[Dict[str, Any]]]] = {}
+        # Pair counts over the history window, its signature and the entries counted
+        self._pair_counts: Optional[Tuple[Any, PairCounts, deque]] = None
         self._ensure_directories()
     
     def _ensure_directories(self):
@@ -21,33 +46,64 @@ class DataStorage:
             if not os.path.exists(directory):
                 os.makedirs(directory)
     
+    @staticmethod
+    def _file_signature(filename: str) -> Optional[Tuple[int, int]]:
+        """Modification time and size used to detect changes on disk"""
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    @staticmethod
+    def _copy_data(data: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy a document deep enough that callers can't modify the cached one"""
+        return {key: list(value) if isinstance(value, list) else value for key, value in data.items()}
+    
     def save_json(self, filename: str, data: Dict[str, Any]) -> bool:
         """Save data to JSON file"""
         try:
             data['last_saved'] = datetime.now().isoformat()
             with open(filename, 'w') as f:
                 json.dump(data, f, indent=2)
+            
+            # Write through so the next load doesn't re-read the file
+            signature = self._file_signature(filename)
+            if signature is not None:
+                self._cache[filename] = (signature, self._copy_data(data))
             return True
         except Exception as e:
+            self._cache.pop(filename, None)
             print(f"Error saving {filename}: {e}")
             return False
     
     def load_json(self, filename: str) -> Optional[Dict[str, Any]]:
-        """Load data from JSON file"""
+        """Load data from JSON file, reusing the parsed copy while the file is unchanged"""
         try:
-            if os.path.exists(filename):
-                with open(filename, 'r') as f:
-                    return json.load(f)
-            return {}
+            signature = self._file_signature(filename)
+            if signature is None:
+                self._cache.pop(filename, None)
+                return {}
+            
+            cached = self._cache.get(filename)
+            if cached is not None and cached[0] == signature:
+                return self._copy_data(cached[1])
+            
+            with open(filename, 'r') as f:
+                data = json.load(f)
+            self._cache[filename] = (signature, data)
+            return self._copy_data(data)
         except Exception as e:
+            self._cache.pop(filename, None)
             print(f"Error loading {filename}: {e}")
             return {}
     
-    def save_players(self, players: List[str]) -> bool:
-        """Save player list"""
+    def save_players(self, players: List[str], ratings: Optional[Dict[str, float]] = None) -> bool:
+        """Save player list, keeping the stored ratings unless new ones are given"""
         data = {
             "players": players,
-            "count": len(players)
+            "count": len(players),
+            "ratings": ratings if ratings is not None else self.load_ratings()
         }
         return self.save_json(self.players_file, data)
     
@@ -56,8 +112,14 @@ class DataStorage:
         data = self.load_json(self.players_file)
         return data.get("players", [])
     
+    def load_ratings(self) -> Dict[str, float]:
+        """Load player ratings by name"""
+        data = self.load_json(self.players_file)
+        return dict(data.get("ratings", {}))
+    
     def save_config(self, config: Dict[str, Any]) -> bool:
         """Save configuration"""
+        self._apply_config(config)
         return self.save_json(self.config_file, config)
     
     def load_config(self) -> Dict[str, Any]:
@@ -66,15 +128,43 @@ class DataStorage:
             "default_pod_size": 4,
             "max_pod_size": 8,
             "min_pod_size": 3,
+            "allowed_pod_sizes": [],
+            "pod_size_weights": {},
             "auto_save": True,
             "keep_history": True,
-            "max_history_items": 50
+            "max_history_items": 50,
+            "pairing_mode": "avoid_repeats",
+            "pairing_time_budget": 0.5,
+            "anytime_time_budget": 5.0,
+            "batch_candidates": 256,
+            "annealing_start_temperature": 2.0,
+            "annealing_end_temperature": 0.05,
+            "annealing_max_moves": 0,
+            "seat_balance_weight": 1.0,
+            "balance_seating": True,
+            "default_rating": 1500.0,
+            "keep_together": [],
+            "keep_apart": [],
+            "history_mode": "jsonl",
+            "storage_backend": "json",
+            "max_backups": 10
         }
         data = self.load_json(self.config_file)
-        return {**default_config, **data}
+        config = {**default_config, **data}
+        self._apply_config(config)
+        return config
+    
+    def _apply_config(self, config: Dict[str, Any]):
+        """Pick up storage-related settings from the configuration"""
+        self.history_mode = config.get("history_mode", self.history_mode)
+        self.max_history_items = config.get("max_history_items", self.max_history_items)
+        self.max_backups = config.get("max_backups", self.max_backups)
     
     def save_history(self, history: List[Dict[str, Any]]) -> bool:
         """Save pod assignment history"""
+        if self.history_mode == "jsonl":
+            return self._rewrite_history_log(history)
+        
         data = {
             "history": history,
             "count": len(history)
@@ -83,41 +173,435 @@ class DataStorage:
     
     def load_history(self) -> List[Dict[str, Any]]:
         """Load pod assignment history"""
+        if self.history_mode == "jsonl" and self._history_log_exists():
+            return self.load_recent_history(self.max_history_items)
+        
         data = self.load_json(self.history_file)
         return data.get("history", [])
     
+    def append_history(self, entry: Dict[str, Any]) -> bool:
+        """Add one assignment to history, keeping only the most recent items"""
+        if self.history_mode != "jsonl":
+            previous_signature = self._history_signature()
+            history = self.load_history()
+            history.append(entry)
+            if not self.save_history(history[-self.max_history_items:]):
+                return False
+            self._track_pairings(entry, previous_signature)
+            return True
+        
+        try:
+            with self._log_lock:
+                if not self._history_log_exists():
+                    # Carry over entries from the legacy history file on first use
+                    legacy = self.load_json(self.history_file).get("history", [])
+                    if legacy and not self._rewrite_history_log(legacy[-self.max_history_items:]):
+                        return False
+                
+                if self._log_lines is None:
+                    self._log_lines = self._count_lines(self.history_log_file)
+                    self._terminate_partial_line(self.history_log_file)
+                
+                previous_signature = self._history_log_signature()
+                
+                # One compact line per assignment; a torn final line is skipped on read
+                line = json.dumps(entry, separators=(',', ':')) + "\n"
+                with open(self.history_log_file, 'a') as f:
+                    f.write(line)
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._log_lines += 1
+                
+                if self._log_lines >= self.max_history_items:
+                    self._rotate_history_log()
+                self._update_recent_cache(entry, previous_signature)
+                self._track_pairings(entry, previous_signature)
+            return True
+        except Exception as e:
+            print(f"Error appending to {self.history_log_file}: {e}")
+            return False
+    
+    def load_recent_history(self, limit: int) -> List[Dict[str, Any]]:
+        """Load the most recent history entries, oldest first"""
+        if self.history_mode != "jsonl" or not self._history_log_exists():
+            return self.load_history()[-limit:] if limit > 0 else []
+        return self._read_history_log(limit)
+    
+    def _read_history_log(self, limit: int) -> List[Dict[str, Any]]:
+        """Read the most recent entries of the history log and its segments, oldest first"""
+        signature = self._history_log_signature()
+        segments = list(signature[1])
+        cached = self._recent_cache.get(limit)
+        if cached is not None and cached[0] == signature:
+            return list(cached[1])
+        
+        entries: List[Dict[str, Any]] = []
+        paths = [self.history_log_file] + segments[::-1]
+        for path in paths:
+            if len(entries) >= limit:
+                break
+            wanted = limit - len(entries)
+            count = wanted
+            while True:
+                try:
+                    lines = self._tail_lines(path, count)
+                except FileNotFoundError:
+                    lines = []  # Pruned by a background rotation since it was listed
+                parsed = []
+                for line in lines:
+                    try:
+                        parsed.append(json.loads(line))
+                    except ValueError:
+                        continue  # Incomplete write
+                # Read further back to make up for skipped lines
+                if len(parsed) >= wanted or len(lines) < count:
+                    break
+                count += wanted - len(parsed)
+            entries = parsed[-wanted:] + entries
+        
+        entries = entries[-limit:] if limit > 0 else []
+        self._recent_cache[limit] = (signature, entries)
+        return list(entries)
+    
+    def _read_history_files(self) -> List[Dict[str, Any]]:
+        """History kept in the JSON files, from the log if started or else history.json"""
+        if self._history_log_exists():
+            return self._read_history_log(self.max_history_items)
+        return self.load_json(self.history_file).get("history", [])
+    
+    def _history_log_signature(self) -> Tuple[Optional[Tuple[int, int]], Tuple[str, ...]]:
+        """Change signature covering the current log and its retired segments"""
+        return (self._file_signature(self.history_log_file), tuple(self._history_segments()))
+    
+    def _update_recent_cache(self, entry: Dict[str, Any], previous_signature: Any):
+        """Write a newly appended entry through to the cached recent history"""
+        signature = self._history_log_signature()
+        for limit, (cached_signature, entries) in list(self._recent_cache.items()):
+            if cached_signature != previous_signature:
+                del self._recent_cache[limit]  # Already stale before this append
+                continue
+            self._recent_cache[limit] = (signature, (entries + [entry])[-limit:] if limit > 0 else [])
+    
+    def _history_signature(self) -> Any:
+        """Change signature of whatever load_history currently reads"""
+        if self.history_mode == "jsonl" and self._history_log_exists():
+            return self._history_log_signature()
+        return self._file_signature(self.history_file)
+    
+    def load_pair_counts(self) -> PairCounts:
+        """How often players shared a pod across the history window
+        
+        The store is kept up to date by append_history and only rebuilt when
+        history changed some other way. Callers must not modify it.
+        """
+        signature = self._history_signature()
+        if self._pair_counts is None or self._pair_counts[0] != signature:
+            history = self.load_history()
+            self._pair_counts = (signature, PairCounts.from_history(history), deque(history))
+        return self._pair_counts[1]
+    
+    def _track_pairings(self, entry: Dict[str, Any], previous_signature: Any):
+        """Count a newly appended entry, dropping the one that left the history window"""
+        if self._pair_counts is None:
+            return
+        signature, pair_counts, window = self._pair_counts
+        if signature != previous_signature:
+            self._pair_counts = None  # Already stale before this append
+            return
+        
+        pair_counts.add_entry(entry)
+        window.append(entry)
+        while len(window) > self.max_history_items:
+            pair_counts.remove_entry(window.popleft())
+        self._pair_counts = (self._history_signature(), pair_counts, window)
+    
+    def load_seat_counts(self) -> Dict[str, List[int]]:
+        """Games each player has played from each seat position"""
+        data = self.load_json(self.seat_counts_file)
+        return {name: list(counts) for name, counts in data.get("players", {}).items()}
+    
+    def record_seating(self, entry: Dict[str, Any]) -> bool:
+        """Add the seat order of a saved assignment to the stored seat counts"""
+        seating = SeatingEngine(self.load_seat_counts())
+        seating.record_entry(entry)
+        data = {
+            "players": seating.seat_counts,
+            "last_updated": entry.get("timestamp", datetime.now().isoformat())
+        }
+        return self.save_json(self.seat_counts_file, data)
+    
+    def save_schedule(self, rounds: List[List[Dict[str, Any]]], current_round: int = 0,
+                      reached_round: Optional[int] = None,
+                      generation: Optional[Dict[str, Any]] = None) -> bool:
+        """Save a multi-round schedule, the round currently in play and the furthest round reached
+        
+        generation records how the schedule was made, for its rounds' history entries.
+        """
+        data = {
+            "rounds": rounds,
+            "round_count": len(rounds),
+            "current_round": current_round,
+            "reached_round": current_round if reached_round is None else max(reached_round, current_round),
+            "generation": generation
+        }
+        return self.save_json(self.schedule_file, data)
+    
+    def load_schedule(self) -> Dict[str, Any]:
+        """Load the saved schedule, empty if none exists"""
+        data = self.load_json(self.schedule_file)
+        return {
+            "rounds": data.get("rounds", []),
+            "current_round": data.get("current_round", 0),
+            "reached_round": data.get("reached_round", data.get("current_round", 0)),
+            "generation": data.get("generation")
+        }
+    
+    def _history_log_exists(self) -> bool:
+        """Check whether the append-only history log has been started"""
+        return os.path.exists(self.history_log_file) or bool(self._history_segments())
+    
+    def _history_segments(self) -> List[str]:
+        """Retired history log segments, oldest first"""
+        if not os.path.exists(self.data_dir):
+            return []
+        
+        segments = []
+        for item in os.listdir(self.data_dir):
+            match = HISTORY_SEGMENT_PATTERN.match(item)
+            if match:
+                segments.append((int(match.group(1)), os.path.join(self.data_dir, item)))
+        return [path for _, path in sorted(segments)]
+    
+    def _rotate_history_log(self):
+        """Retire the current log segment and prune old ones in the background"""
+        segments = self._history_segments()
+        next_number = 1
+        if segments:
+            next_number = int(HISTORY_SEGMENT_PATTERN.match(os.path.basename(segments[-1])).group(1)) + 1
+        
+        os.replace(self.history_log_file, os.path.join(self.data_dir, f"history.{next_number}.jsonl"))
+        self._log_lines = 0
+        
+        # The newest retired segment already covers max_history_items entries
+        stale = self._history_segments()[:-1]
+        if stale:
+            threading.Thread(target=self._remove_files, args=(stale,), daemon=True).start()
+    
+    def _rewrite_history_log(self, history: List[Dict[str, Any]]) -> bool:
+        """Replace the history log with the given entries"""
+        try:
+            temp_file = self.history_log_file + ".tmp"
+            with open(temp_file, 'w') as f:
+                for entry in history:
+                    f.write(json.dumps(entry, separators=(',', ':')) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.history_log_file)
+            self._remove_files(self._history_segments())
+            self._log_lines = len(history)
+            self._recent_cache.clear()
+            return True
+        except Exception as e:
+            print(f"Error saving {self.history_log_file}: {e}")
+            return False
+    
+    @staticmethod
+    def _remove_files(paths: List[str]):
+        """Delete files, ignoring ones that are already gone"""
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    
+    @staticmethod
+    def _count_lines(path: str) -> int:
+        """Count lines in a file without parsing it"""
+        if not os.path.exists(path):
+            return 0
+        with open(path, 'rb') as f:
+            return sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(65536), b""))
+    
+    @staticmethod
+    def _terminate_partial_line(path: str):
+        """Make sure a line torn by an interrupted write does not swallow the next entry"""
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return
+        with open(path, 'rb+') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+    
+    @staticmethod
+    def _tail_lines(path: str, limit: int) -> List[bytes]:
+        """Read the last lines of a file by scanning backwards from the end"""
+        if limit <= 0:
+            return []
+        
+        with open(path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            buffer = b""
+            while position > 0 and buffer.count(b"\n") <= limit:
+                step = min(8192, position)
+                position -= step
+                f.seek(position)
+                buffer = f.read(step) + buffer
+        
+        lines = buffer.splitlines()
+        if position > 0:
+            lines = lines[1:]  # First line may be cut off
+        return [line for line in lines if line.strip()][-limit:]
+    
+    def _backup_files(self) -> List[str]:
+        """Data files included in backups"""
+        data_files = [
+            self.players_file, self.config_file, self.history_file,
+            self.history_log_file, self.schedule_file, self.seat_counts_file
+        ]
+        return data_files + self._history_segments()
+    
+    def _hash_file(self, filename: str) -> str:
+        """SHA-256 of a file's content"""
+        digest = hashlib.sha256()
+        with open(filename, 'rb') as f:
+            for chunk in iter(lambda: f.read(65536), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def _object_path(self, digest: str) -> str:
+        """Location of a content-addressed backup object"""
+        return os.path.join(self.backup_objects_dir, digest[:2], digest)
+    
+    def _store_object(self, filename: str, digest: str):
+        """Add a file to the object store unless identical content is already there"""
+        object_path = self._object_path(digest)
+        if os.path.exists(object_path):
+            return
+        
+        os.makedirs(os.path.dirname(object_path), exist_ok=True)
+        # Retired history segments are never rewritten, so they can share the inode
+        if HISTORY_SEGMENT_PATTERN.match(os.path.basename(filename)):
+            try:
+                os.link(filename, object_path)
+                return
+            except OSError:
+                pass
+        
+        temp_path = object_path + ".tmp"
+        shutil.copy2(filename, temp_path)
+        os.replace(temp_path, object_path)
+    
+    def _read_manifest(self, backup_name: str) -> Optional[Dict[str, Any]]:
+        """Load a backup manifest, or None if there is no such backup"""
+        manifest_file = os.path.join(self.backup_manifest_dir, f"{backup_name}.json")
+        if not os.path.exists(manifest_file):
+            return None
+        with open(manifest_file, 'r') as f:
+            return json.load(f)
+    
     def create_backup(self) -> bool:
         """Create backup of all data files"""
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_folder = os.path.join(self.backup_dir, f"backup_{timestamp}")
-            os.makedirs(backup_folder)
+            os.makedirs(self.backup_manifest_dir, exist_ok=True)
+            # Microseconds keep names unique and sortable for backups made in the same second
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+            backup_name = f"backup_{timestamp}"
             
-            # Backup all data files
-            for filename in [self.players_file, self.config_file, self.history_file]:
+            # Store each file once by content; the manifest just references it
+            files = {}
+            for filename in self._backup_files():
                 if os.path.exists(filename):
-                    basename = os.path.basename(filename)
-                    shutil.copy2(filename, os.path.join(backup_folder, basename))
+                    digest = self._hash_file(filename)
+                    self._store_object(filename, digest)
+                    files[os.path.basename(filename)] = {
+                        "sha256": digest,
+                        "size": os.path.getsize(filename)
+                    }
             
-            print(f"Backup created: {backup_folder}")
+            manifest = {
+                "created": datetime.now().isoformat(),
+                "files": files
+            }
+            manifest_file = os.path.join(self.backup_manifest_dir, f"{backup_name}.json")
+            with open(manifest_file + ".tmp", 'w') as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(manifest_file + ".tmp", manifest_file)
+            
+            self.prune_backups()
+            print(f"Backup created: {backup_name}")
             return True
         except Exception as e:
             print(f"Error creating backup: {e}")
             return False
     
+    def prune_backups(self, keep: Optional[int] = None) -> int:
+        """Delete all but the newest backups and unreferenced objects, returns number removed"""
+        keep = self.max_backups if keep is None else keep
+        if keep <= 0 or not os.path.exists(self.backup_manifest_dir):
+            return 0
+        
+        backups = self._manifest_backups()
+        removed = 0
+        for backup_name in backups[keep:]:
+            os.remove(os.path.join(self.backup_manifest_dir, f"{backup_name}.json"))
+            removed += 1
+        
+        # Backups of an empty data directory store no objects, so there may be no object store yet
+        if removed and os.path.isdir(self.backup_objects_dir):
+            referenced = set()
+            for backup_name in backups[:keep]:
+                manifest = self._read_manifest(backup_name) or {}
+                referenced.update(entry["sha256"] for entry in manifest.get("files", {}).values())
+            
+            for prefix in os.listdir(self.backup_objects_dir):
+                prefix_dir = os.path.join(self.backup_objects_dir, prefix)
+                if not os.path.isdir(prefix_dir):
+                    continue
+                for digest in os.listdir(prefix_dir):
+                    if digest not in referenced:
+                        os.remove(os.path.join(prefix_dir, digest))
+        
+        return removed
+    
     def restore_backup(self, backup_name: str) -> bool:
         """Restore from a backup"""
         try:
-            backup_path = os.path.join(self.backup_dir, backup_name)
-            if not os.path.exists(backup_path):
+            manifest = self._read_manifest(backup_name)
+            legacy_path = os.path.join(self.backup_dir, backup_name)
+            if manifest is None and not os.path.isdir(legacy_path):
                 print(f"Backup not found: {backup_name}")
                 return False
             
+            if manifest is not None:
+                sources = {
+                    filename: self._object_path(entry["sha256"])
+                    for filename, entry in manifest.get("files", {}).items()
+                }
+            else:
+                # Full-copy folder from before the object store
+                sources = {
+                    filename: os.path.join(legacy_path, filename)
+                    for filename in os.listdir(legacy_path)
+                    if os.path.isfile(os.path.join(legacy_path, filename))
+                }
+            
+            missing = [filename for filename, source in sources.items() if not os.path.exists(source)]
+            if missing:
+                print(f"Backup is incomplete, missing: {', '.join(missing)}")
+                return False
+            
+            # Current history log would shadow the restored history
+            self._remove_files([self.history_log_file] + self._history_segments())
+            self._log_lines = None
+            self._cache.clear()
+            self._recent_cache.clear()
+            
             # Restore files from backup
-            for filename in ["players.json", "config.json", "history.json"]:
-                backup_file = os.path.join(backup_path, filename)
-                if os.path.exists(backup_file):
-                    shutil.copy2(backup_file, os.path.join(self.data_dir, filename))
+            for filename, source in sources.items():
+                target = os.path.join(self.data_dir, filename)
+                shutil.copy2(source, target + ".tmp")
+                os.replace(target + ".tmp", target)
             
             print(f"Backup restored: {backup_name}")
             return True
@@ -125,15 +609,26 @@ class DataStorage:
             print(f"Error restoring backup: {e}")
             return False
     
+    def _manifest_backups(self) -> List[str]:
+        """Backups recorded in the manifest directory, most recent first"""
+        if not os.path.exists(self.backup_manifest_dir):
+            return []
+        
+        backups = [
+            item[:-len(".json")] for item in os.listdir(self.backup_manifest_dir)
+            if item.startswith("backup_") and item.endswith(".json")
+        ]
+        return sorted(backups, reverse=True)
+    
     def list_backups(self) -> List[str]:
         """List available backups"""
-        if not os.path.exists(self.backup_dir):
-            return []
+        backups = self._manifest_backups()
         
-        backups = []
-        for item in os.listdir(self.backup_dir):
-            if item.startswith("backup_") and os.path.isdir(os.path.join(self.backup_dir, item)):
-                backups.append(item)
+        # Older full-copy backup folders remain restorable
+        if os.path.exists(self.backup_dir):
+            for item in os.listdir(self.backup_dir):
+                if item.startswith("backup_") and os.path.isdir(os.path.join(self.backup_dir, item)):
+                    backups.append(item)
         
         return sorted(backups, reverse=True)  # Most recent first
     
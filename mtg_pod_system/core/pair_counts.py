@@ -0,0 +1,93 @@
+import heapq
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from core.player_registry import PlayerRegistry
+
+def pack_pair(a: int, b: int) -> int:
+    """Order-independent 64-bit key for a pair of 32-bit player IDs"""
+    return (a << 32) | b if a < b else (b << 32) | a
+
+def unpack_pair(key: int) -> Tuple[int, int]:
+    """Player IDs of a packed pair key, smaller first"""
+    return key >> 32, key & 0xFFFFFFFF
+
+class PairCounts:
+    """How often each pair of players shared a pod, storing only pairs that met"""
+
+    def __init__(self, registry: Optional[PlayerRegistry] = None):
+        self.registry = registry if registry is not None else PlayerRegistry()
+        self.counts: Dict[int, int] = {}
+
+    @classmethod
+    def from_history(cls, history: Iterable[Dict[str, Any]],
+                     registry: Optional[PlayerRegistry] = None) -> "PairCounts":
+        """Count pairings across stored history entries"""
+        pair_counts = cls(registry)
+        for entry in history:
+            pair_counts.add_entry(entry)
+        return pair_counts
+
+    def copy(self) -> "PairCounts":
+        """Snapshot of the counts sharing the same registry, for readers on another thread"""
+        snapshot = PairCounts(self.registry)
+        snapshot.counts = dict(self.counts)
+        return snapshot
+
+    def add_entry(self, entry: Dict[str, Any]):
+        """Count the pairings of every pod in a history entry"""
+        for pod in entry.get("pods", []):
+            self.add_pod(self.registry.intern_all(pod.get("players", [])))
+
+    def remove_entry(self, entry: Dict[str, Any]):
+        """Undo add_entry for an entry leaving the history window"""
+        for pod in entry.get("pods", []):
+            self.add_pod(self.registry.intern_all(pod.get("players", [])), -1)
+
+    def add_pod(self, member_ids: Sequence[int], amount: int = 1):
+        """Add (or with a negative amount, remove) one pod's pairings"""
+        counts = self.counts
+        for i, a in enumerate(member_ids):
+            for b in member_ids[i + 1:]:
+                key = pack_pair(a, b)
+                count = counts.get(key, 0) + amount
+                if count > 0:
+                    counts[key] = count
+                else:
+                    counts.pop(key, None)
+
+    def count_ids(self, a: int, b: int) -> int:
+        """Times two interned players shared a pod"""
+        return self.counts.get(pack_pair(a, b), 0)
+
+    def count(self, name_a: str, name_b: str) -> int:
+        """Times two players shared a pod"""
+        a = self.registry.get_id(name_a)
+        b = self.registry.get_id(name_b)
+        if a is None or b is None:
+            return 0
+        return self.counts.get(pack_pair(a, b), 0)
+
+    def pod_repeats(self, names: Sequence[str]) -> int:
+        """Repeat pairings inside a group of players"""
+        ids = [self.registry.get_id(name) for name in names]
+        ids = [player_id for player_id in ids if player_id is not None]
+        counts = self.counts
+        return sum(
+            counts.get(pack_pair(a, b), 0)
+            for i, a in enumerate(ids)
+            for b in ids[i + 1:]
+        )
+
+    def pairs(self) -> Iterator[Tuple[str, str, int]]:
+        """Every pair that met, with its count"""
+        name_of = self.registry.name_of
+        for key, count in self.counts.items():
+            a, b = unpack_pair(key)
+            yield name_of(a), name_of(b), count
+
+    def most_common(self, limit: int = 5) -> List[Tuple[str, str, int]]:
+        """Pairs that met most often"""
+        return heapq.nlargest(limit, self.pairs(), key=lambda pair: pair[2])
+
+    def __len__(self) -> int:
+        return len(self.counts)
@@ -0,0 +1,181 @@
+import hashlib
+import math
+import random
+import time
+from array import array
+from typing import Dict, List, Iterable, Optional, Sequence, Tuple
+
+from core.rng import CounterRNG
+
+# Above this many players the co-occurrence rows are stored sparsely
+DENSE_MATRIX_LIMIT = 2000
+
+class SparseRow(dict):
+    """Co-occurrence row holding only players that were met; others read as 0"""
+
+    def __missing__(self, key: int) -> int:
+        return 0
+
+class RepeatMinimizer:
+    """Searches for pod assignments that avoid players who already shared a pod"""
+
+    def __init__(self, player_ids: Sequence[int], history_pods: Iterable[Sequence[int]]):
+        self.player_ids = player_ids
+        self.index: Dict[int, int] = {player_id: i for i, player_id in enumerate(player_ids)}
+        self.matrix = self._build_matrix(history_pods)
+        self.last_iterations = 0
+
+    def _build_matrix(self, history_pods: Iterable[Sequence[int]]) -> List[Sequence[int]]:
+        """Build the co-occurrence matrix for the current roster from past pods"""
+        n = len(self.player_ids)
+        if n > DENSE_MATRIX_LIMIT:
+            matrix = [SparseRow() for _ in range(n)]
+        else:
+            matrix = [[0] * n for _ in range(n)]
+
+        for pod in history_pods:
+            # Only players still on the roster matter for the search
+            members = [self.index[p] for p in pod if p in self.index]
+            for i, a in enumerate(members):
+                row = matrix[a]
+                for b in members[i + 1:]:
+                    row[b] += 1
+                    matrix[b][a] += 1
+
+        return matrix
+
+    def digest(self, extra: Sequence[int] = ()) -> str:
+        """Short hash of the co-occurrence counts, so a replay can check it sees the same history"""
+        digest = hashlib.sha256()
+        for row in self.matrix:
+            if isinstance(row, SparseRow):
+                digest.update(repr(sorted(row.items())).encode("utf-8"))
+            else:
+                digest.update(array('I', row).tobytes())
+        digest.update(array('I', extra).tobytes())
+        return digest.hexdigest()[:16]
+
+    def pod_cost(self, members: List[int]) -> int:
+        """Number of repeat pairings inside a single pod"""
+        matrix = self.matrix
+        cost = 0
+        for i, a in enumerate(members):
+            row = matrix[a]
+            for b in members[i + 1:]:
+                cost += row[b]
+        return cost
+
+    def total_cost(self, groups: List[List[int]]) -> int:
+        """Number of repeat pairings across a whole assignment"""
+        return sum(self.pod_cost(members) for members in groups)
+
+    def optimize(self, groups: List[List[int]], time_budget: float = 0.5, rng=None,
+                 max_iterations: Optional[int] = None) -> List[List[int]]:
+        """Improve an assignment in place with pairwise swaps until the budget runs out
+
+        The number of iterations run is kept in last_iterations; passing it
+        back as max_iterations with the same generator replays the search
+        exactly, whatever the clock does.
+        """
+        self.last_iterations = 0
+        if len(groups) < 2:
+            return groups
+
+        rng = rng if rng is not None else random
+
+        matrix = self.matrix
+        deadline = time.perf_counter() + time_budget
+
+        # Track which pod each player sits in and where
+        location = {}
+        for g, members in enumerate(groups):
+            for slot, player in enumerate(members):
+                location[player] = (g, slot)
+
+        players = list(location)
+        cost = self.total_cost(groups)
+        iterations = 0
+
+        while cost > 0 and (max_iterations is None or iterations < max_iterations):
+            if iterations & 255 == 255 and time.perf_counter() >= deadline:
+                break
+            iterations += 1
+
+            a = rng.choice(players)
+            ga, slot_a = location[a]
+            pod_a = groups[ga]
+            row_a = matrix[a]
+
+            # Players without repeats in their pod have nothing to gain from moving
+            current_a = sum(row_a[x] for x in pod_a)
+            if current_a == 0:
+                continue
+
+            b = rng.choice(players)
+            gb, slot_b = location[b]
+            if ga == gb:
+                continue
+            pod_b = groups[gb]
+            row_b = matrix[b]
+
+            # Swap delta only depends on the two affected pods
+            delta = (
+                sum(row_a[x] for x in pod_b) - row_a[b] - current_a
+                + sum(row_b[x] for x in pod_a) - row_b[a] - sum(row_b[x] for x in pod_b)
+            )
+
+            # Accept improvements, and sideways moves to escape plateaus
+            if delta < 0 or (delta == 0 and rng.random() < 0.1):
+                pod_a[slot_a] = b
+                pod_b[slot_b] = a
+                location[a] = (gb, slot_b)
+                location[b] = (ga, slot_a)
+                cost += delta
+
+        self.last_iterations = iterations
+        return groups
+
+
+def search_worker(player_count: int, sizes: List[int], history_pods: List[List[int]],
+                  seed: int, stream: int, deadline: float,
+                  replay: Optional[List[int]] = None) -> Tuple[int, List[List[int]], int, List[int], str]:
+    """Restart the repeat search from random splits until the deadline
+
+    Runs in a worker process on its own numbered stream of the run seed.
+    The deadline is wall-clock time (time.time()), shared by all workers and
+    covering the pair matrix build. Players are roster positions
+    0..player_count-1. Returns the best cost, its pods, the number of
+    candidates explored, the iterations of every restart up to the best one
+    and the history digest. Passing those iterations as replay reruns the
+    same restarts without a deadline.
+    """
+    rng = CounterRNG(seed).stream(stream)
+    minimizer = RepeatMinimizer(range(player_count), history_pods)
+    if replay is not None:
+        deadline = math.inf
+    # Short restarts explore more of the space than one long climb
+    restart_budget = max((deadline - time.time()) / 8, 0.01)
+
+    best_cost, best_groups, candidates = None, [], 0
+    iterations: List[int] = []
+    best_iterations: List[int] = []
+    while replay is None or candidates < len(replay):
+        order = list(range(player_count))
+        rng.shuffle(order)
+        groups, start = [], 0
+        for size in sizes:
+            groups.append(order[start:start + size])
+            start += size
+
+        remaining = deadline - time.time()
+        limit = replay[candidates] if replay is not None else None
+        minimizer.optimize(groups, min(restart_budget, max(remaining, 0)), rng, limit)
+        iterations.append(minimizer.last_iterations)
+        cost = minimizer.total_cost(groups)
+        candidates += 1
+
+        if best_cost is None or cost < best_cost:
+            best_cost, best_groups, best_iterations = cost, groups, list(iterations)
+        if best_cost == 0 or time.time() >= deadline:
+            break
+    return best_cost, best_groups, candidates, best_iterations, minimizer.digest()
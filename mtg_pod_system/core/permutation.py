@@ -0,0 +1,42 @@
+import random
+from typing import Iterator, Optional
+
+class FeistelPermutation:
+    """Random permutation of 0..n-1 computed one index at a time in O(1) memory
+
+    A balanced Feistel network permutes the smallest even-bit power of two
+    covering n; cycle walking re-applies it until the result lands below n.
+    """
+
+    def __init__(self, size: int, seed: Optional[int] = None, rounds: int = 4):
+        self.size = size
+        half_bits = max(1, ((size - 1).bit_length() + 1) // 2)
+        self.half_bits = half_bits
+        self.half_mask = (1 << half_bits) - 1
+        rng = random.Random(seed)
+        self.keys = [rng.getrandbits(32) for _ in range(rounds)]
+
+    def _encrypt(self, index: int) -> int:
+        """One pass of the Feistel network over the power-of-two domain"""
+        half_bits, half_mask = self.half_bits, self.half_mask
+        left, right = index >> half_bits, index & half_mask
+        for key in self.keys:
+            # Round function: a cheap multiply-xorshift mix of one half
+            mixed = ((right ^ key) * 0x9E3779B1) & 0xFFFFFFFF
+            left, right = right, left ^ ((mixed ^ (mixed >> 15)) & half_mask)
+        return (left << half_bits) | right
+
+    def __getitem__(self, index: int) -> int:
+        if not 0 <= index < self.size:
+            raise IndexError("permutation index out of range")
+        value = self._encrypt(index)
+        while value >= self.size:
+            value = self._encrypt(value)
+        return value
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[int]:
+        for index in range(self.size):
+            yield self[index]
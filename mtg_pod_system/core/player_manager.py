@@ -6,10 +6,17 @@ from datetime import datetime
 class PlayerManager:
     """Manages player operations for MTG pod system"""
     
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: str = "data", storage=None):
         self.data_dir = data_dir
         self.players_file = os.path.join(data_dir, "players.json")
-        self.players: List[str] = []
+        # Optional DataStorage backend; players.json is used directly without one
+        self.storage = storage
+        # Roster slots in insertion order; removed players leave a None until compaction
+        self._slots: List[Optional[str]] = []
+        # Casefolded name -> slot position
+        self._index: Dict[str, int] = {}
+        # Casefolded name -> rating (Elo or deck power) for rated players
+        self._ratings: Dict[str, float] = {}
         self._ensure_data_dir()
         self.load_players()
     
@@ -18,43 +25,121 @@ class PlayerManager:
         if not os.path.exists(self.data_dir):
             os.makedirs(self.data_dir)
     
+    @staticmethod
+    def _key(name: str) -> str:
+        """Case-insensitive lookup key for a player name"""
+        return name.casefold()
+    
+    def _compact(self):
+        """Drop removed slots once they outnumber live players"""
+        if len(self._slots) <= 2 * len(self._index):
+            return
+        self._slots = [name for name in self._slots if name is not None]
+        self._index = {self._key(name): i for i, name in enumerate(self._slots)}
+    
+    @property
+    def players(self) -> List[str]:
+        """Players in insertion order"""
+        return [name for name in self._slots if name is not None]
+    
+    @players.setter
+    def players(self, names: List[str]):
+        self.clear_players()
+        self.import_players_from_list(names)
+    
     def add_player(self, name: str) -> bool:
         """Add a player to the list"""
         name = name.strip()
         if not name:
             return False
         
-        if name.lower() in [p.lower() for p in self.players]:
+        key = self._key(name)
+        if key in self._index:
             return False  # Duplicate
         
-        self.players.append(name)
+        self._index[key] = len(self._slots)
+        self._slots.append(name)
         return True
     
     def remove_player(self, name: str) -> bool:
         """Remove a player from the list"""
-        name = name.strip()
-        if name in self.players:
-            self.players.remove(name)
-            return True
-        return False
+        position = self._index.pop(self._key(name.strip()), None)
+        if position is None:
+            return False
+        
+        self._slots[position] = None
+        self._ratings.pop(self._key(name.strip()), None)
+        self._compact()
+        return True
+    
+    def rename_player(self, old_name: str, new_name: str) -> bool:
+        """Rename a player, keeping their position in the list"""
+        new_name = new_name.strip()
+        old_key = self._key(old_name.strip())
+        new_key = self._key(new_name)
+        position = self._index.get(old_key)
+        if position is None or not new_name:
+            return False
+        if new_key != old_key and new_key in self._index:
+            return False  # Duplicate
+        
+        del self._index[old_key]
+        self._index[new_key] = position
+        if old_key in self._ratings:
+            self._ratings[new_key] = self._ratings.pop(old_key)
+        self._slots[position] = new_name
+        return True
+    
+    def has_player(self, name: str) -> bool:
+        """Check whether a player is on the list, ignoring case"""
+        return self._key(name.strip()) in self._index
+    
+    def set_rating(self, name: str, rating: Optional[float]) -> bool:
+        """Set a player's rating, or clear it with None"""
+        key = self._key(name.strip())
+        if key not in self._index:
+            return False
+        if rating is None:
+            self._ratings.pop(key, None)
+        else:
+            self._ratings[key] = float(rating)
+        return True
+    
+    def get_rating(self, name: str) -> Optional[float]:
+        """Get a player's rating, None if unrated"""
+        return self._ratings.get(self._key(name.strip()))
+    
+    def get_ratings(self) -> Dict[str, float]:
+        """Ratings of rated players on the roster, by name"""
+        return {
+            name: self._ratings[self._key(name)]
+            for name in self.players
+            if self._key(name) in self._ratings
+        }
     
     def get_players(self) -> List[str]:
         """Get all players"""
-        return self.players.copy()
+        return self.players
     
     def get_player_count(self) -> int:
         """Get total number of players"""
-        return len(self.players)
+        return len(self._index)
     
     def clear_players(self):
         """Clear all players"""
-        self.players.clear()
+        self._slots = []
+        self._index = {}
+        self._ratings = {}
     
     def save_players(self) -> bool:
         """Save players to file"""
+        if self.storage is not None:
+            return self.storage.save_players(self.players, self.get_ratings())
+        
         try:
             data = {
                 "players": self.players,
+                "ratings": self.get_ratings(),
                 "last_updated": datetime.now().isoformat()
             }
             with open(self.players_file, 'w') as f:
@@ -65,27 +150,36 @@ class PlayerManager:
     
     def load_players(self) -> bool:
         """Load players from file"""
+        if self.storage is not None:
+            self.players = self.storage.load_players()
+            self._load_ratings(self.storage.load_ratings())
+            return True
+        
         try:
             if os.path.exists(self.players_file):
                 with open(self.players_file, 'r') as f:
                     data = json.load(f)
                     self.players = data.get("players", [])
+                    self._load_ratings(data.get("ratings", {}))
             return True
         except Exception:
-            self.players = []
+            self.clear_players()
             return False
     
+    def _load_ratings(self, ratings: Dict[str, float]):
+        """Attach stored ratings to players on the roster"""
+        for name, rating in ratings.items():
+            self.set_rating(name, rating)
+    
     def import_players_from_list(self, player_list: List[str]) -> int:
         """Import players from a list, returns number added"""
         added = 0
         for name in player_list:
-            name = name.strip()
-            if name and name.lower() not in [p.lower() for p in self.players]:
-                self.players.append(name)
+            if self.add_player(name):
                 added += 1
         return added
     
     def search_players(self, query: str) -> List[str]:
         """Search players by name"""
-        query = query.lower()
-        return [p for p in self.players if query in p.lower()]
\ No newline at end of file
+        query = self._key(query)
+        return [p for p in self.players if query in self._key(p)]
\ No newline at end of file
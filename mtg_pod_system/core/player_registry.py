@@ -0,0 +1,48 @@
+from array import array
+from typing import Dict, List, Iterable, Optional
+
+class PlayerRegistry:
+    """Interns player names as dense integer IDs"""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        # IDs per casefolded name, for case-insensitive lookups
+        self._folded: Dict[str, List[int]] = {}
+
+    def intern(self, name: str) -> int:
+        """Get the ID for a name, assigning the next free ID if it is new"""
+        player_id = self._ids.get(name)
+        if player_id is None:
+            player_id = len(self._names)
+            self._ids[name] = player_id
+            self._names.append(name)
+            self._folded.setdefault(name.casefold(), []).append(player_id)
+        return player_id
+
+    def intern_all(self, names: Iterable[str]) -> array:
+        """Intern a sequence of names into a compact array of IDs"""
+        return array('I', [self.intern(name) for name in names])
+
+    def get_id(self, name: str) -> Optional[int]:
+        """Get the ID for a name without registering it"""
+        return self._ids.get(name)
+
+    def ids_matching(self, name: str) -> List[int]:
+        """IDs of every registered name equal to this one ignoring case"""
+        return self._folded.get(name.strip().casefold(), [])
+
+    def name_of(self, player_id: int) -> str:
+        """Get the name for an ID"""
+        return self._names[player_id]
+
+    def names_of(self, player_ids: Iterable[int]) -> List[str]:
+        """Get the names for a sequence of IDs"""
+        names = self._names
+        return [names[player_id] for player_id in player_ids]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._ids
+
+    def __len__(self) -> int:
+        return len(self._names)
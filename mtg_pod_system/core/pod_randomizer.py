@@ -1,7 +1,47 @@
+import hashlib
+import heapq
+import json
+import math
+import os
 import random
-from typing import List, Dict, Tuple
+import time
+from concurrent.futures import ProcessPoolExecutor
+from array import array
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+from typing import List, Dict, Tuple, Any, Iterator, Optional, Sequence
 from dataclasses import dataclass
 
+from core.annealing import AnnealingOptimizer
+from core.anytime import AnytimeSearch
+from core.batch_eval import BatchEvaluator
+from core.constraints import PodConstraints
+from core.pair_counts import PairCounts
+from core.permutation import FeistelPermutation
+from core.pairing import RepeatMinimizer, search_worker
+from core.scheduler import ScheduleOptimizer
+from core.seating import SeatingEngine
+from core.size_policy import SizePolicy, get_size_policy, size_policy_from_config
+from core.player_registry import PlayerRegistry
+from core.rng import CounterRNG
+
+# Bumped whenever seeded generation would produce different pods for the same seed
+ALGORITHM_VERSION = 1
+
+# Searches that run until a deadline, so the same seed can end at a different step;
+# their entries record where the search stopped (search_steps) for a replay
+TIME_BUDGETED_ALGORITHMS = ("avoid_repeats", "annealing", "parallel_search", "anytime")
+
+# Modes whose pods depend on the pairing history they were made with
+HISTORY_ALGORITHMS = TIME_BUDGETED_ALGORITHMS + ("batch_search",)
+
+# Swap iterations per anytime search step, so a replay can count steps instead of time
+ANYTIME_STEP_ITERATIONS = 2048
+
+# Seeded assignments remembered per randomizer
+ASSIGNMENT_CACHE_SIZE = 128
+
 @dataclass
 class Pod:
     """Represents a single pod of players"""
@@ -12,121 +52,1150 @@ class Pod:
     def __str__(self):
         return f"Pod {self.id} ({self.size} players): {', '.join(self.players)}"
 
+class CompactPod:
+    """Pod variant that stores member IDs in a compact integer array"""
+    __slots__ = ("id", "member_ids", "registry")
+    
+    def __init__(self, id: int, member_ids: array, registry: PlayerRegistry):
+        self.id = id
+        self.member_ids = member_ids
+        self.registry = registry
+    
+    @property
+    def players(self) -> List[str]:
+        """Member names, resolved through the registry"""
+        return self.registry.names_of(self.member_ids)
+    
+    @property
+    def size(self) -> int:
+        return len(self.member_ids)
+    
+    def __str__(self):
+        return f"Pod {self.id} ({self.size} players): {', '.join(self.players)}"
+    
+    def __repr__(self):
+        return f"CompactPod(id={self.id}, players={self.players!r})"
+
+@lru_cache(maxsize=256)
+def plan_pod_sizes(total_players: int, target_size: int, min_size: int, max_size: int) -> Tuple[Tuple[int, int], ...]:
+    """Plan the pod-size multiset as (size, count) pairs, largest size first
+    
+    Uses as many pods as a target-sized split needs, clamped to the pod counts
+    that keep every pod within [min_size, max_size], and spreads players evenly.
+    Raises ValueError when no split satisfies the size limits.
+    """
+    if total_players <= 0:
+        return ()
+    if min_size < 1 or min_size > max_size:
+        raise ValueError(f"Invalid pod size limits: min {min_size}, max {max_size}")
+    
+    # Pod counts that keep every pod within the size limits
+    fewest_pods = -(-total_players // max_size)
+    most_pods = total_players // min_size
+    if fewest_pods > most_pods:
+        raise ValueError(
+            f"Cannot split {total_players} players into pods of {min_size}-{max_size} players"
+        )
+    
+    num_pods = -(-total_players // max(target_size, 1))
+    num_pods = max(fewest_pods, min(num_pods, most_pods))
+    
+    base_size, larger_pods = divmod(total_players, num_pods)
+    plan = []
+    if larger_pods:
+        plan.append((base_size + 1, larger_pods))
+    plan.append((base_size, num_pods - larger_pods))
+    return tuple(plan)
+
+def expand_pod_sizes(plan: Tuple[Tuple[int, int], ...]) -> Iterator[int]:
+    """Yield individual pod sizes from a planned size multiset"""
+    for size, count in plan:
+        for _ in range(count):
+            yield size
+
 class PodRandomizer:
     """Handles randomization of players into pods"""
     
-    def __init__(self):
-        self.history: List[List[Pod]] = []
+    def __init__(self, registry: Optional[PlayerRegistry] = None, cache_size: int = ASSIGNMENT_CACHE_SIZE):
+        self.registry = registry if registry is not None else PlayerRegistry()
+        self.history: List[List[CompactPod]] = []
+        # Details of the most recent search-based assignment
+        self.last_search_stats: Dict[str, Any] = {}
+        # Most recent reproducible assignment and how to regenerate it
+        self._generation: Optional[Tuple[List[CompactPod], Dict[str, Any]]] = None
+        # Seeded assignments by roster/settings/seed hash, least recently used first
+        self._assignment_cache: "OrderedDict[bytes, Tuple[Tuple[array, ...], Dict[str, Any], Dict[str, Any]]]" = OrderedDict()
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # Whether the latest assignment came from the cache rather than a fresh draw or search
+        self.last_from_cache = False
+        # Pod index of every seated player in the most recent repaired assignment
+        self._seat_index: Optional[Tuple[List[CompactPod], Dict[int, int]]] = None
     
-    def create_pods(self, players: List[str], target_size: int = 4, max_size: int = 8) -> List[Pod]:
-        """Create random pods from player list"""
+    def create_pods(self, players: List[str], target_size: int = 4, max_size: int = 8,
+                    min_size: int = 3, constraints: Optional[PodConstraints] = None,
+                    seed: Optional[int] = None, size_policy: Optional[SizePolicy] = None) -> List[CompactPod]:
+        """Create random pods from player list, honouring keep-together/keep-apart rules if given
+        
+        The same roster, sizes and seed always give the same pods, whatever
+        order the players are listed in. Without a seed a fresh one is drawn.
+        """
         if not players:
             return []
         
         # Validate pod sizes
-        target_size = max(3, min(target_size, max_size))
+        target_size = max(min_size, min(target_size, max_size))
         
-        # Shuffle players for randomness
-        shuffled_players = players.copy()
-        random.shuffle(shuffled_players)
+        seeded = seed is not None
+        seed, rng, players = self._seeded(players, seed)
+        algorithm = "constrained" if constraints else "random"
         
-        # Calculate optimal pod distribution
-        total_players = len(shuffled_players)
-        pods = self._calculate_pod_distribution(shuffled_players, target_size, max_size)
+        # Same roster, sizes, rules and seed: reuse the pods instead of drawing them again
+        key = self._cache_key(players, target_size, min_size, max_size, constraints, seed, algorithm,
+                              size_policy) if seeded else None
+        cached = self._cached_assignment(key)
+        if cached is not None:
+            return cached
+        
+        if constraints:
+            sizes = list(expand_pod_sizes(self._plan_sizes(len(players), target_size, min_size, max_size, size_policy)))
+            pods = [
+                CompactPod(i + 1, self.registry.intern_all(members), self.registry)
+                for i, members in enumerate(constraints.assign(players, sizes, rng))
+            ]
+        else:
+            # Shuffle player IDs for randomness
+            member_ids = self.registry.intern_all(players)
+            rng.shuffle(member_ids)
+            
+            # Calculate optimal pod distribution
+            pods = self._calculate_pod_distribution(member_ids, target_size, max_size, min_size, size_policy)
+        
+        # Regenerating needs the rules in force now, not whatever is configured later
+        rules = {"constraints": constraints.describe()} if constraints else {}
+        self._record_generation(pods, seed, algorithm, target_size, min_size, max_size, size_policy, **rules)
+        self._remember_assignment(key, pods)
         
         # Save to history
         self.history.append(pods)
         return pods
     
-    def _calculate_pod_distribution(self, players: List[str], target_size: int, max_size: int) -> List[Pod]:
-        """Calculate optimal pod distribution for balanced gameplay"""
-        total_players = len(players)
-        pods = []
-        player_index = 0
+    @staticmethod
+    def _seeded(players: List[str], seed: Optional[int]) -> Tuple[int, CounterRNG, List[str]]:
+        """The seed (drawn if not given), its generator and the roster in canonical order"""
+        if seed is None:
+            seed = random.getrandbits(63)
+        # Canonical roster order so the seed alone decides the outcome
+        return seed, CounterRNG(seed), sorted(players, key=lambda name: (name.casefold(), name))
+    
+    def _record_generation(self, pods: List[CompactPod], seed: int, algorithm: str, target_size: int,
+                           min_size: int, max_size: int, size_policy: Optional[SizePolicy] = None,
+                           **details: Any):
+        """Remember how the pods were made, for build_history_entry and regenerate_pods"""
+        info = {
+            "seed": seed,
+            "algorithm": algorithm,
+            "algorithm_version": ALGORITHM_VERSION,
+            "pod_sizes": [target_size, min_size, max_size],
+            **details
+        }
+        if size_policy is not None:
+            info["size_policy"] = size_policy.describe()
+        self._generation = (pods, info)
+    
+    @property
+    def last_seed(self) -> Optional[int]:
+        """Seed of the most recent generated assignment, None before the first"""
+        return self._generation[1]["seed"] if self._generation is not None else None
+    
+    def _cache_key(self, players: List[str], target_size: int, min_size: int, max_size: int,
+                   constraints: Optional[PodConstraints], seed: int, algorithm: str,
+                   size_policy: Optional[SizePolicy], inputs: Any = None) -> bytes:
+        """Stable hash of everything that decides a seeded assignment
+        
+        inputs covers the rest of what a mode depends on, such as a digest of
+        the history or ratings. Time budgets and step limits are left out: a
+        replay of a recorded search gives the pods the search found.
+        """
+        rules = None
+        if constraints:
+            rules = [
+                [sorted(name.casefold() for name in group) for group in constraints.keep_together],
+                [sorted(name.casefold() for name in pair) for pair in constraints.keep_apart]
+            ]
+        policy = size_policy.describe() if size_policy is not None else None
+        digest = hashlib.sha256()
+        digest.update("\0".join(players).encode("utf-8"))
+        digest.update(json.dumps(
+            [target_size, min_size, max_size, policy, rules, seed, algorithm, inputs, ALGORITHM_VERSION],
+            sort_keys=True
+        ).encode("utf-8"))
+        return digest.digest()
+    
+    def _cached_assignment(self, key: Optional[bytes]) -> Optional[List[CompactPod]]:
+        """Pods cached under a key, with how they were made and their search stats, or None
+        
+        Without a key (an unseeded call) the cache is not consulted at all.
+        """
+        self.last_from_cache = False
+        if key is None:
+            return None
+        cached = self._assignment_cache.get(key)
+        if cached is None:
+            self.cache_misses += 1
+            return None
+        
+        self._assignment_cache.move_to_end(key)
+        self.cache_hits += 1
+        self.last_from_cache = True
+        members, info, stats = cached
+        pods = [CompactPod(i + 1, array('I', ids), self.registry) for i, ids in enumerate(members)]
+        self._generation = (pods, dict(info))
+        self.last_search_stats = dict(stats)
+        self.history.append(pods)
+        return pods
+    
+    def _remember_assignment(self, key: Optional[bytes], pods: List[CompactPod]):
+        """Cache an assignment's member IDs with its generation record, dropping the least recently used"""
+        if key is None or self.cache_size <= 0:
+            return
+        self._assignment_cache[key] = (
+            tuple(array('I', pod.member_ids) for pod in pods), dict(self._generation[1]), dict(self.last_search_stats)
+        )
+        while len(self._assignment_cache) > self.cache_size:
+            self._assignment_cache.popitem(last=False)
+    
+    def cache_info(self) -> Dict[str, int]:
+        """Hit and miss counts of the seeded assignment cache"""
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "size": len(self._assignment_cache),
+            "max_size": self.cache_size
+        }
+    
+    def clear_cache(self):
+        """Forget cached assignments and reset the counters"""
+        self._assignment_cache.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
+    
+    def regenerate_pods(self, entry: Dict[str, Any], players: Optional[List[str]] = None,
+                        history: Optional[List[Dict[str, Any]]] = None,
+                        ratings: Optional[Dict[str, float]] = None) -> List[CompactPod]:
+        """Rebuild a seeded assignment from its history entry
+        
+        The roster defaults to everyone in the entry's pods, so only the
+        seed, sizes and roster are needed, not the pod lists themselves.
+        Rule-constrained pods use the rules stored in the entry. Balanced
+        pods also need the ratings, and the repeat-avoiding modes the
+        history they were made with; searches that ran against the clock
+        are replayed to the step they stopped at. ValueError is raised when
+        the ratings or history differ from the ones the pods were made with.
+        """
+        if entry.get("seed") is None:
+            raise ValueError("History entry has no seed to regenerate from")
+        if entry.get("algorithm_version") != ALGORITHM_VERSION:
+            raise ValueError(f"History entry was created by algorithm version {entry.get('algorithm_version')}")
+        algorithm = entry.get("algorithm", "random")
+        if algorithm in TIME_BUDGETED_ALGORITHMS and "search_steps" not in entry:
+            raise ValueError(f"{algorithm} entry does not record where its search stopped")
+        constraints = None
+        if algorithm == "constrained":
+            if not entry.get("constraints"):
+                raise ValueError("History entry does not record the pairing rules its pods were made with")
+            constraints = PodConstraints.from_config(entry["constraints"])
+        if algorithm == "balanced" and ratings is None:
+            raise ValueError("Balanced pods can only be regenerated with the ratings they were made with")
+        if algorithm in HISTORY_ALGORITHMS and history is None:
+            raise ValueError(f"{algorithm} pods can only be regenerated with the history they were made with")
+        
+        if players is None:
+            players = [name for pod in entry.get("pods", []) for name in pod.get("players", [])]
+        target_size, min_size, max_size = entry["pod_sizes"]
+        size_policy = None
+        if entry.get("size_policy"):
+            weights = tuple(sorted((int(size), weight) for size, weight in entry["size_policy"]["weights"].items()))
+            size_policy = get_size_policy(tuple(size for size, _ in weights), weights, target_size)
+        seed, steps = entry["seed"], entry.get("search_steps")
+        if algorithm == "balanced":
+            pods = self.create_pods_balanced(
+                players, ratings, target_size, max_size, min_size, entry.get("default_rating", 1500.0),
+                seed, size_policy
+            )
+        elif algorithm == "batch_search":
+            pods = self.create_pods_batch_search(
+                players, history, target_size, max_size, min_size, entry["candidates"], seed, size_policy
+            )
+        elif algorithm == "avoid_repeats":
+            pods = self.create_pods_avoiding_repeats(
+                players, history, target_size, max_size, math.inf, min_size, seed, size_policy, steps
+            )
+        elif algorithm == "annealing":
+            start_temperature, end_temperature = entry["temperatures"]
+            pods = self.create_pods_annealing(
+                players, history, target_size, max_size, math.inf, min_size, start_temperature,
+                end_temperature, entry["balance_weight"], entry["cooling_moves"] or None, seed, size_policy,
+                steps
+            )
+        elif algorithm == "anytime":
+            search = self.create_pods_anytime(
+                players, history, target_size, max_size, math.inf, min_size, seed=seed,
+                size_policy=size_policy, max_steps=steps
+            )
+            search.wait()
+            pods = search.pods
+        elif algorithm == "parallel_search":
+            pods = self.create_pods_parallel(
+                players, history, target_size, max_size, math.inf, min_size, seed=seed,
+                size_policy=size_policy, replay=(entry["search_stream"], steps)
+            )
+        elif algorithm == "schedule":
+            schedule = self.create_schedule(
+                players, entry["rounds"], target_size, max_size, min_size, math.inf, seed, size_policy, steps
+            )
+            pods = schedule[entry["schedule_round"]]
+        else:
+            pods = self.create_pods(players, target_size, max_size, min_size, constraints, seed, size_policy)
+        
+        # Other inputs replay to other pods, so a mismatch must not pass silently
+        for key, what in (("history_digest", "history"), ("ratings_digest", "ratings")):
+            if key in entry and self._generation[1].get(key) != entry[key]:
+                raise ValueError(f"The {what} differs from the {what} these pods were made with")
+        return pods
+    
+    def iter_pods(self, players: Sequence[str], target_size: int = 4, max_size: int = 8,
+                  min_size: int = 3, seed: Optional[int] = None,
+                  size_policy: Optional[SizePolicy] = None) -> Iterator[Pod]:
+        """Yield random pods one at a time without building a shuffled copy of the roster
+        
+        Players are drawn through a keyed index permutation, so memory stays
+        constant however large the roster is. Streamed pods are not kept in
+        the in-memory history.
+        """
+        target_size = max(min_size, min(target_size, max_size))
+        plan = self._plan_sizes(len(players), target_size, min_size, max_size, size_policy)
+        permutation = FeistelPermutation(len(players), seed if seed is not None else random.getrandbits(64))
+        
+        position = 0
+        for pod_id, size in enumerate(expand_pod_sizes(plan), 1):
+            members = [players[permutation[i]] for i in range(position, position + size)]
+            position += size
+            yield Pod(pod_id, members, size)
+    
+    def create_pods_avoiding_repeats(self, players: List[str], history: List[Dict[str, Any]],
+                                     target_size: int = 4, max_size: int = 8,
+                                     time_budget: float = 0.5, min_size: int = 3,
+                                     seed: Optional[int] = None,
+                                     size_policy: Optional[SizePolicy] = None,
+                                     max_iterations: Optional[int] = None) -> List[CompactPod]:
+        """Create pods that minimize players meeting the same opponents as in past assignments
+        
+        max_iterations replays a recorded search instead of running to the budget.
+        """
+        if not players:
+            return []
+        
+        target_size = max(min_size, min(target_size, max_size))
+        seeded = seed is not None
+        seed, rng, players = self._seeded(players, seed)
+        
+        # Start from a random balanced assignment, then improve it
+        member_ids = self.registry.intern_all(players)
+        rng.shuffle(member_ids)
+        pods = self._calculate_pod_distribution(member_ids, target_size, max_size, min_size, size_policy)
+        
+        minimizer = RepeatMinimizer(member_ids, self._history_pods(history))
+        digest = minimizer.digest()
+        # The history decides the pods as much as the seed does, so it is part of the key
+        key = self._cache_key(players, target_size, min_size, max_size, None, seed, "avoid_repeats",
+                              size_policy, digest) if seeded else None
+        cached = self._cached_assignment(key)
+        if cached is not None:
+            return cached
+        
+        groups = [[minimizer.index[p] for p in pod.member_ids] for pod in pods]
+        groups = minimizer.optimize(groups, time_budget, rng, max_iterations)
+        
+        pods = [
+            CompactPod(i + 1, array('I', [member_ids[p] for p in members]), self.registry)
+            for i, members in enumerate(groups)
+        ]
+        self._record_generation(
+            pods, seed, "avoid_repeats", target_size, min_size, max_size, size_policy,
+            search_steps=minimizer.last_iterations, history_digest=digest
+        )
+        self._remember_assignment(key, pods)
+        
+        self.history.append(pods)
+        return pods
+    
+    def create_pods_batch_search(self, players: List[str], history: List[Dict[str, Any]],
+                                 target_size: int = 4, max_size: int = 8, min_size: int = 3,
+                                 candidates: int = 256, seed: Optional[int] = None,
+                                 size_policy: Optional[SizePolicy] = None) -> List[CompactPod]:
+        """Score a batch of random assignments at once and keep the one with the fewest repeats
+        
+        The NumPy and pure-Python backends draw candidates differently, so a
+        seed reproduces the pods only on the same backend.
+        """
+        if not players:
+            return []
+        
+        target_size = max(min_size, min(target_size, max_size))
+        started = time.perf_counter()
+        seeded = seed is not None
+        seed, rng, players = self._seeded(players, seed)
+        member_ids = self.registry.intern_all(players)
+        sizes = list(expand_pod_sizes(self._plan_sizes(len(member_ids), target_size, min_size, max_size, size_policy)))
+        
+        minimizer = RepeatMinimizer(member_ids, self._history_pods(history))
+        digest = minimizer.digest()
+        key = self._cache_key(players, target_size, min_size, max_size, None, seed, "batch_search",
+                              size_policy, [digest, max(1, candidates)]) if seeded else None
+        cached = self._cached_assignment(key)
+        if cached is not None:
+            return cached
+        
+        evaluator = BatchEvaluator(minimizer.matrix, sizes)
+        best_cost, order = evaluator.best_of(max(1, candidates), rng)
+        self.last_search_stats = {
+            "candidates": max(1, candidates),
+            "backend": "numpy" if evaluator.use_numpy else "python",
+            "repeat_pairs": best_cost,
+            "elapsed": time.perf_counter() - started
+        }
+        
+        pods = self._calculate_pod_distribution(
+            array('I', [member_ids[p] for p in order]), target_size, max_size, min_size, size_policy
+        )
+        self._record_generation(
+            pods, seed, "batch_search", target_size, min_size, max_size, size_policy,
+            candidates=max(1, candidates), backend=self.last_search_stats["backend"],
+            history_digest=digest
+        )
+        self._remember_assignment(key, pods)
+        self.history.append(pods)
+        return pods
+    
+    def create_pods_annealing(self, players: List[str], history: List[Dict[str, Any]],
+                              target_size: int = 4, max_size: int = 8, time_budget: float = 0.5,
+                              min_size: int = 3, start_temperature: float = 2.0,
+                              end_temperature: float = 0.05, balance_weight: float = 1.0,
+                              max_moves: Optional[int] = None, seed: Optional[int] = None,
+                              size_policy: Optional[SizePolicy] = None,
+                              stop_after: Optional[int] = None) -> List[CompactPod]:
+        """Anneal toward few repeat pairings while spreading short pods evenly across players
+        
+        stop_after replays a recorded run, together with the cooling_moves it
+        recorded as max_moves.
+        """
+        if not players:
+            return []
+        
+        target_size = max(min_size, min(target_size, max_size))
+        started = time.perf_counter()
+        seeded = seed is not None
+        seed, rng, players = self._seeded(players, seed)
+        member_ids = self.registry.intern_all(players)
+        rng.shuffle(member_ids)
+        pods = self._calculate_pod_distribution(member_ids, target_size, max_size, min_size, size_policy)
+        
+        minimizer = RepeatMinimizer(member_ids, self._history_pods(history))
+        short_pod_counts = [0] * len(member_ids)
+        # Seat balance needs pod sizes, which a pair-count store does not keep
+        for pod in ([] if isinstance(history, PairCounts) else self._history_pods(history)):
+            if len(pod) < target_size:
+                for player_id in pod:
+                    if player_id in minimizer.index:
+                        short_pod_counts[minimizer.index[player_id]] += 1
+        
+        digest = minimizer.digest(short_pod_counts)
+        key = self._cache_key(
+            players, target_size, min_size, max_size, None, seed, "annealing", size_policy,
+            [digest, start_temperature, end_temperature, balance_weight]
+        ) if seeded else None
+        cached = self._cached_assignment(key)
+        if cached is not None:
+            return cached
+        
+        optimizer = AnnealingOptimizer(minimizer.matrix, short_pod_counts, balance_weight)
+        groups = [[minimizer.index[p] for p in pod.member_ids] for pod in pods]
+        groups = optimizer.optimize(
+            groups, target_size, time_budget, start_temperature, end_temperature, max_moves, rng, stop_after
+        )
+        self.last_search_stats = {
+            "moves": optimizer.last_moves,
+            "repeat_pairs": minimizer.total_cost(groups),
+            "elapsed": time.perf_counter() - started
+        }
+        
+        pods = [
+            CompactPod(i + 1, array('I', [member_ids[p] for p in members]), self.registry)
+            for i, members in enumerate(groups)
+        ]
+        self._record_generation(
+            pods, seed, "annealing", target_size, min_size, max_size, size_policy,
+            search_steps=optimizer.last_moves, cooling_moves=optimizer.last_schedule,
+            temperatures=[start_temperature, end_temperature], balance_weight=balance_weight,
+            history_digest=digest
+        )
+        self._remember_assignment(key, pods)
+        self.history.append(pods)
+        return pods
+    
+    def create_pods_balanced(self, players: List[str], ratings: Dict[str, float],
+                             target_size: int = 4, max_size: int = 8, min_size: int = 3,
+                             default_rating: float = 1500.0, seed: Optional[int] = None,
+                             size_policy: Optional[SizePolicy] = None) -> List[CompactPod]:
+        """Spread player strength evenly by dealing players, strongest first, to the weakest pods"""
+        if not players:
+            return []
+        
+        target_size = max(min_size, min(target_size, max_size))
+        started = time.perf_counter()
+        seeded = seed is not None
+        seed, rng, players = self._seeded(players, seed)
+        digest = self._ratings_digest(players, ratings, default_rating)
+        key = self._cache_key(players, target_size, min_size, max_size, None, seed, "balanced",
+                              size_policy, [digest, default_rating]) if seeded else None
+        cached = self._cached_assignment(key)
+        if cached is not None:
+            return cached
+        
+        sizes = list(expand_pod_sizes(self._plan_sizes(len(players), target_size, min_size, max_size, size_policy)))
+        
+        # Strongest first; the random key breaks ties between equal ratings
+        rated = sorted(
+            ((ratings.get(name, default_rating), rng.random(), name) for name in players),
+            reverse=True
+        )
+        
+        # Deal one tier of players per seat; within a tier the strongest player
+        # goes to the pod with the lowest total so far
+        members: List[List[str]] = [[] for _ in sizes]
+        totals = [0.0] * len(sizes)
+        open_pods = list(range(len(sizes)))
+        position = 0
+        for seat in range(sizes[0]):
+            slots = sum(1 for size in sizes if size > seat)
+            if slots < len(open_pods):
+                # Extra seats go to the strongest pods, which the weaker leftovers even out
+                open_pods = heapq.nlargest(slots, open_pods, key=lambda i: (totals[i], rng.random()))
+            heap = [(totals[i], rng.random(), i) for i in open_pods]
+            heapq.heapify(heap)
+            for rating, _, name in rated[position:position + slots]:
+                _, _, i = heapq.heappop(heap)
+                members[i].append(name)
+                totals[i] += rating
+            position += slots
+        
+        averages = [totals[i] / len(names) for i, names in enumerate(members)]
+        self.last_search_stats = {
+            "rating_spread": max(averages) - min(averages),
+            "elapsed": time.perf_counter() - started
+        }
+        
+        pods = [
+            CompactPod(i + 1, self.registry.intern_all(names), self.registry)
+            for i, names in enumerate(members)
+        ]
+        self._record_generation(
+            pods, seed, "balanced", target_size, min_size, max_size, size_policy, default_rating=default_rating,
+            ratings_digest=digest
+        )
+        self._remember_assignment(key, pods)
+        self.history.append(pods)
+        return pods
+    
+    @staticmethod
+    def _ratings_digest(players: List[str], ratings: Dict[str, float], default_rating: float) -> str:
+        """Short hash of the roster's ratings, so a replay can check it sees the same ones"""
+        data = json.dumps([ratings.get(name, default_rating) for name in players])
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+    
+    def create_pods_anytime(self, players: List[str], history: List[Dict[str, Any]],
+                            target_size: int = 4, max_size: int = 8, time_budget: float = 5.0,
+                            min_size: int = 3, callback=None, seed: Optional[int] = None,
+                            size_policy: Optional[SizePolicy] = None,
+                            max_steps: Optional[int] = None) -> AnytimeSearch:
+        """Return a valid assignment at once and keep reducing repeat pairings in the background
+        
+        The returned search exposes the best pods so far, a queue and optional
+        callback of improvements, and cancel()/wait(). max_steps replays a
+        recorded search.
+        """
+        if not players:
+            search = AnytimeSearch([], 0, callback)
+            search.finish()
+            return search
+        
+        target_size = max(min_size, min(target_size, max_size))
+        seeded = seed is not None
+        seed, rng, players = self._seeded(players, seed)
+        member_ids = self.registry.intern_all(players)
+        rng.shuffle(member_ids)
+        pods = self._calculate_pod_distribution(member_ids, target_size, max_size, min_size, size_policy)
+        
+        minimizer = RepeatMinimizer(member_ids, self._history_pods(history))
+        digest = minimizer.digest()
+        key = self._cache_key(players, target_size, min_size, max_size, None, seed, "anytime",
+                              size_policy, digest) if seeded else None
+        cached = self._cached_assignment(key)
+        if cached is not None:
+            # Already searched: hand back a finished search holding the cached pods
+            search = AnytimeSearch(cached, minimizer.total_cost(
+                [[minimizer.index[p] for p in pod.member_ids] for pod in cached]
+            ), callback)
+            search.finish()
+            return search
         
-        # Calculate number of pods needed
-        min_pods = (total_players + max_size - 1) // max_size
-        max_pods = (total_players + target_size - 1) // target_size
+        groups = [[minimizer.index[p] for p in pod.member_ids] for pod in pods]
+        search = AnytimeSearch(pods, minimizer.total_cost(groups), callback)
+        # Steps taken so far, and at the best assignment
+        progress = {"steps": 0, "best": 0}
+        
+        def step() -> Optional[int]:
+            # Short fixed slices keep improvements flowing and cancellation prompt
+            before = [list(members) for members in groups]
+            minimizer.optimize(groups, math.inf, rng, ANYTIME_STEP_ITERATIONS)
+            if minimizer.last_iterations == 0 or groups == before:
+                return None  # A single pod, or no swap left to try: running on would only spin
+            progress["steps"] += 1
+            return minimizer.total_cost(groups)
+        
+        def snapshot() -> List[CompactPod]:
+            progress["best"] = progress["steps"]
+            return [
+                CompactPod(i + 1, array('I', [member_ids[p] for p in members]), self.registry)
+                for i, members in enumerate(groups)
+            ]
+        
+        def finish(best: List[CompactPod]):
+            self._record_generation(
+                best, seed, "anytime", target_size, min_size, max_size, size_policy,
+                search_steps=progress["best"], history_digest=digest
+            )
+            self._remember_assignment(key, best)
+            self.history.append(best)
+        
+        search.start(step, snapshot, time_budget, on_finish=finish, max_steps=max_steps)
+        return search
+    
+    def create_schedule(self, players: List[str], rounds: int, target_size: int = 4, max_size: int = 8,
+                        min_size: int = 3, time_budget: float = 2.0, seed: Optional[int] = None,
+                        size_policy: Optional[SizePolicy] = None,
+                        max_iterations: Optional[int] = None) -> List[List[CompactPod]]:
+        """Plan several rounds at once, keeping players from sharing a pod twice where possible
         
-        # Try to find optimal distribution
-        for num_pods in range(min_pods, max_pods + 1):
-            if num_pods == 0:
-                continue
+        Each round starts from its own stream of the seed; schedule_generation
+        describes the run for the history entries of its rounds.
+        """
+        if not players or rounds <= 0:
+            return []
+        
+        target_size = max(min_size, min(target_size, max_size))
+        seed, rng, players = self._seeded(players, seed)
+        member_ids = self.registry.intern_all(players)
+        sizes = list(expand_pod_sizes(self._plan_sizes(len(member_ids), target_size, min_size, max_size, size_policy)))
+        
+        # Every round starts from its own random split of roster positions
+        planned_rounds = []
+        for round_number in range(rounds):
+            order = list(range(len(member_ids)))
+            rng.stream(round_number).shuffle(order)
+            groups, start = [], 0
+            for size in sizes:
+                groups.append(order[start:start + size])
+                start += size
+            planned_rounds.append(groups)
+        
+        optimizer = ScheduleOptimizer(len(member_ids))
+        optimizer.optimize(planned_rounds, time_budget, rng, max_iterations)
+        
+        schedule = [
+            [
+                CompactPod(i + 1, array('I', [member_ids[p] for p in members]), self.registry)
+                for i, members in enumerate(groups)
+            ]
+            for groups in planned_rounds
+        ]
+        self._record_generation(
+            schedule, seed, "schedule", target_size, min_size, max_size, size_policy,
+            rounds=rounds, search_steps=optimizer.last_iterations
+        )
+        return schedule
+    
+    def schedule_generation(self, schedule: List[List[CompactPod]]) -> Optional[Dict[str, Any]]:
+        """How a schedule from create_schedule was made, to store with it for its rounds' history entries"""
+        if self._generation is not None and self._generation[0] is schedule:
+            return dict(self._generation[1])
+        return None
+    
+    def repair_pods(self, pods: List[CompactPod], added: List[str] = (), removed: List[str] = (),
+                    target_size: int = 4, max_size: int = 8, min_size: int = 3,
+                    size_policy: Optional[SizePolicy] = None) -> List[CompactPod]:
+        """Adjust an assignment for late arrivals and drops, changing as few pods as possible
+        
+        Names match case-insensitively, as in the roster. Arrivals who are
+        already seated are skipped; a departure who is not seated raises
+        ValueError.
+        """
+        target_size = max(min_size, min(target_size, max_size))
+        groups = [
+            pod.member_ids if isinstance(pod, CompactPod) else self.registry.intern_all(pod.players)
+            for pod in pods
+        ]
+        # Player ID -> pod index, carried over from the previous repair of the same pods
+        if self._seat_index is not None and self._seat_index[0] is pods:
+            location = self._seat_index[1]
+        else:
+            location = {player_id: i for i, members in enumerate(groups) for player_id in members}
+        self._seat_index = None
+        touched = set()
+        
+        def seated_id(name: str) -> Optional[int]:
+            for player_id in self.registry.ids_matching(name):
+                if player_id in location:
+                    return player_id
+            return None
+        
+        # Take dropped players out of their pods
+        removed_by_pod: Dict[int, set] = {}
+        leaving = {name.strip().casefold(): name.strip() for name in removed if name.strip()}
+        for name in leaving.values():
+            player_id = seated_id(name)
+            if player_id is None:
+                raise ValueError(f"{name} is not in the current pods")
+            removed_by_pod.setdefault(location.pop(player_id), set()).add(player_id)
+        for i, removed_ids in removed_by_pod.items():
+            groups[i] = array('I', [p for p in groups[i] if p not in removed_ids])
+            touched.add(i)
+        
+        arrivals = []
+        for name in added:
+            if name.strip() and seated_id(name) is None:
+                player_id = self.registry.intern(name.strip())
+                location[player_id] = -1  # Waiting for a seat; also skips repeats in the list
+                arrivals.append(player_id)
+        sizes = [len(members) for members in groups]
+        
+        def move_into(i: int, player_id: int):
+            if i not in touched:
+                groups[i] = array('I', groups[i])  # Never modify the caller's pods
+                touched.add(i)
+            groups[i].append(player_id)
+            sizes[i] += 1
+            location[player_id] = i
+        
+        # Refill pods that dropped below the minimum first
+        for i in sorted(touched, key=lambda k: sizes[k]):
+            while sizes[i] < min_size and arrivals:
+                move_into(i, arrivals.pop())
+        
+        # Seat remaining arrivals in the smallest pods with room
+        open_pods = [(size, i) for i, size in enumerate(sizes) if size < max_size]
+        heapq.heapify(open_pods)
+        while arrivals and open_pods:
+            size, i = heapq.heappop(open_pods)
+            if size != sizes[i] or size >= max_size:
+                continue  # Stale entry
+            if size >= target_size and len(arrivals) >= min_size:
+                break  # Enough arrivals for a pod of their own
+            move_into(i, arrivals.pop())
+            if sizes[i] < max_size:
+                heapq.heappush(open_pods, (sizes[i], i))
+        
+        if arrivals:
+            for size in expand_pod_sizes(plan_pod_sizes(len(arrivals), target_size, 1, max_size)):
+                groups.append(array('I', arrivals[:size]))
+                sizes.append(size)
+                for player_id in arrivals[:size]:
+                    location[player_id] = len(groups) - 1
+                touched.add(len(groups) - 1)
+                del arrivals[:size]
+        
+        # Fix pods still below the minimum by borrowing from the largest pods
+        donors = [(-size, i) for i, size in enumerate(sizes) if size > min_size]
+        heapq.heapify(donors)
+        for i in sorted(touched, key=lambda k: sizes[k]):
+            while 0 < sizes[i] < min_size:
+                donor = None
+                while donors:
+                    size, j = heapq.heappop(donors)
+                    if -size == sizes[j] and sizes[j] > min_size and j != i:
+                        donor = j
+                        break
+                if donor is None:
+                    break
                 
-            # Calculate base size and remainder
-            base_size = total_players // num_pods
-            remainder = total_players % num_pods
-            
-            # Create pods with balanced distribution
-            current_pods = []
-            current_index = 0
+                if donor not in touched:
+                    groups[donor] = array('I', groups[donor])
+                    touched.add(donor)
+                move_into(i, groups[donor].pop())
+                sizes[donor] -= 1
+                if sizes[donor] > min_size:
+                    heapq.heappush(donors, (-sizes[donor], donor))
             
-            for i in range(num_pods):
-                # Some pods get one extra player to handle remainder
-                pod_size = base_size + (1 if i < remainder else 0)
-                
-                if pod_size == 0:
-                    continue
-                    
-                # Ensure pod size is within valid range
-                pod_size = max(3, min(pod_size, max_size))
-                
-                # Add players to this pod
-                pod_players = players[current_index:current_index + pod_size]
-                current_pods.append(Pod(
-                    id=i + 1,
-                    players=pod_players,
-                    size=len(pod_players)
-                ))
-                current_index += pod_size
+            if 0 < sizes[i] < min_size:
+                # No spare players anywhere: spread this pod over pods with room
+                members = list(groups[i])
+                hosts = [j for j in range(len(groups)) if j != i and 0 < sizes[j] < max_size]
+                if sum(max_size - sizes[j] for j in hosts) < len(members):
+                    return self._replan(groups, target_size, max_size, min_size, size_policy)
+                groups[i] = array('I')
+                sizes[i] = 0
+                for j in hosts:
+                    while members and sizes[j] < max_size:
+                        move_into(j, members.pop())
+        
+        # Re-split the changed pods when the size policy does not allow their sizes
+        if size_policy is not None and any(sizes[i] and sizes[i] not in size_policy.sizes for i in touched):
+            pool = [i for i in touched if sizes[i]]
+            count = sum(sizes[i] for i in pool)
+            # Widen with the smallest untouched pods until the players can be split
+            spare = sorted((i for i, size in enumerate(sizes) if size and i not in touched),
+                           key=lambda k: sizes[k], reverse=True)
+            while not size_policy.is_feasible(count) and spare:
+                pool.append(spare.pop())
+                count += sizes[pool[-1]]
+            if not size_policy.is_feasible(count):
+                return self._replan(groups, target_size, max_size, min_size, size_policy)
             
-            # Check if this distribution uses all players
-            if current_index >= total_players:
-                pods = current_pods
-                break
+            members = [player_id for i in pool for player_id in groups[i]]
+            slots = sorted(pool)
+            for i in slots:
+                groups[i] = array('I')
+                sizes[i] = 0
+            for size in expand_pod_sizes(size_policy.plan(count)):
+                if slots:
+                    i = slots.pop(0)
+                else:
+                    groups.append(array('I'))
+                    sizes.append(0)
+                    i = len(groups) - 1
+                groups[i] = array('I', members[:size])
+                sizes[i] = size
+                touched.add(i)
+                for player_id in members[:size]:
+                    location[player_id] = i
+                del members[:size]
         
-        # Fallback: simple distribution
-        if not pods:
-            pods = self._simple_distribution(players, target_size, max_size)
+        repaired = []
+        for i, members in enumerate(groups):
+            if not members:
+                continue  # Emptied by drops or dissolved
+            pod_id = len(repaired) + 1
+            if i < len(pods) and i not in touched and pods[i].id == pod_id:
+                repaired.append(pods[i])
+            else:
+                repaired.append(CompactPod(pod_id, members, self.registry))
+        
+        # Removing pods shifts later indexes, so only then is the index rebuilt next time
+        if len(repaired) == len(groups):
+            self._seat_index = (repaired, location)
+        self.history.append(repaired)
+        return repaired
+    
+    def _replan(self, groups: List[array], target_size: int, max_size: int, min_size: int,
+                size_policy: Optional[SizePolicy] = None) -> List[CompactPod]:
+        """Fall back to a fresh assignment when a local repair is impossible"""
+        players = self.registry.names_of(p for members in groups for p in members)
+        return self.create_pods(players, target_size, max_size, min_size, size_policy=size_policy)
+    
+    def create_pods_for_config(self, players: List[str], config: Dict[str, Any],
+                               history: List[Dict[str, Any]], target_size: Optional[int] = None,
+                               ratings: Optional[Dict[str, float]] = None,
+                               seed: Optional[int] = None) -> List[CompactPod]:
+        """Create pods using the pairing mode and size limits from a loaded configuration
+        
+        The seed, drawn when not given, is recorded for build_history_entry.
+        """
+        if target_size is None:
+            target_size = config['default_pod_size']
+        size_policy = size_policy_from_config(config, target_size)
+        
+        # The pairing searches swap players freely, so rules take precedence over them
+        constraints = PodConstraints.from_config(config)
+        if constraints:
+            return self.create_pods(
+                players, target_size, config['max_pod_size'], config['min_pod_size'], constraints, seed, size_policy
+            )
+        
+        if config['pairing_mode'] == "balanced":
+            return self.create_pods_balanced(
+                players,
+                ratings or {},
+                target_size,
+                config['max_pod_size'],
+                config['min_pod_size'],
+                config['default_rating'],
+                seed=seed,
+                size_policy=size_policy
+            )
+        
+        if config['pairing_mode'] == "parallel_search":
+            return self.create_pods_parallel(
+                players,
+                history,
+                target_size,
+                config['max_pod_size'],
+                config['pairing_time_budget'],
+                config['min_pod_size'],
+                seed=seed,
+                size_policy=size_policy
+            )
+        
+        if config['pairing_mode'] == "batch_search":
+            return self.create_pods_batch_search(
+                players,
+                history,
+                target_size,
+                config['max_pod_size'],
+                config['min_pod_size'],
+                config['batch_candidates'],
+                seed,
+                size_policy
+            )
+        
+        if config['pairing_mode'] == "annealing":
+            return self.create_pods_annealing(
+                players,
+                history,
+                target_size,
+                config['max_pod_size'],
+                config['pairing_time_budget'],
+                config['min_pod_size'],
+                config['annealing_start_temperature'],
+                config['annealing_end_temperature'],
+                config['seat_balance_weight'],
+                config.get('annealing_max_moves') or None,
+                seed,
+                size_policy
+            )
+        
+        if config['pairing_mode'] == "anytime":
+            search = self.create_pods_anytime(
+                players,
+                history,
+                target_size,
+                config['max_pod_size'],
+                config['anytime_time_budget'],
+                config['min_pod_size'],
+                seed=seed,
+                size_policy=size_policy
+            )
+            search.wait()
+            return search.pods
+        
+        if config['pairing_mode'] == "avoid_repeats":
+            return self.create_pods_avoiding_repeats(
+                players,
+                history,
+                target_size,
+                config['max_pod_size'],
+                config['pairing_time_budget'],
+                config['min_pod_size'],
+                seed,
+                size_policy
+            )
+        
+        return self.create_pods(players, target_size, config['max_pod_size'], config['min_pod_size'],
+                                seed=seed, size_policy=size_policy)
+    
+    def seat_pods(self, pods: List[CompactPod], seat_counts: Dict[str, List[int]]) -> List[CompactPod]:
+        """Reorder each pod so players who rarely went first get the first seat"""
+        seating = SeatingEngine(seat_counts)
+        seated = []
+        for pod in pods:
+            order = seating.order_pod(pod.players)
+            if isinstance(pod, CompactPod):
+                seated.append(CompactPod(pod.id, self.registry.intern_all(order), self.registry))
+            else:
+                seated.append(Pod(pod.id, order, len(order)))
+        
+        # Seat order doesn't change who plays whom, so the seed still applies
+        if self._generation is not None and self._generation[0] is pods:
+            self._generation = (seated, self._generation[1])
+        return seated
+    
+    def adopt_pods(self, pods: List[CompactPod], source: "PodRandomizer",
+                   remember: bool = True) -> List[CompactPod]:
+        """Take over pods made by another randomizer, such as one on a worker thread
+        
+        Pass remember=False when the pods are about to be repaired, so only the
+        repaired assignment lands in the recent history.
+        """
+        adopted = [CompactPod(pod.id, self.registry.intern_all(pod.players), self.registry) for pod in pods]
+        if source._generation is not None and source._generation[0] is pods:
+            self._generation = (adopted, source._generation[1])
+        self.last_search_stats = dict(source.last_search_stats)
+        self.last_from_cache = source.last_from_cache
+        if remember:
+            self.history.append(adopted)
+        return adopted
+    
+    def build_history_entry(self, pods: List[CompactPod],
+                            generation: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Describe an assignment in the stored history format
+        
+        Assignments from seeded generation also record the seed and
+        algorithm version needed to regenerate them. Pods that were stored
+        in between, such as schedule rounds, pass that record as generation.
+        """
+        entry = {
+            "timestamp": datetime.now().isoformat(),
+            "pods": [
+                {
+                    "id": pod.id,
+                    "players": pod.players,
+                    "size": pod.size
+                }
+                for pod in pods
+            ]
+        }
+        if generation is not None:
+            entry.update(generation)
+        elif self._generation is not None and self._generation[0] is pods:
+            entry.update(self._generation[1])
+        return entry
+    
+    def create_pods_parallel(self, players: List[str], history: List[Dict[str, Any]],
+                             target_size: int = 4, max_size: int = 8, time_budget: float = 1.0,
+                             min_size: int = 3, workers: Optional[int] = None,
+                             seed: Optional[int] = None,
+                             size_policy: Optional[SizePolicy] = None,
+                             replay: Optional[Tuple[int, List[int]]] = None) -> List[CompactPod]:
+        """Search for the fewest repeat pairings on all CPU cores within a wall-clock budget
         
+        replay takes a recorded (search_stream, search_steps) and reruns that
+        worker's restarts in this process instead of searching.
+        """
+        if not players:
+            return []
+        
+        target_size = max(min_size, min(target_size, max_size))
+        started = time.perf_counter()
+        # Workers stop at a shared wall-clock deadline; collecting results takes a little longer
+        deadline = time.time() + max(time_budget - 0.1, 0.05)
+        seeded = seed is not None
+        seed, _, players = self._seeded(players, seed)
+        member_ids = self.registry.intern_all(players)
+        sizes = list(expand_pod_sizes(self._plan_sizes(len(member_ids), target_size, min_size, max_size, size_policy)))
+        
+        # Workers get history as roster positions so they never need the registry
+        index = {player_id: i for i, player_id in enumerate(member_ids)}
+        history_pods = []
+        for pod in self._history_pods(history):
+            members = [index[p] for p in pod if p in index]
+            if len(members) > 1:
+                history_pods.append(members)
+        
+        key = self._cache_key(
+            players, target_size, min_size, max_size, None, seed, "parallel_search", size_policy,
+            hashlib.sha256(json.dumps(history_pods).encode("utf-8")).hexdigest()
+        ) if seeded else None
+        cached = self._cached_assignment(key)
+        if cached is not None:
+            return cached
+        
+        workers = workers or os.cpu_count() or 1
+        
+        # (stream, result) per worker
+        results = []
+        if replay is not None:
+            stream, steps = replay
+            results = [(stream, search_worker(len(member_ids), sizes, history_pods, seed, stream, deadline, steps))]
+            workers = 1
+        else:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    futures = [
+                        # Each worker searches its own counter-based stream of the run seed
+                        executor.submit(search_worker, len(member_ids), sizes, history_pods, seed, worker, deadline)
+                        for worker in range(workers)
+                    ]
+                    results = [(worker, future.result()) for worker, future in enumerate(futures)]
+            except (OSError, NotImplementedError, RuntimeError):
+                # No process support on this platform: search in this process instead
+                deadline = max(deadline, time.time() + 0.05)
+                results = [(0, search_worker(len(member_ids), sizes, history_pods, seed, 0, deadline))]
+                workers = 1
+        
+        stream, (best_cost, best_groups, _, steps, digest) = min(results, key=lambda result: result[1][0])
+        self.last_search_stats = {
+            "candidates": sum(result[2] for _, result in results),
+            "workers": workers,
+            "seed": seed,
+            "repeat_pairs": best_cost,
+            "elapsed": time.perf_counter() - started
+        }
+        
+        pods = [
+            CompactPod(i + 1, array('I', [member_ids[p] for p in members]), self.registry)
+            for i, members in enumerate(best_groups)
+        ]
+        # The winning worker's stream and restart iterations are enough to replay it
+        self._record_generation(
+            pods, seed, "parallel_search", target_size, min_size, max_size, size_policy,
+            search_stream=stream, search_steps=steps, history_digest=digest
+        )
+        self._remember_assignment(key, pods)
+        self.history.append(pods)
         return pods
     
-    def _simple_distribution(self, players: List[str], target_size: int, max_size: int) -> List[Pod]:
-        """Simple fallback distribution method"""
+    def count_repeat_pairs(self, pods: List[CompactPod], history: List[Dict[str, Any]]) -> int:
+        """Count how many player pairs in an assignment have already shared a pod"""
+        if isinstance(history, PairCounts):
+            return sum(history.pod_repeats(pod.players) for pod in pods)
+        member_ids = array('I', [p for pod in pods for p in pod.member_ids])
+        minimizer = RepeatMinimizer(member_ids, self._history_pods(history))
+        return minimizer.total_cost([[minimizer.index[p] for p in pod.member_ids] for pod in pods])
+    
+    def _history_pods(self, history: List[Dict[str, Any]]) -> Iterator[array]:
+        """Yield the member IDs of every pod in stored history
+        
+        A PairCounts store can stand in for the history list; each counted
+        meeting is then yielded as a two-player pod.
+        """
+        if isinstance(history, PairCounts):
+            for name_a, name_b, count in history.pairs():
+                pair = self.registry.intern_all((name_a, name_b))
+                for _ in range(count):
+                    yield pair
+            return
+        
+        for entry in history:
+            for pod in entry.get("pods", []):
+                yield self.registry.intern_all(pod.get("players", []))
+    
+    @staticmethod
+    def _plan_sizes(total_players: int, target_size: int, min_size: int,
+                    max_size: int, size_policy: Optional[SizePolicy] = None) -> Tuple[Tuple[int, int], ...]:
+        """Plan pod sizes with the size policy when one is given, else within min-max"""
+        if size_policy is not None:
+            return size_policy.plan(total_players)
+        return plan_pod_sizes(total_players, target_size, min_size, max_size)
+    
+    def _calculate_pod_distribution(self, member_ids: array, target_size: int, max_size: int,
+                                    min_size: int = 3,
+                                    size_policy: Optional[SizePolicy] = None) -> List[CompactPod]:
+        """Slice player IDs into pods following the planned pod sizes"""
         pods = []
-        pod_id = 1
-        i = 0
+        player_index = 0
         
-        while i < len(players):
-            # Determine pod size (prefer target size, adjust for remainder)
-            remaining_players = len(players) - i
-            pod_size = min(target_size, remaining_players)
-            
-            # If this is the last pod and too small, merge with previous
-            if remaining_players < 3 and pods:
-                # Add remaining players to last pod if it won't exceed max_size
-                if len(pods[-1].players) + remaining_players <= max_size:
-                    pods[-1].players.extend(players[i:])
-                    pods[-1].size = len(pods[-1].players)
-                    break
-                # Otherwise, make a smaller pod (better than excluding players)
-                elif remaining_players > 0:
-                    pod_size = remaining_players
-            
-            # Create pod
-            pod_players = players[i:i + pod_size]
-            pods.append(Pod(
-                id=pod_id,
-                players=pod_players,
-                size=len(pod_players)
+        for size in expand_pod_sizes(self._plan_sizes(len(member_ids), target_size, min_size, max_size, size_policy)):
+            pods.append(CompactPod(
+                len(pods) + 1,
+                member_ids[player_index:player_index + size],
+                self.registry
             ))
-            
-            i += pod_size
-            pod_id += 1
+            player_index += size
         
         return pods
     
-    def get_statistics(self, pods: List[Pod]) -> Dict:
+    def get_statistics(self, pods: List[CompactPod]) -> Dict:
         """Get statistics about pod distribution"""
         if not pods:
             return {"total_pods": 0, "total_players": 0, "avg_pod_size": 0}
@@ -143,7 +1212,7 @@ class PodRandomizer:
             "pod_sizes": pod_sizes
         }
     
-    def get_history(self) -> List[List[Pod]]:
+    def get_history(self) -> List[List[CompactPod]]:
         """Get history of pod assignments"""
         return self.history.copy()
     
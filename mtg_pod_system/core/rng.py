@@ -0,0 +1,74 @@
+import hashlib
+import os
+import random
+from typing import Any, Optional, Tuple
+
+MASK64 = 0xFFFFFFFFFFFFFFFF
+GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+
+def mix64(value: int) -> int:
+    """SplitMix64 finalizer: scramble a 64-bit integer"""
+    value &= MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK64
+    return value ^ (value >> 31)
+
+def seed_to_key(seed: Any) -> int:
+    """Stable 64-bit key for an int, str or bytes seed"""
+    if isinstance(seed, int):
+        return seed & MASK64
+    if isinstance(seed, str):
+        seed = seed.encode("utf-8")
+    return int.from_bytes(hashlib.sha256(seed).digest()[:8], "big")
+
+class CounterRNG(random.Random):
+    """Counter-based generator: output i is a pure function of (key, i)
+
+    Jumping to any position or deriving an independent stream is O(1), so
+    rounds and workers can each get their own reproducible stream.
+    """
+
+    VERSION = 1
+
+    def __init__(self, seed: Any = None, counter: int = 0):
+        self.counter = 0
+        super().__init__(seed)
+        self.counter = counter
+
+    def seed(self, a: Any = None, version: int = 2):
+        """Set the key; without a seed a random one is drawn from the OS"""
+        if a is None:
+            a = int.from_bytes(os.urandom(8), "big")
+        self.key = seed_to_key(a)
+        self.counter = 0
+        self.gauss_next = None
+
+    def _next64(self) -> int:
+        self.counter += 1
+        return mix64(self.key + self.counter * GOLDEN_GAMMA)
+
+    def random(self) -> float:
+        return (self._next64() >> 11) * (1.0 / (1 << 53))
+
+    def getrandbits(self, k: int) -> int:
+        if k < 0:
+            raise ValueError("number of bits must be non-negative")
+        value, bits = 0, 0
+        while bits < k:
+            value = (value << 64) | self._next64()
+            bits += 64
+        return value >> (bits - k)
+
+    def jump(self, counter: int):
+        """Continue from an absolute position in the stream"""
+        self.counter = counter
+
+    def stream(self, index: int) -> "CounterRNG":
+        """Independent generator for a numbered substream (a round, a worker)"""
+        return CounterRNG(mix64(self.key ^ mix64(index + GOLDEN_GAMMA)))
+
+    def getstate(self) -> Tuple[int, int, int, Optional[float]]:
+        return (self.VERSION, self.key, self.counter, self.gauss_next)
+
+    def setstate(self, state: Tuple[int, int, int, Optional[float]]):
+        _, self.key, self.counter, self.gauss_next = state
@@ -0,0 +1,122 @@
+import random
+import time
+from typing import List, Optional, Sequence
+
+class ScheduleOptimizer:
+    """Plans several rounds at once so players share a pod at most once where possible"""
+
+    def __init__(self, player_count: int):
+        self.player_count = player_count
+        # Times each pair meets across the whole schedule
+        self.meetings = [[0] * player_count for _ in range(player_count)]
+        self.last_iterations = 0
+
+    def _add_pod(self, members: Sequence[int], amount: int):
+        """Add or remove one pod's pairings from the meeting counts"""
+        meetings = self.meetings
+        for i, a in enumerate(members):
+            for b in members[i + 1:]:
+                meetings[a][b] += amount
+                meetings[b][a] += amount
+
+    def total_cost(self) -> int:
+        """Number of repeat meetings across the schedule"""
+        cost = 0
+        for a, row in enumerate(self.meetings):
+            for count in row[a + 1:]:
+                if count > 1:
+                    cost += count - 1
+        return cost
+
+    def optimize(self, rounds: List[List[List[int]]], time_budget: float = 2.0, rng=None,
+                 max_iterations: Optional[int] = None) -> List[List[List[int]]]:
+        """Improve rounds in place with within-round swaps until the budget runs out
+
+        The iterations run are kept in last_iterations; passing them back as
+        max_iterations with the same generator replays the search exactly.
+        """
+        rng = rng if rng is not None else random
+        self.last_iterations = 0
+        for groups in rounds:
+            for members in groups:
+                self._add_pod(members, 1)
+
+        searchable = [r for r, groups in enumerate(rounds) if len(groups) > 1]
+        if not searchable:
+            return rounds
+
+        meetings = self.meetings
+        deadline = time.perf_counter() + time_budget
+
+        # Position of each player in each round
+        locations = []
+        for groups in rounds:
+            location = [None] * self.player_count
+            for g, members in enumerate(groups):
+                for slot, player in enumerate(members):
+                    location[player] = (g, slot)
+            locations.append(location)
+
+        players = [p for members in rounds[0] for p in members]
+        cost = self.total_cost()
+        iterations = 0
+
+        while cost > 0 and (max_iterations is None or iterations < max_iterations):
+            if iterations & 255 == 255 and time.perf_counter() >= deadline:
+                break
+            iterations += 1
+
+            r = rng.choice(searchable)
+            groups = rounds[r]
+            location = locations[r]
+
+            a = rng.choice(players)
+            ga, slot_a = location[a]
+            pod_a = groups[ga]
+            row_a = meetings[a]
+
+            # Only players meeting someone again this round are worth moving
+            if all(row_a[x] < 2 for x in pod_a if x != a):
+                continue
+
+            b = rng.choice(players)
+            gb, slot_b = location[b]
+            if ga == gb:
+                continue
+            pod_b = groups[gb]
+            row_b = meetings[b]
+
+            # Leaving a pair frees a repeat when it met more than once;
+            # joining one adds a repeat when it has met before
+            delta = 0
+            for x in pod_a:
+                if x != a:
+                    delta -= row_a[x] >= 2
+                    delta += row_b[x] >= 1
+            for y in pod_b:
+                if y != b:
+                    delta -= row_b[y] >= 2
+                    delta += row_a[y] >= 1
+
+            if delta < 0 or (delta == 0 and rng.random() < 0.1):
+                for x in pod_a:
+                    if x != a:
+                        row_a[x] -= 1
+                        meetings[x][a] -= 1
+                        row_b[x] += 1
+                        meetings[x][b] += 1
+                for y in pod_b:
+                    if y != b:
+                        row_b[y] -= 1
+                        meetings[y][b] -= 1
+                        row_a[y] += 1
+                        meetings[y][a] += 1
+
+                pod_a[slot_a] = b
+                pod_b[slot_b] = a
+                location[a] = (gb, slot_b)
+                location[b] = (ga, slot_a)
+                cost += delta
+
+        self.last_iterations = iterations
+        return rounds
@@ -0,0 +1,46 @@
+import random
+from typing import Any, Dict, List, Optional, Sequence
+
+class SeatingEngine:
+    """Orders the players inside each pod so seat positions, above all going first, even out"""
+
+    def __init__(self, seat_counts: Optional[Dict[str, List[int]]] = None):
+        # Games each player has played from each seat, first seat at index 0
+        self.seat_counts: Dict[str, List[int]] = seat_counts if seat_counts is not None else {}
+
+    def seat_share(self, name: str, seat: int) -> float:
+        """Fraction of a player's games played from the given seat"""
+        counts = self.seat_counts.get(name)
+        if not counts:
+            return 0.0
+        games = sum(counts)
+        return counts[seat] / games if seat < len(counts) and games else 0.0
+
+    def order_pod(self, players: Sequence[str], rng=None) -> List[str]:
+        """Fill seats in order, each with the remaining player who sat there least often"""
+        rng = rng if rng is not None else random
+        remaining = list(players)
+        rng.shuffle(remaining)  # Random tie-break between equally due players
+
+        ordered = []
+        for seat in range(len(players)):
+            best = min(range(len(remaining)), key=lambda i: self.seat_share(remaining[i], seat))
+            ordered.append(remaining.pop(best))
+        return ordered
+
+    def record_pod(self, players: Sequence[str]):
+        """Count one game from the seats in a pod's player order"""
+        for seat, name in enumerate(players):
+            counts = self.seat_counts.setdefault(name, [])
+            if len(counts) <= seat:
+                counts.extend([0] * (seat + 1 - len(counts)))
+            counts[seat] += 1
+
+    def record_entry(self, entry: Dict[str, Any]):
+        """Count every pod of a history entry"""
+        for pod in entry.get("pods", []):
+            self.record_pod(pod.get("players", []))
+
+    def first_seat_counts(self) -> Dict[str, int]:
+        """How often each player went first"""
+        return {name: counts[0] if counts else 0 for name, counts in self.seat_counts.items()}
@@ -0,0 +1,90 @@
+from array import array
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple
+
+# Player counts covered by the tables built up front
+TABLE_SIZE = 100_000
+
+class SizePolicy:
+    """Exact pod-size planning over an allowed set of sizes with per-size preference weights
+
+    Each pod of size s costs weights[s]; the plan is the cheapest partition of
+    the players into allowed sizes, found by dynamic programming. Pod counts per
+    size are tabulated for every player count up to the table size, so a plan
+    is a lookup.
+    """
+
+    def __init__(self, allowed_sizes: Sequence[int], weights: Optional[Dict[int, float]] = None,
+                 target_size: int = 4, table_size: int = TABLE_SIZE):
+        sizes = sorted({int(size) for size in allowed_sizes}, reverse=True)
+        if not sizes or sizes[-1] < 1:
+            raise ValueError(f"Invalid allowed pod sizes: {list(allowed_sizes)}")
+        self.sizes: Tuple[int, ...] = tuple(sizes)
+        weights = weights or {}
+        # Default: stay close to the target
+        self.preferences = {size: float(weights.get(size, (size - target_size) ** 2)) for size in self.sizes}
+        # A tiny per-pod cost breaks ties toward fewer pods
+        self.weights = {size: weight + 1e-6 for size, weight in self.preferences.items()}
+        self.table_size = 0
+        self._cost = array('d', [0.0])
+        self._counts = {size: array('I', [0]) for size in self.sizes}
+        self._extend(table_size)
+
+    def _extend(self, limit: int):
+        """Fill the DP tables up to the given player count"""
+        cost, counts = self._cost, self._counts
+        infinity = float("inf")
+        options = [(size, self.weights[size], counts[size]) for size in self.sizes]
+        for n in range(self.table_size + 1, limit + 1):
+            best, best_size = infinity, 0
+            for size, weight, _ in options:
+                if size <= n:
+                    candidate = cost[n - size] + weight
+                    if candidate < best:
+                        best, best_size = candidate, size
+            cost.append(best)
+            for size, _, table in options:
+                if best_size:
+                    table.append(table[n - best_size] + (size == best_size))
+                else:
+                    table.append(0)
+        self.table_size = max(self.table_size, limit)
+
+    def describe(self) -> Dict[str, Dict[str, float]]:
+        """Allowed sizes and weights in a form that can be stored and passed back to get_size_policy"""
+        return {"weights": {str(size): weight for size, weight in self.preferences.items()}}
+
+    def is_feasible(self, total_players: int) -> bool:
+        """Whether the players can be split into allowed sizes at all"""
+        if total_players > self.table_size:
+            self._extend(total_players)
+        return self._cost[total_players] != float("inf")
+
+    def plan(self, total_players: int) -> Tuple[Tuple[int, int], ...]:
+        """Pod sizes as (size, count) pairs, largest size first"""
+        if total_players <= 0:
+            return ()
+        if not self.is_feasible(total_players):
+            raise ValueError(
+                f"Cannot split {total_players} players into pods of "
+                f"{', '.join(str(size) for size in sorted(self.sizes))} players"
+            )
+        return tuple(
+            (size, self._counts[size][total_players])
+            for size in self.sizes
+            if self._counts[size][total_players]
+        )
+
+@lru_cache(maxsize=16)
+def get_size_policy(allowed_sizes: Tuple[int, ...], weights: Tuple[Tuple[int, float], ...] = (),
+                    target_size: int = 4) -> SizePolicy:
+    """Shared policy per configuration, so tables are built once"""
+    return SizePolicy(allowed_sizes, dict(weights), target_size)
+
+def size_policy_from_config(config: Dict, target_size: Optional[int] = None) -> Optional[SizePolicy]:
+    """Policy for the configured allowed_pod_sizes, None when any size in the min-max range is fine"""
+    allowed = config.get("allowed_pod_sizes") or []
+    if not allowed:
+        return None
+    weights = tuple(sorted((int(size), float(weight)) for size, weight in config.get("pod_size_weights", {}).items()))
+    return get_size_policy(tuple(sorted(set(allowed))), weights, target_size or config.get("default_pod_size", 4))
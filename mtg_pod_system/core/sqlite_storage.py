@@ -0,0 +1,293 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+from core.data_storage import DataStorage
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    position INTEGER,
+    active INTEGER NOT NULL DEFAULT 0,
+    rating REAL
+);
+CREATE TABLE IF NOT EXISTS assignments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS pods (
+    id INTEGER PRIMARY KEY,
+    assignment_id INTEGER NOT NULL REFERENCES assignments(id) ON DELETE CASCADE,
+    pod_number INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pod_members (
+    pod_id INTEGER NOT NULL REFERENCES pods(id) ON DELETE CASCADE,
+    seat INTEGER NOT NULL,
+    player_id INTEGER NOT NULL REFERENCES players(id),
+    PRIMARY KEY (pod_id, seat)
+);
+CREATE INDEX IF NOT EXISTS idx_players_active ON players(active, position);
+CREATE INDEX IF NOT EXISTS idx_assignments_timestamp ON assignments(timestamp);
+CREATE INDEX IF NOT EXISTS idx_pods_assignment ON pods(assignment_id);
+CREATE INDEX IF NOT EXISTS idx_pod_members_player ON pod_members(player_id);
+"""
+
+class SQLiteStorage(DataStorage):
+    """DataStorage backend that keeps players and history in an SQLite database"""
+
+    def __init__(self, data_dir: str = "data", db_name: str = "mtg_pods.db"):
+        super().__init__(data_dir)
+        self.db_file = os.path.join(data_dir, db_name)
+        self._lock = threading.RLock()
+        self._conn = self._connect()
+        self._migrate_json_files()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database in WAL mode and make sure the schema exists"""
+        conn = sqlite3.connect(self.db_file, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.executescript(SCHEMA)
+        # Databases created before ratings existed lack the column
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(players)")}
+        if "rating" not in columns:
+            conn.execute("ALTER TABLE players ADD COLUMN rating REAL")
+        return conn
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    def _migrate_json_files(self):
+        """Import existing JSON players and history into an empty database"""
+        with self._lock:
+            has_players = self._conn.execute("SELECT 1 FROM players LIMIT 1").fetchone()
+            has_history = self._conn.execute("SELECT 1 FROM assignments LIMIT 1").fetchone()
+
+        if not has_players:
+            data = self.load_json(self.players_file)
+            players = data.get("players", [])
+            if players:
+                self.save_players(players, data.get("ratings", {}))
+
+        if not has_history:
+            # Read the files directly: load_history now reads the still-empty database
+            self.load_config()
+            history = self._read_history_files()
+            if history:
+                self.save_history(history)
+
+    def _player_id(self, name: str) -> int:
+        """Get the row ID for a player name, creating the row if needed"""
+        row = self._conn.execute("SELECT id FROM players WHERE name = ?", (name,)).fetchone()
+        if row:
+            return row[0]
+        return self._conn.execute("INSERT INTO players (name) VALUES (?)", (name,)).lastrowid
+
+    def save_players(self, players: List[str], ratings: Optional[Dict[str, float]] = None) -> bool:
+        """Save player list, keeping the stored ratings unless new ones are given"""
+        try:
+            with self._lock, self._conn:
+                # Players stay in the table for history, only the roster flag changes
+                self._conn.execute("UPDATE players SET active = 0, position = NULL WHERE active = 1")
+                self._conn.executemany(
+                    "INSERT INTO players (name, position, active) VALUES (?, ?, 1) "
+                    "ON CONFLICT(name) DO UPDATE SET position = excluded.position, active = 1",
+                    [(name, position) for position, name in enumerate(players)]
+                )
+                if ratings is not None:
+                    self._conn.execute("UPDATE players SET rating = NULL WHERE active = 1")
+                    self._conn.executemany(
+                        "UPDATE players SET rating = ? WHERE name = ?",
+                        [(rating, name) for name, rating in ratings.items()]
+                    )
+            return True
+        except Exception as e:
+            print(f"Error saving players to {self.db_file}: {e}")
+            return False
+
+    def load_players(self) -> List[str]:
+        """Load player list"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name FROM players WHERE active = 1 ORDER BY position"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def load_ratings(self) -> Dict[str, float]:
+        """Load ratings of rated players on the roster"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, rating FROM players WHERE active = 1 AND rating IS NOT NULL"
+            ).fetchall()
+        return {name: rating for name, rating in rows}
+
+    def _insert_assignment(self, entry: Dict[str, Any]):
+        """Insert one history entry with its pods and members"""
+        extra = {k: v for k, v in entry.items() if k not in ("timestamp", "pods")}
+        assignment_id = self._conn.execute(
+            "INSERT INTO assignments (timestamp, extra) VALUES (?, ?)",
+            (entry.get("timestamp", datetime.now().isoformat()), json.dumps(extra) if extra else None)
+        ).lastrowid
+
+        for pod in entry.get("pods", []):
+            players = pod.get("players", [])
+            pod_id = self._conn.execute(
+                "INSERT INTO pods (assignment_id, pod_number, size) VALUES (?, ?, ?)",
+                (assignment_id, pod.get("id", 0), pod.get("size", len(players)))
+            ).lastrowid
+            self._conn.executemany(
+                "INSERT INTO pod_members (pod_id, seat, player_id) VALUES (?, ?, ?)",
+                [(pod_id, seat, self._player_id(name)) for seat, name in enumerate(players)]
+            )
+
+    def _load_assignments(self, assignment_rows: List[tuple]) -> List[Dict[str, Any]]:
+        """Rebuild history entries for the given (id, timestamp, extra) rows"""
+        if not assignment_rows:
+            return []
+
+        ids = [row[0] for row in assignment_rows]
+        placeholders = ",".join("?" * len(ids))
+        member_rows = self._conn.execute(
+            f"SELECT pods.assignment_id, pods.id, pods.pod_number, pods.size, players.name "
+            f"FROM pods "
+            f"JOIN pod_members ON pod_members.pod_id = pods.id "
+            f"JOIN players ON players.id = pod_members.player_id "
+            f"WHERE pods.assignment_id IN ({placeholders}) "
+            f"ORDER BY pods.assignment_id, pods.pod_number, pod_members.seat",
+            ids
+        ).fetchall()
+
+        pods_by_assignment: Dict[int, Dict[int, Dict[str, Any]]] = {i: {} for i in ids}
+        for assignment_id, pod_id, pod_number, size, name in member_rows:
+            pods = pods_by_assignment[assignment_id]
+            if pod_id not in pods:
+                pods[pod_id] = {"id": pod_number, "players": [], "size": size}
+            pods[pod_id]["players"].append(name)
+
+        entries = []
+        for assignment_id, timestamp, extra in assignment_rows:
+            entry = {"timestamp": timestamp, "pods": list(pods_by_assignment[assignment_id].values())}
+            if extra:
+                entry.update(json.loads(extra))
+            entries.append(entry)
+        return entries
+
+    def save_history(self, history: List[Dict[str, Any]]) -> bool:
+        """Save pod assignment history"""
+        try:
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM assignments")
+                for entry in history:
+                    self._insert_assignment(entry)
+            return True
+        except Exception as e:
+            print(f"Error saving history to {self.db_file}: {e}")
+            return False
+
+    def append_history(self, entry: Dict[str, Any]) -> bool:
+        """Add one assignment to history; older assignments stay queryable"""
+        try:
+            with self._lock:
+                previous_signature = self._history_signature()
+                with self._conn:
+                    self._insert_assignment(entry)
+                self._track_pairings(entry, previous_signature)
+            return True
+        except Exception as e:
+            print(f"Error appending history to {self.db_file}: {e}")
+            return False
+
+    def load_history(self) -> List[Dict[str, Any]]:
+        """Load pod assignment history"""
+        return self.load_recent_history(self.max_history_items)
+
+    def load_recent_history(self, limit: int) -> List[Dict[str, Any]]:
+        """Load the most recent history entries, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, timestamp, extra FROM assignments ORDER BY id DESC LIMIT ?",
+                (max(limit, 0),)
+            ).fetchall()
+            return self._load_assignments(rows[::-1])
+
+    def _history_signature(self) -> Any:
+        """Newest assignment ID and count, which change with every history write"""
+        with self._lock:
+            return self._conn.execute("SELECT MAX(id), COUNT(*) FROM assignments").fetchone()
+
+    def pods_containing(self, name: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recent pods a player was part of, newest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT assignments.timestamp, pods.id, pods.pod_number, pods.size "
+                "FROM players "
+                "JOIN pod_members ON pod_members.player_id = players.id "
+                "JOIN pods ON pods.id = pod_members.pod_id "
+                "JOIN assignments ON assignments.id = pods.assignment_id "
+                "WHERE players.name = ? "
+                "ORDER BY assignments.id DESC LIMIT ?",
+                (name, limit)
+            ).fetchall()
+
+            results = []
+            for timestamp, pod_id, pod_number, size in rows:
+                members = self._conn.execute(
+                    "SELECT players.name FROM pod_members "
+                    "JOIN players ON players.id = pod_members.player_id "
+                    "WHERE pod_members.pod_id = ? ORDER BY pod_members.seat",
+                    (pod_id,)
+                ).fetchall()
+                results.append({
+                    "timestamp": timestamp,
+                    "id": pod_number,
+                    "players": [row[0] for row in members],
+                    "size": size
+                })
+            return results
+
+    def count_assignments(self) -> int:
+        """Total number of stored assignments"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM assignments").fetchone()[0]
+
+    def _backup_files(self) -> List[str]:
+        """Data files included in backups"""
+        return super()._backup_files() + [self.db_file]
+
+    def create_backup(self) -> bool:
+        """Create backup of all data files, including the database"""
+        try:
+            with self._lock:
+                # Fold the WAL into the main file so a plain copy is consistent
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                return super().create_backup()
+        except Exception as e:
+            print(f"Error creating backup: {e}")
+            return False
+
+    def restore_backup(self, backup_name: str) -> bool:
+        """Restore from a backup and reopen the database"""
+        with self._lock:
+            self._conn.close()
+            try:
+                return super().restore_backup(backup_name)
+            finally:
+                self._conn = self._connect()
+
+
+def open_storage(data_dir: str = "data") -> DataStorage:
+    """Open the storage backend selected by storage_backend in config.json"""
+    storage = DataStorage(data_dir)
+    if storage.load_config().get("storage_backend") == "sqlite":
+        storage = SQLiteStorage(data_dir)
+        storage.load_config()
+    return storage
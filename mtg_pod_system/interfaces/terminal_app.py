@@ -1,13 +1,20 @@
 import sys
 import os
-from typing import List, Optional
+import time
+import hashlib
+import json
+import threading
+from typing import Any, Dict, List, Optional
 
 # Add the project root to the path so we can import core modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.player_manager import PlayerManager
 from core.pod_randomizer import PodRandomizer, Pod
-from core.data_storage import DataStorage
+from core.constraints import PodConstraints
+from core.pair_counts import PairCounts
+from core.size_policy import size_policy_from_config
+from core.sqlite_storage import open_storage
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
@@ -15,6 +22,7 @@ from rich.prompt import Prompt, Confirm
 from rich.text import Text
 from rich.layout import Layout
 from rich.align import Align
+from rich.live import Live
 from rich import print as rprint
 
 class TerminalInterface:
@@ -22,10 +30,17 @@ class TerminalInterface:
     
     def __init__(self):
         self.console = Console()
-        self.player_manager = PlayerManager()
-        self.pod_randomizer = PodRandomizer()
-        self.data_storage = DataStorage()
+        self.data_storage = open_storage()
         self.config = self.data_storage.load_config()
+        self.player_manager = PlayerManager(storage=self.data_storage)
+        self.pod_randomizer = PodRandomizer()
+        self.current_pods: Optional[List[Pod]] = None
+        # Repeat pairings of the current pods against history before they were played
+        self.current_repeat_pairs = 0
+        # Next round computed in the background while the current one is played
+        self._next_round: Optional[Dict[str, Any]] = None
+        # What the latest round was made from, so it can be shown again without saving it twice
+        self._last_round: Optional[Dict[str, Any]] = None
         
     def run(self):
         """Main application loop"""
@@ -34,7 +49,7 @@ class TerminalInterface:
         
         while True:
             self.show_main_menu()
-            choice = self.get_menu_choice("Select an option", ["1", "2", "3", "4", "5", "6", "7", "q"])
+            choice = self.get_menu_choice("Select an option", ["1", "2", "3", "4", "5", "6", "7", "8", "9", "q"])
             
             if choice == "1":
                 self.manage_players()
@@ -50,6 +65,10 @@ class TerminalInterface:
                 self.show_statistics()
             elif choice == "7":
                 self.quick_randomize()
+            elif choice == "8":
+                self.schedule_menu()
+            elif choice == "9":
+                self.adjust_pods()
             elif choice.lower() == "q":
                 self.console.print("Goodbye!", style="bold green")
                 break
@@ -81,6 +100,8 @@ class TerminalInterface:
             ("5.", "Data Management", "magenta"),
             ("6.", "Statistics", "red"),
             ("7.", "Quick Randomize", "bright_green"),
+            ("8.", "League Schedule", "yellow"),
+            ("9.", "Late Arrivals / Drops", "cyan"),
             ("q.", "Quit", "red")
         ]
         
@@ -111,9 +132,10 @@ class TerminalInterface:
                 self.display_players_table()
                 self.console.print()
             
-            choices = ["1", "2", "3", "4", "5", "b"]
+            choices = ["1", "2", "3", "4", "5", "6", "7", "8", "b"]
             choice = self.get_menu_choice(
-                "1) Add Player  2) Add Multiple  3) Remove Player  4) Search  5) Clear All  b) Back",
+                "1) Add Player  2) Add Multiple  3) Remove Player  4) Search  5) Clear All  6) Rename  "
+                "7) Set Rating  8) Pairing Rules  b) Back",
                 choices
             )
             
@@ -127,6 +149,12 @@ class TerminalInterface:
                 self.search_players()
             elif choice == "5":
                 self.clear_all_players()
+            elif choice == "6":
+                self.rename_player()
+            elif choice == "7":
+                self.set_player_rating()
+            elif choice == "8":
+                self.manage_constraints()
             elif choice == "b":
                 break
     
@@ -180,6 +208,80 @@ class TerminalInterface:
             self.console.print(f"Player not found: {name}", style="red")
         Prompt.ask("Press Enter to continue")
     
+    def rename_player(self):
+        """Rename a player"""
+        old_name = Prompt.ask("Enter player name to rename").strip()
+        if not self.player_manager.has_player(old_name):
+            self.console.print(f"Player not found: {old_name}", style="red")
+            Prompt.ask("Press Enter to continue")
+            return
+        
+        new_name = Prompt.ask("Enter new name").strip()
+        if self.player_manager.rename_player(old_name, new_name):
+            self.player_manager.save_players()
+            self.console.print(f"Renamed: {old_name} -> {new_name}", style="green")
+        else:
+            self.console.print("Failed to rename player (empty or duplicate name)", style="red")
+        Prompt.ask("Press Enter to continue")
+    
+    def set_player_rating(self):
+        """Set or clear a player's rating used by balanced pods"""
+        name = Prompt.ask("Enter player name").strip()
+        if not self.player_manager.has_player(name):
+            self.console.print(f"Player not found: {name}", style="red")
+            Prompt.ask("Press Enter to continue")
+            return
+        
+        current = self.player_manager.get_rating(name)
+        value = Prompt.ask("Rating (blank to clear)", default="" if current is None else f"{current:g}").strip()
+        try:
+            rating = float(value) if value else None
+        except ValueError:
+            self.console.print("Invalid number", style="red")
+            Prompt.ask("Press Enter to continue")
+            return
+        
+        self.player_manager.set_rating(name, rating)
+        self.player_manager.save_players()
+        self.console.print(f"Rating for {name}: {'cleared' if rating is None else f'{rating:g}'}", style="green")
+        Prompt.ask("Press Enter to continue")
+    
+    def manage_constraints(self):
+        """Edit keep-together and keep-apart rules"""
+        while True:
+            self.console.clear()
+            self.console.print("Pairing Rules", style="bold blue")
+            for group in self.config['keep_together']:
+                self.console.print(f"Together: {', '.join(group)}", style="green")
+            for pair in self.config['keep_apart']:
+                self.console.print(f"Apart: {' / '.join(pair)}", style="red")
+            self.console.print()
+            
+            choice = self.get_menu_choice(
+                "1) Keep Together  2) Keep Apart  3) Clear Rules  b) Back",
+                ["1", "2", "3", "b"]
+            )
+            
+            if choice == "1":
+                names = [n.strip() for n in Prompt.ask("Players to keep together (comma separated)").split(",") if n.strip()]
+                if len(names) > 1:
+                    self.config['keep_together'].append(names)
+            elif choice == "2":
+                names = [n.strip() for n in Prompt.ask("Two players to keep apart (comma separated)").split(",") if n.strip()]
+                if len(names) == 2:
+                    self.config['keep_apart'].append(names)
+                else:
+                    self.console.print("Enter exactly two players", style="red")
+                    Prompt.ask("Press Enter to continue")
+                    continue
+            elif choice == "3":
+                if Confirm.ask("Remove all pairing rules?"):
+                    self.config['keep_together'] = []
+                    self.config['keep_apart'] = []
+            elif choice == "b":
+                break
+            self.data_storage.save_config(self.config)
+    
     def search_players(self):
         """Search for players"""
         query = Prompt.ask("Enter search term").strip()
@@ -214,9 +316,11 @@ class TerminalInterface:
         table = Table(title="Current Players")
         table.add_column("#", style="cyan", width=4)
         table.add_column("Name", style="white")
+        table.add_column("Rating", style="yellow", justify="right")
         
         for i, player in enumerate(players, 1):
-            table.add_row(str(i), player)
+            rating = self.player_manager.get_rating(player)
+            table.add_row(str(i), player, "" if rating is None else f"{rating:g}")
         
         rprint(table)
     
@@ -240,18 +344,266 @@ class TerminalInterface:
         except ValueError:
             pod_size = self.config['default_pod_size']
         
+        last_round = self._last_round
+        can_reprint = last_round is not None and last_round["pods"] is self.current_pods
+        hint = f", L to show the last round again (seed {last_round['entry'].get('seed')})" if can_reprint else ""
+        seed = Prompt.ask(f"Seed (Enter for a random one{hint})", default="").strip()
+        if seed.lower() == "l" and can_reprint:
+            self._reprint_last_round()
+            return
+        try:
+            seed = int(seed) if seed else None
+        except ValueError:
+            self.console.print("Seed must be a whole number", style="red")
+            Prompt.ask("Press Enter to continue")
+            return
+        
         # Create pods
-        pods = self.pod_randomizer.create_pods(players, pod_size, self.config['max_pod_size'])
+        try:
+            pods = self._generate_pods(players, pod_size, seed)
+        except ValueError as e:
+            self.console.print(f"Cannot create pods: {e}", style="red")
+            Prompt.ask("Press Enter to continue")
+            return
         
         # Display results
         self.display_pods(pods)
+        if self.pod_randomizer.last_from_cache:
+            # These exact pods were already made from this seed, and saved then if history is kept
+            self.console.print("Same pods as before with this seed, not saved again", style="dim")
+            Prompt.ask("Press Enter to continue")
+            return
+        self._set_current_pods(pods)
+        if self.config['pairing_mode'] == "parallel_search":
+            stats = self.pod_randomizer.last_search_stats
+            self.console.print(
+                f"Searched {stats['candidates']} candidates on {stats['workers']} worker(s), "
+                f"{stats['repeat_pairs']} repeat pairing(s)",
+                style="italic cyan"
+            )
+        elif self.config['pairing_mode'] == "batch_search":
+            stats = self.pod_randomizer.last_search_stats
+            self.console.print(
+                f"Scored {stats['candidates']} candidates ({stats['backend']}), "
+                f"{stats['repeat_pairs']} repeat pairing(s)",
+                style="italic cyan"
+            )
+        elif self.config['pairing_mode'] == "annealing":
+            stats = self.pod_randomizer.last_search_stats
+            self.console.print(
+                f"Annealed {stats['moves']} moves, {stats['repeat_pairs']} repeat pairing(s)",
+                style="italic cyan"
+            )
+        elif self.config['pairing_mode'] == "balanced":
+            stats = self.pod_randomizer.last_search_stats
+            self.console.print(
+                f"Average rating spread between pods: {stats['rating_spread']:.1f}",
+                style="italic cyan"
+            )
         
         # Save to history
         if self.config['keep_history']:
             self.save_to_history(pods)
+        self._precompute_next_round(pod_size)
+        
+        Prompt.ask("Press Enter to continue")
+    
+    def _reprint_last_round(self):
+        """Show the latest round again without adding it to history a second time"""
+        last_round = self._last_round
+        # Rebuilt against the history before the round was saved, which the assignment cache still holds
+        try:
+            pods = self.pod_randomizer.regenerate_pods(
+                last_round["entry"], last_round["players"], last_round["history"], last_round["ratings"]
+            )
+        except ValueError as e:
+            self.console.print(f"Cannot rebuild the last round: {e}", style="red")
+            Prompt.ask("Press Enter to continue")
+            return
         
+        # Seat balancing has moved on since, so keep the seat order the round was played with
+        if [set(pod.players) for pod in pods] == [set(pod.players) for pod in self.current_pods]:
+            pods = self.current_pods
+        self.display_pods(pods)
+        self.console.print("Last round shown again, not saved", style="dim")
         Prompt.ask("Press Enter to continue")
     
+    def _remember_round(self, pods: List[Pod], players: List[str], history, ratings: Dict[str, float]):
+        """Keep what the round was made from; the stored pair counts change once it is saved"""
+        if isinstance(history, PairCounts):
+            history = history.copy()
+        self._last_round = {
+            "pods": pods,
+            "players": players,
+            "history": history,
+            "ratings": ratings,
+            "entry": self.pod_randomizer.build_history_entry(pods)
+        }
+    
+    def _pairing_history(self):
+        """History in the form the configured pairing mode needs"""
+        mode = self.config['pairing_mode']
+        if mode in ("random", "balanced"):
+            return []
+        if mode == "annealing":
+            return self.data_storage.load_history()  # Seat balance needs pod sizes
+        return self.data_storage.load_pair_counts()
+    
+    def _settings_fingerprint(self, pod_size: int) -> str:
+        """Hash of everything besides the roster that decides the next round"""
+        settings = {key: value for key, value in self.config.items() if key != "last_saved"}
+        data = json.dumps([settings, pod_size, self.player_manager.get_ratings()], sort_keys=True, default=str)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+    
+    @staticmethod
+    def _roster_fingerprint(players: List[str]) -> str:
+        """Order-independent hash of the roster"""
+        names = sorted(name.casefold() for name in players)
+        return hashlib.sha256("\n".join(names).encode("utf-8")).hexdigest()
+    
+    def _precompute_next_round(self, pod_size: int):
+        """Start computing the likely next round on a worker thread"""
+        players = self.player_manager.get_players()
+        if len(players) < 3:
+            self._next_round = None
+            return
+        
+        # Read storage here so the worker only computes; the stored pair counts
+        # keep changing as history is appended, so the worker gets its own copy
+        history = self._pairing_history()
+        if isinstance(history, PairCounts):
+            history = history.copy()
+        seat_counts = self.data_storage.load_seat_counts() if self.config['balance_seating'] else None
+        config = dict(self.config)
+        ratings = self.player_manager.get_ratings()
+        randomizer = PodRandomizer()
+        result: Dict[str, Any] = {}
+        
+        def work():
+            try:
+                pods = randomizer.create_pods_for_config(players, config, history, pod_size, ratings)
+                if seat_counts is not None:
+                    pods = randomizer.seat_pods(pods, seat_counts)
+                result["pods"] = pods
+            except ValueError:
+                result["pods"] = None
+        
+        thread = threading.Thread(target=work, name="next-round", daemon=True)
+        self._next_round = {
+            "players": players,
+            "roster": self._roster_fingerprint(players),
+            "settings": self._settings_fingerprint(pod_size),
+            "pod_size": pod_size,
+            "history": history,
+            "ratings": ratings,
+            "randomizer": randomizer,
+            "thread": thread,
+            "result": result
+        }
+        thread.start()
+    
+    def _take_next_round(self, players: List[str], pod_size: int) -> Optional[List[Pod]]:
+        """Precomputed pods for this roster, repaired for roster changes, or None"""
+        next_round, self._next_round = self._next_round, None
+        if next_round is None or next_round["pod_size"] != pod_size:
+            return None
+        if next_round["settings"] != self._settings_fingerprint(pod_size):
+            return None  # Settings or ratings changed, the old result doesn't apply
+        
+        next_round["thread"].join()
+        pods = next_round["result"].get("pods")
+        if not pods:
+            return None
+        if next_round["roster"] == self._roster_fingerprint(players):
+            pods = self.pod_randomizer.adopt_pods(pods, next_round["randomizer"])
+            self._remember_round(pods, players, next_round["history"], next_round["ratings"])
+            return pods
+        
+        # Roster changed since: fix up the precomputed pods instead of starting over
+        previous = {name.casefold() for name in next_round["players"]}
+        current = {name.casefold() for name in players}
+        added = [name for name in players if name.casefold() not in previous]
+        removed = [name for name in next_round["players"] if name.casefold() not in current]
+        if len(added) + len(removed) > len(players) // 4:
+            return None  # Too different, a fresh assignment is better
+        return self.pod_randomizer.repair_pods(
+            self.pod_randomizer.adopt_pods(pods, next_round["randomizer"], remember=False),
+            added,
+            removed,
+            pod_size,
+            self.config['max_pod_size'],
+            self.config['min_pod_size'],
+            size_policy_from_config(self.config, pod_size)
+        )
+    
+    def _generate_pods(self, players: List[str], pod_size: int, seed: Optional[int] = None) -> List[Pod]:
+        """Create pods using the configured pairing mode, or take the precomputed next round"""
+        # A chosen seed must decide the pods, so the precomputed round doesn't apply
+        pods = self._take_next_round(players, pod_size) if seed is None else None
+        if pods is not None:
+            self.console.print("Next round was prepared in advance", style="dim")
+            return pods
+        
+        mode = self.config['pairing_mode']
+        history = self._pairing_history()
+        ratings = self.player_manager.get_ratings()
+        
+        if mode == "anytime" and not PodConstraints.from_config(self.config):
+            pods = self._generate_pods_live(players, pod_size, history, seed)
+        else:
+            pods = self.pod_randomizer.create_pods_for_config(
+                players, self.config, history, pod_size, ratings, seed
+            )
+        
+        if self.config['balance_seating']:
+            pods = self.pod_randomizer.seat_pods(pods, self.data_storage.load_seat_counts())
+        if not self.pod_randomizer.last_from_cache:
+            self._remember_round(pods, players, history, ratings)
+        return pods
+    
+    def _generate_pods_live(self, players: List[str], pod_size: int, history,
+                            seed: Optional[int] = None) -> List[Pod]:
+        """Improve pods in the background while showing a live quality meter"""
+        search = self.pod_randomizer.create_pods_anytime(
+            players,
+            history,
+            pod_size,
+            self.config['max_pod_size'],
+            self.config['anytime_time_budget'],
+            self.config['min_pod_size'],
+            seed=seed,
+            size_policy=size_policy_from_config(self.config, pod_size)
+        )
+        self.console.print("Improving pods, press Ctrl+C to take the current best", style="italic")
+        
+        try:
+            with Live(self._quality_meter(search), console=self.console, refresh_per_second=10) as live:
+                while not search.wait(0.1):
+                    live.update(self._quality_meter(search))
+                live.update(self._quality_meter(search))
+        except KeyboardInterrupt:
+            search.cancel()
+            search.wait()
+        return search.pods
+    
+    def _quality_meter(self, search) -> Text:
+        """One-line meter of how many repeat pairings the search has removed"""
+        initial = search.initial_repeat_pairs
+        current = search.repeat_pairs
+        fraction = 1.0 if initial == 0 else (initial - current) / initial
+        filled = int(fraction * 30)
+        
+        meter = Text()
+        meter.append("█" * filled, style="green")
+        meter.append("░" * (30 - filled), style="dim")
+        meter.append(
+            f" {current} repeat pairing(s), started at {initial} | "
+            f"{min(time.perf_counter() - search.started, self.config['anytime_time_budget']):.1f}s"
+            f"{' done' if search.done else ''}",
+            style="cyan"
+        )
+        return meter
+    
     def display_pods(self, pods: List[Pod]):
         """Display pods in a formatted way"""
         self.console.print("Pod Assignment:", style="bold yellow")
@@ -284,48 +636,176 @@ class TerminalInterface:
             Prompt.ask("Press Enter to continue")
             return
         
-        pods = self.pod_randomizer.create_pods(
-            players, 
-            self.config['default_pod_size'], 
-            self.config['max_pod_size']
-        )
+        try:
+            pods = self._generate_pods(players, self.config['default_pod_size'])
+        except ValueError as e:
+            self.console.print(f"Cannot create pods: {e}", style="red")
+            Prompt.ask("Press Enter to continue")
+            return
+        
+        self.display_pods(pods)
+        self._set_current_pods(pods)
+        
+        if self.config['keep_history']:
+            self.save_to_history(pods)
+        self._precompute_next_round(self.config['default_pod_size'])
+        
+        Prompt.ask("Press Enter to continue")
+    
+    def adjust_pods(self):
+        """Update the current pods for late arrivals and drops without reshuffling everyone"""
+        if not self.current_pods:
+            self.console.print("Create pods first", style="yellow")
+            Prompt.ask("Press Enter to continue")
+            return
+        
+        added = [n.strip() for n in Prompt.ask("Arriving players (comma separated)", default="").split(",") if n.strip()]
+        removed = [n.strip() for n in Prompt.ask("Leaving players (comma separated)", default="").split(",") if n.strip()]
+        if not added and not removed:
+            return
+        
+        try:
+            pods = self.pod_randomizer.repair_pods(
+                self.current_pods,
+                added,
+                removed,
+                self.config['default_pod_size'],
+                self.config['max_pod_size'],
+                self.config['min_pod_size'],
+                size_policy_from_config(self.config)
+            )
+        except ValueError as e:
+            self.console.print(f"Cannot create pods: {e}", style="red")
+            Prompt.ask("Press Enter to continue")
+            return
+        
+        # Keep the roster in step with who is actually playing
+        self.player_manager.import_players_from_list(added)
+        for name in removed:
+            self.player_manager.remove_player(name)
+        self.player_manager.save_players()
         
         self.display_pods(pods)
+        self._set_current_pods(pods)
         
         if self.config['keep_history']:
             self.save_to_history(pods)
+        self._precompute_next_round(self.config['default_pod_size'])
         
         Prompt.ask("Press Enter to continue")
     
-    def save_to_history(self, pods: List[Pod]):
+    def _set_current_pods(self, pods: List[Pod]):
+        """Make pods the current round, scoring repeats before the round itself is saved"""
+        self.current_pods = pods
+        self.current_repeat_pairs = self.pod_randomizer.count_repeat_pairs(
+            pods, self.data_storage.load_pair_counts()
+        )
+    
+    def save_to_history(self, pods: List[Pod], generation: Optional[Dict[str, Any]] = None):
         """Save pod assignment to history"""
-        from datetime import datetime
-        
-        history_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "pods": [
-                {
-                    "id": pod.id,
-                    "players": pod.players,
-                    "size": pod.size
-                }
-                for pod in pods
-            ]
-        }
+        self._next_round = None  # Computed against the history before this entry
+        entry = self.pod_randomizer.build_history_entry(pods, generation)
+        if self.data_storage.append_history(entry):
+            self.data_storage.record_seating(entry)
+    
+    def schedule_menu(self):
+        """Plan all rounds of a league night up front and step through them"""
+        while True:
+            self.console.clear()
+            self.console.print("League Schedule", style="bold blue")
+            
+            schedule = self.data_storage.load_schedule()
+            rounds = schedule["rounds"]
+            current = schedule["current_round"]
+            reached = schedule["reached_round"]
+            generation = schedule["generation"]
+            
+            if rounds:
+                self.console.print(f"Round {current + 1} of {len(rounds)}\n", style="cyan")
+                self.display_pods(self._schedule_round_pods(rounds[current]))
+            else:
+                self.console.print("No schedule planned yet\n", style="yellow")
+            
+            choices = ["1", "2", "3", "b"]
+            choice = self.get_menu_choice(
+                "1) Plan New Schedule  2) Next Round  3) Previous Round  b) Back",
+                choices
+            )
+            
+            if choice == "1":
+                self.plan_schedule()
+            elif choice == "2" and rounds:
+                if current + 1 < len(rounds):
+                    self.data_storage.save_schedule(rounds, current + 1, reached, generation)
+                    pods = self._schedule_round_pods(rounds[current + 1])
+                    self._set_current_pods(pods)
+                    # Rounds revisited after stepping back are already in history
+                    if self.config['keep_history'] and current + 1 > reached:
+                        self.save_to_history(pods, self._schedule_round_generation(generation, current + 1))
+                else:
+                    self.console.print("Already at the last round", style="yellow")
+                    Prompt.ask("Press Enter to continue")
+            elif choice == "3" and rounds:
+                self.data_storage.save_schedule(rounds, max(0, current - 1), reached, generation)
+                self._set_current_pods(self._schedule_round_pods(rounds[max(0, current - 1)]))
+            elif choice == "b":
+                break
+    
+    def plan_schedule(self):
+        """Generate and save a new multi-round schedule"""
+        players = self.player_manager.get_players()
+        if len(players) < 3:
+            self.console.print("Need at least 3 players to create pods", style="red")
+            Prompt.ask("Press Enter to continue")
+            return
         
-        history = self.data_storage.load_history()
-        history.append(history_entry)
+        try:
+            rounds = max(1, int(Prompt.ask("Number of rounds", default="6")))
+        except ValueError:
+            self.console.print("Invalid number", style="red")
+            Prompt.ask("Press Enter to continue")
+            return
         
-        # Keep only recent history items
-        max_items = self.config['max_history_items']
-        if len(history) > max_items:
-            history = history[-max_items:]
+        try:
+            with self.console.status("Planning rounds..."):
+                schedule = self.pod_randomizer.create_schedule(
+                    players,
+                    rounds,
+                    self.config['default_pod_size'],
+                    self.config['max_pod_size'],
+                    self.config['min_pod_size'],
+                    size_policy=size_policy_from_config(self.config)
+                )
+        except ValueError as e:
+            self.console.print(f"Cannot create pods: {e}", style="red")
+            Prompt.ask("Press Enter to continue")
+            return
         
-        self.data_storage.save_history(history)
+        generation = self.pod_randomizer.schedule_generation(schedule)
+        self.data_storage.save_schedule([
+            [{"id": pod.id, "players": pod.players, "size": pod.size} for pod in round_pods]
+            for round_pods in schedule
+        ], generation=generation)
+        self._set_current_pods(schedule[0])
+        if self.config['keep_history']:
+            self.save_to_history(schedule[0], self._schedule_round_generation(generation, 0))
+    
+    def _schedule_round_pods(self, round_data: List[dict]) -> List[Pod]:
+        """Rebuild pods for a saved schedule round"""
+        return [Pod(id=pod['id'], players=pod['players'], size=pod['size']) for pod in round_data]
+    
+    @staticmethod
+    def _schedule_round_generation(generation: Optional[Dict[str, Any]],
+                                   round_number: int) -> Optional[Dict[str, Any]]:
+        """How a schedule round was made, for its history entry"""
+        return {**generation, "schedule_round": round_number} if generation else None
     
     def view_history(self):
         """View pod assignment history"""
-        history = self.data_storage.load_history()
+        # Earlier entries too: regenerating a round needs the history it was made with
+        window = self.data_storage.max_history_items
+        earlier = self.data_storage.load_recent_history(window + 10)
+        history = earlier[-10:]
         
         if not history:
             self.console.print("No history available", style="yellow")
@@ -334,13 +814,35 @@ class TerminalInterface:
         
         self.console.print("Pod Assignment History:", style="bold blue")
         
-        for i, entry in enumerate(reversed(history[-10:]), 1):  # Show last 10
+        for i, entry in enumerate(reversed(history), 1):  # Show last 10
             timestamp = entry['timestamp'][:19].replace('T', ' ')
             pod_count = len(entry['pods'])
             player_count = sum(pod['size'] for pod in entry['pods'])
             
-            self.console.print(f"{i}. {timestamp} - {pod_count} pods, {player_count} players", style="cyan")
+            seed = f" (seed {entry['seed']})" if entry.get('seed') is not None else ""
+            self.console.print(f"{i}. {timestamp} - {pod_count} pods, {player_count} players{seed}", style="cyan")
+        
+        choice = Prompt.ask("Regenerate a round from its seed (number, Enter to go back)", default="").strip()
+        if not choice:
+            return
+        number = int(choice) if choice.isdigit() else 0
+        if not 1 <= number <= len(history):
+            self.console.print("No such round", style="red")
+            Prompt.ask("Press Enter to continue")
+            return
+        
+        entry = history[-number]
+        before = earlier[:len(earlier) - number][-window:]
+        try:
+            pods = self.pod_randomizer.regenerate_pods(
+                entry, history=before, ratings=self.player_manager.get_ratings()
+            )
+        except ValueError as e:
+            self.console.print(f"Cannot regenerate: {e}", style="red")
+            Prompt.ask("Press Enter to continue")
+            return
         
+        self.display_pods(pods)
         Prompt.ask("Press Enter to continue")
     
     def settings_menu(self):
@@ -349,11 +851,15 @@ class TerminalInterface:
             self.console.clear()
             self.console.print("Settings", style="bold blue")
             
-            choices = ["1", "2", "3", "b"]
+            choices = ["1", "2", "3", "4", "5", "6", "7", "b"]
             choice = self.get_menu_choice(
                 f"1) Default Pod Size: {self.config['default_pod_size']}  "
                 f"2) Max Pod Size: {self.config['max_pod_size']}  "
-                f"3) Keep History: {self.config['keep_history']}  b) Back",
+                f"3) Keep History: {self.config['keep_history']}  "
+                f"4) Pairing Mode: {self.config['pairing_mode']}  "
+                f"5) Storage: {self.config['storage_backend']}  "
+                f"6) Balanced Seating: {self.config['balance_seating']}  "
+                f"7) Allowed Sizes: {', '.join(map(str, self.config['allowed_pod_sizes'])) or 'any'}  b) Back",
                 choices
             )
             
@@ -385,6 +891,46 @@ class TerminalInterface:
                 status = "enabled" if self.config['keep_history'] else "disabled"
                 self.console.print(f"History keeping {status}", style="green")
                 Prompt.ask("Press Enter to continue")
+            elif choice == "4":
+                modes = ["random", "avoid_repeats", "parallel_search", "batch_search", "annealing", "balanced", "anytime"]
+                current = modes.index(self.config['pairing_mode']) if self.config['pairing_mode'] in modes else -1
+                self.config['pairing_mode'] = modes[(current + 1) % len(modes)]
+                self.data_storage.save_config(self.config)
+                self.console.print(f"Pairing mode set to {self.config['pairing_mode']}", style="green")
+                Prompt.ask("Press Enter to continue")
+            elif choice == "5":
+                if self.config['storage_backend'] == "sqlite":
+                    self.config['storage_backend'] = "json"
+                else:
+                    self.config['storage_backend'] = "sqlite"
+                self.data_storage.save_config(self.config)
+                self.console.print(
+                    f"Storage backend set to {self.config['storage_backend']} (applies on restart)",
+                    style="green"
+                )
+                Prompt.ask("Press Enter to continue")
+            elif choice == "6":
+                self.config['balance_seating'] = not self.config['balance_seating']
+                self.data_storage.save_config(self.config)
+                status = "enabled" if self.config['balance_seating'] else "disabled"
+                self.console.print(f"Balanced seating {status}", style="green")
+                Prompt.ask("Press Enter to continue")
+            elif choice == "7":
+                value = Prompt.ask(
+                    "Allowed pod sizes (comma separated, blank for any size in range)",
+                    default=", ".join(map(str, self.config['allowed_pod_sizes']))
+                )
+                low, high = self.config['min_pod_size'], self.config['max_pod_size']
+                try:
+                    sizes = sorted({int(size) for size in value.split(",") if size.strip()})
+                    if any(size < low or size > high for size in sizes):
+                        raise ValueError
+                    self.config['allowed_pod_sizes'] = sizes
+                    self.data_storage.save_config(self.config)
+                    self.console.print(f"Allowed pod sizes set to {', '.join(map(str, sizes)) or 'any'}", style="green")
+                except ValueError:
+                    self.console.print(f"Sizes must be whole numbers from {low} to {high}", style="red")
+                Prompt.ask("Press Enter to continue")
             elif choice == "b":
                 break
     
@@ -423,6 +969,7 @@ class TerminalInterface:
                                 # Reload data
                                 self.player_manager.load_players()
                                 self.config = self.data_storage.load_config()
+                                self._next_round = None
                             else:
                                 self.console.print("Restore failed", style="red")
                         else:
@@ -445,6 +992,7 @@ class TerminalInterface:
                     # Reload data
                     self.player_manager.load_players()
                     self.config = self.data_storage.load_config()
+                    self._next_round = None
                 else:
                     self.console.print("Import failed", style="red")
                 Prompt.ask("Press Enter to continue")
@@ -462,6 +1010,8 @@ class TerminalInterface:
         stats_text.append(f"History Entries: {len(history)}\n", style="cyan")
         stats_text.append(f"Default Pod Size: {self.config['default_pod_size']}\n", style="cyan")
         stats_text.append(f"Max Pod Size: {self.config['max_pod_size']}\n", style="cyan")
+        cache = self.pod_randomizer.cache_info()
+        stats_text.append(f"Assignment Cache: {cache['hits']} hits, {cache['misses']} misses\n", style="cyan")
         
         if history:
             # Calculate some statistics from history
@@ -473,6 +1023,17 @@ class TerminalInterface:
             stats_text.append(f"\nHistory Stats:\n", style="bold yellow")
             stats_text.append(f"Total Assignments: {total_assignments}\n", style="green")
             stats_text.append(f"Avg Pods per Assignment: {avg_players_per_assignment:.1f}\n", style="green")
+            
+            pair_counts = self.data_storage.load_pair_counts()
+            stats_text.append(f"Distinct Pairings: {len(pair_counts)}\n", style="green")
+            if self.current_pods:
+                stats_text.append(f"Repeat Pairings in Current Pods: {self.current_repeat_pairs}\n", style="green")
+            
+            most_common = [pair for pair in pair_counts.most_common(3) if pair[2] > 1]
+            if most_common:
+                stats_text.append(f"\nMost Frequent Pairings:\n", style="bold yellow")
+                for name_a, name_b, count in most_common:
+                    stats_text.append(f"{name_a} & {name_b}: {count}x\n", style="green")
         
         panel = Panel(stats_text, title="Statistics", border_style="bright_blue")
         rprint(panel)
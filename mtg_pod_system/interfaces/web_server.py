@@ -0,0 +1,208 @@
+import sys
+import os
+import json
+import threading
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from typing import Dict, List, Any, Optional, Tuple
+from urllib.parse import urlparse, parse_qs, unquote
+
+# Add the project root to the path so we can import core modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.player_manager import PlayerManager
+from core.pod_randomizer import PodRandomizer
+from core.sqlite_storage import open_storage
+
+WEB_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mobile_web")
+
+class WebAppState:
+    """Roster, settings and current pods shared by every web client"""
+
+    def __init__(self, data_dir: str = "data"):
+        self.lock = threading.RLock()
+        # Serializes pod creation without holding up other requests during a search
+        self.pods_lock = threading.Lock()
+        self.data_storage = open_storage(data_dir)
+        self.config = self.data_storage.load_config()
+        self.player_manager = PlayerManager(data_dir, storage=self.data_storage)
+        self.pod_randomizer = PodRandomizer()
+        self.current_pods: List[Dict[str, Any]] = []
+
+    def get_players(self) -> Dict[str, Any]:
+        """Current roster"""
+        with self.lock:
+            players = self.player_manager.get_players()
+            ratings = self.player_manager.get_ratings()
+        return {"players": players, "count": len(players), "ratings": ratings}
+
+    def add_players(self, names: List[str], ratings: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """Add players, apply any ratings and save the roster, returns how many were new"""
+        with self.lock:
+            added = self.player_manager.import_players_from_list(names)
+            rated = [self.player_manager.set_rating(name, float(rating)) for name, rating in (ratings or {}).items()]
+            if added or any(rated):
+                self.player_manager.save_players()
+            return {"added": added, **self.get_players()}
+
+    def remove_player(self, name: str) -> bool:
+        """Remove a player and save the roster"""
+        with self.lock:
+            if not self.player_manager.remove_player(name):
+                return False
+            self.player_manager.save_players()
+            return True
+
+    def get_config(self) -> Dict[str, Any]:
+        """Current settings"""
+        with self.lock:
+            return dict(self.config)
+
+    def create_pods(self, target_size: Optional[int] = None, seed: Optional[int] = None) -> Dict[str, Any]:
+        """Create pods for the current roster and make them the current assignment
+
+        The search itself runs outside the state lock, so a long anytime
+        search doesn't stall the other API calls.
+        """
+        with self.pods_lock:
+            with self.lock:
+                players = self.player_manager.get_players()
+                config = dict(self.config)
+                ratings = self.player_manager.get_ratings()
+                mode = config['pairing_mode']
+                if mode in ("random", "balanced"):
+                    history = []
+                elif mode == "annealing":
+                    history = self.data_storage.load_history()  # Seat balance needs pod sizes
+                else:
+                    history = self.data_storage.load_pair_counts()
+                seat_counts = self.data_storage.load_seat_counts() if config['balance_seating'] else None
+
+            # Only pod creation appends history, so the pair counts stay put meanwhile
+            pods = self.pod_randomizer.create_pods_for_config(players, config, history, target_size, ratings, seed)
+            if seat_counts is not None:
+                pods = self.pod_randomizer.seat_pods(pods, seat_counts)
+            entry = self.pod_randomizer.build_history_entry(pods)
+
+            with self.lock:
+                if config['keep_history'] and self.data_storage.append_history(entry):
+                    self.data_storage.record_seating(entry)
+                self.current_pods = entry["pods"]
+
+            return {
+                "timestamp": entry["timestamp"],
+                "pods": entry["pods"],
+                "statistics": self.pod_randomizer.get_statistics(pods)
+            }
+
+    def get_pods(self) -> Dict[str, Any]:
+        """Most recently created pods"""
+        with self.lock:
+            return {"pods": self.current_pods}
+
+    def get_history(self, limit: int) -> Dict[str, Any]:
+        """Most recent assignments, newest first"""
+        with self.lock:
+            history = self.data_storage.load_recent_history(limit)
+        return {"history": history[::-1]}
+
+class APIRequestHandler(SimpleHTTPRequestHandler):
+    """Serves the PWA files and the JSON API under /api/"""
+
+    state: WebAppState = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=WEB_DIR, **kwargs)
+
+    def do_GET(self):
+        if not self.path.startswith("/api/"):
+            return super().do_GET()
+        self._handle_api("GET")
+
+    def do_POST(self):
+        self._handle_api("POST")
+
+    def do_DELETE(self):
+        self._handle_api("DELETE")
+
+    def _handle_api(self, method: str):
+        """Route an API request and send the JSON response"""
+        url = urlparse(self.path)
+        parts = [unquote(part) for part in url.path.split("/") if part][1:]  # Drop "api"
+        query = parse_qs(url.query)
+
+        try:
+            status, payload = self._route(method, parts, query)
+        except ValueError as e:
+            status, payload = 400, {"error": str(e)}
+        except Exception as e:
+            status, payload = 500, {"error": str(e)}
+
+        self._send_json(status, payload)
+
+    def _route(self, method: str, parts: List[str], query: Dict[str, List[str]]) -> Tuple[int, Dict[str, Any]]:
+        """Dispatch to the shared application state"""
+        resource = parts[0] if parts else ""
+
+        if resource == "players":
+            if method == "GET":
+                return 200, self.state.get_players()
+            if method == "POST":
+                body = self._read_json()
+                names = body.get("names") or [body.get("name", "")]
+                return 200, self.state.add_players(names, body.get("ratings"))
+            if method == "DELETE" and len(parts) == 2:
+                if self.state.remove_player(parts[1]):
+                    return 200, self.state.get_players()
+                return 404, {"error": f"Player not found: {parts[1]}"}
+
+        elif resource == "config" and method == "GET":
+            return 200, self.state.get_config()
+
+        elif resource == "pods":
+            if method == "GET":
+                return 200, self.state.get_pods()
+            if method == "POST":
+                body = self._read_json()
+                target_size = body.get("pod_size")
+                seed = body.get("seed")
+                return 200, self.state.create_pods(
+                    int(target_size) if target_size else None,
+                    int(seed) if seed is not None else None
+                )
+
+        elif resource == "history" and method == "GET":
+            limit = int(query.get("limit", ["10"])[0])
+            return 200, self.state.get_history(limit)
+
+        return 404, {"error": f"Unknown endpoint: {method} {self.path}"}
+
+    def _read_json(self) -> Dict[str, Any]:
+        """Parse the request body"""
+        length = int(self.headers.get("Content-Length", 0))
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except json.JSONDecodeError:
+            raise ValueError("Request body is not valid JSON")
+
+    def _send_json(self, status: int, payload: Dict[str, Any]):
+        """Write a JSON response"""
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+class PodWebServer(ThreadingHTTPServer):
+    """HTTP server handling each client connection in its own thread"""
+
+    daemon_threads = True
+    request_queue_size = 64  # Many phones connect at once when pods are announced
+
+def create_server(port: int, state: Optional[WebAppState] = None) -> PodWebServer:
+    """Create the web server; all of its request threads share one application state"""
+    handler = type("BoundAPIRequestHandler", (APIRequestHandler,), {"state": state or WebAppState()})
+    return PodWebServer(("", port), handler)
@@ -32,7 +32,6 @@ def main():
     # Check for web interface capabilities
     try:
         import http.server
-        import socketserver
         import webbrowser
         interfaces.append(("web", "Web Interface (Browser)", None))
     except ImportError:
@@ -75,22 +74,21 @@ def main():
 
 def launch_web_interface():
     """Launch the web interface"""
-    import http.server
-    import socketserver
     import webbrowser
     import threading
     import time
+    from interfaces.web_server import WebAppState, create_server
     
-    # Change to the web directory
-    web_dir = os.path.join(project_root, 'mobile_web')
-    os.chdir(web_dir)
+    # One state shared by every request thread
+    state = WebAppState()
     
     # Find an available port
     port = 8000
     while port < 9000:
         try:
-            with socketserver.TCPServer(("", port), http.server.SimpleHTTPRequestHandler) as httpd:
+            with create_server(port, state) as httpd:
                 print(f"Web interface starting on http://localhost:{port}")
+                print(f"JSON API available under http://localhost:{port}/api/")
                 print("Press Ctrl+C to stop the server")
                 
                 # Open browser in a separate thread
@@ -0,0 +1,34 @@
+import random
+
+from core.annealing import AnnealingOptimizer
+
+
+def make_matrix(size, rng):
+    matrix = [[0] * size for _ in range(size)]
+    for a in range(size):
+        for b in range(a + 1, size):
+            matrix[a][b] = matrix[b][a] = rng.randint(0, 3)
+    return matrix
+
+
+def test_result_never_scores_worse_than_the_start():
+    rng = random.Random(1)
+    matrix = make_matrix(14, rng)
+    short_counts = [rng.randint(0, 4) for _ in range(14)]
+    optimizer = AnnealingOptimizer(matrix, short_counts, 1.0)
+    groups = [list(range(0, 4)), list(range(4, 8)), list(range(8, 11)), list(range(11, 14))]
+    before = optimizer.total_cost(groups, 4)
+    
+    result = optimizer.optimize([list(g) for g in groups], 4, 0.2, rng=rng)
+    assert sorted(p for g in result for p in g) == list(range(14))
+    assert [len(g) for g in result] == [4, 4, 3, 3]
+    assert optimizer.total_cost(result, 4) <= before
+
+
+def test_max_moves_caps_the_search():
+    rng = random.Random(2)
+    matrix = make_matrix(40, rng)
+    optimizer = AnnealingOptimizer(matrix)
+    groups = [list(range(i, i + 4)) for i in range(0, 40, 4)]
+    optimizer.optimize(groups, 4, 10.0, max_moves=500, rng=rng)
+    assert optimizer.last_moves <= 500
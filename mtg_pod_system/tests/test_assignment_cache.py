@@ -0,0 +1,80 @@
+from core.constraints import PodConstraints
+from core.pod_randomizer import PodRandomizer
+
+ROSTER = [f"Player {i}" for i in range(12)]
+
+
+def players_of(pods):
+    return [pod.players for pod in pods]
+
+
+def test_unseeded_calls_skip_the_cache():
+    randomizer = PodRandomizer()
+    for _ in range(5):
+        randomizer.create_pods(ROSTER, 4, 8, 3)
+    assert randomizer.cache_info() == {"hits": 0, "misses": 0, "size": 0, "max_size": randomizer.cache_size}
+
+
+def test_repeated_seed_hits_the_cache():
+    randomizer = PodRandomizer()
+    first = randomizer.create_pods(ROSTER, 4, 8, 3, seed=5)
+    second = randomizer.create_pods(list(reversed(ROSTER)), 4, 8, 3, seed=5)
+    assert players_of(first) == players_of(second)
+    assert randomizer.cache_hits == 1 and randomizer.cache_misses == 1
+
+
+def test_different_inputs_miss():
+    randomizer = PodRandomizer()
+    randomizer.create_pods(ROSTER, 4, 8, 3, seed=5)
+    randomizer.create_pods(ROSTER, 4, 8, 3, seed=6)
+    randomizer.create_pods(ROSTER, 3, 8, 3, seed=5)
+    randomizer.create_pods(ROSTER, 4, 8, 3, PodConstraints([["Player 1", "Player 2"]], []), seed=5)
+    assert randomizer.cache_hits == 0 and randomizer.cache_misses == 4
+
+
+def test_least_recently_used_is_evicted():
+    randomizer = PodRandomizer(cache_size=2)
+    for seed in (1, 2, 1, 3):
+        randomizer.create_pods(ROSTER, 4, 8, 3, seed=seed)
+    assert randomizer.cache_info()["size"] == 2
+    randomizer.create_pods(ROSTER, 4, 8, 3, seed=1)
+    assert randomizer.cache_hits == 2
+    randomizer.create_pods(ROSTER, 4, 8, 3, seed=2)
+    assert randomizer.cache_misses == 4
+
+
+def test_last_seed_reprints_the_round():
+    randomizer = PodRandomizer()
+    assert randomizer.last_seed is None
+    pods = randomizer.create_pods(ROSTER, 4, 8, 3)
+    again = randomizer.create_pods(ROSTER, 4, 8, 3, seed=randomizer.last_seed)
+    assert players_of(again) == players_of(pods)
+
+
+def history_of(pods):
+    return [{"pods": [{"id": pod.id, "players": pod.players, "size": pod.size} for pod in pods]}]
+
+
+def test_history_scored_modes_are_keyed_by_their_history():
+    randomizer = PodRandomizer()
+    history = history_of(randomizer.create_pods(ROSTER, 4, 8, 3, seed=1))
+    first = randomizer.create_pods_avoiding_repeats(ROSTER, history, 4, 8, 0.05, 3, seed=7)
+    again = randomizer.create_pods_avoiding_repeats(ROSTER, list(history), 4, 8, 0.05, 3, seed=7)
+    assert players_of(again) == players_of(first)
+    assert randomizer.last_from_cache and randomizer.cache_hits == 1
+
+    # Once the round is saved the history differs, so the search runs again
+    randomizer.create_pods_avoiding_repeats(ROSTER, history + history_of(first), 4, 8, 0.05, 3, seed=7)
+    assert not randomizer.last_from_cache and randomizer.cache_hits == 1
+
+
+def test_cache_hit_restores_how_the_pods_were_made():
+    randomizer = PodRandomizer()
+    history = history_of(randomizer.create_pods(ROSTER, 4, 8, 3, seed=1))
+    pods = randomizer.create_pods_annealing(ROSTER, history, 4, 8, 0.05, 3, seed=7)
+    entry = randomizer.build_history_entry(pods)
+    randomizer.create_pods(ROSTER, 4, 8, 3, seed=2)
+
+    again = randomizer.regenerate_pods(entry, history=history)
+    assert randomizer.last_from_cache
+    assert randomizer.build_history_entry(again)["search_steps"] == entry["search_steps"]
@@ -0,0 +1,78 @@
+import os
+import shutil
+
+from core.data_storage import DataStorage
+
+
+def backup_objects(storage):
+    return sorted(
+        digest for prefix in os.listdir(storage.backup_objects_dir)
+        for digest in os.listdir(os.path.join(storage.backup_objects_dir, prefix))
+    )
+
+
+def test_backup_restores_saved_data(tmp_path):
+    storage = DataStorage(str(tmp_path))
+    storage.save_players(["Alice", "Bob"])
+    assert storage.create_backup()
+    backup_name = storage.list_backups()[0]
+
+    storage.save_players(["Cara"])
+    assert storage.restore_backup(backup_name)
+    assert storage.load_players() == ["Alice", "Bob"]
+
+
+def test_unchanged_files_are_stored_once(tmp_path):
+    storage = DataStorage(str(tmp_path))
+    storage.save_players(["Alice", "Bob"])
+    storage.create_backup()
+    objects = backup_objects(storage)
+    storage.create_backup()
+    assert len(storage.list_backups()) == 2
+    assert backup_objects(storage) == objects
+
+
+def test_pruning_drops_old_backups_and_their_objects(tmp_path):
+    storage = DataStorage(str(tmp_path))
+    storage.max_backups = 2
+    for players in (["Alice"], ["Bob"], ["Cara"]):
+        storage.save_players(players)
+        assert storage.create_backup()
+
+    backups = storage.list_backups()
+    assert len(backups) == 2
+    storage.save_players([])
+    assert storage.restore_backup(backups[-1])
+    assert storage.load_players() == ["Bob"]
+
+    # Only objects the kept manifests reference remain
+    referenced = set()
+    for backup_name in backups:
+        referenced.update(entry["sha256"] for entry in storage._read_manifest(backup_name)["files"].values())
+    assert set(backup_objects(storage)) == referenced
+
+
+def test_pruning_backups_of_an_empty_data_directory(tmp_path):
+    storage = DataStorage(str(tmp_path / "empty"))
+    storage.max_backups = 1
+    assert storage.create_backup()
+    assert storage.create_backup()
+    assert len(storage.list_backups()) == 1
+
+
+def test_legacy_folder_backup_is_listed_and_restored(tmp_path):
+    storage = DataStorage(str(tmp_path))
+    storage.save_players(["Alice", "Bob"])
+    legacy = os.path.join(storage.backup_dir, "backup_20200101_000000")
+    os.makedirs(legacy)
+    shutil.copy2(storage.players_file, legacy)
+
+    storage.save_players(["Cara"])
+    assert storage.create_backup()
+    assert storage.list_backups()[-1] == "backup_20200101_000000"
+    assert storage.restore_backup("backup_20200101_000000")
+    assert storage.load_players() == ["Alice", "Bob"]
+
+
+def test_missing_backup_is_reported(tmp_path):
+    assert not DataStorage(str(tmp_path)).restore_backup("backup_19990101_000000")
@@ -0,0 +1,43 @@
+import os
+
+from core.data_storage import DataStorage
+
+
+def make_entry(round_number):
+    return {
+        "timestamp": f"2026-01-01T00:00:{round_number:02d}",
+        "pods": [{"id": 1, "players": [f"A{round_number}", f"B{round_number}", "C"], "size": 3}]
+    }
+
+
+def test_recent_history_reads_back_appended_entries(tmp_path):
+    storage = DataStorage(str(tmp_path))
+    for i in range(5):
+        assert storage.append_history(make_entry(i))
+    recent = storage.load_recent_history(3)
+    assert [entry["timestamp"] for entry in recent] == [make_entry(i)["timestamp"] for i in (2, 3, 4)]
+
+
+def test_recent_history_skips_segment_deleted_after_listing(tmp_path, monkeypatch):
+    storage = DataStorage(str(tmp_path))
+    for i in range(3):
+        storage.append_history(make_entry(i))
+    
+    # A background rotation removed this segment between listing and reading
+    missing = os.path.join(str(tmp_path), "history.1.jsonl")
+    storage._history_segments = lambda: [missing]
+    real_exists = os.path.exists
+    monkeypatch.setattr(os.path, "exists", lambda path: path == missing or real_exists(path))
+    recent = storage.load_recent_history(10)
+    assert len(recent) == 3
+
+
+def test_schedule_remembers_furthest_round(tmp_path):
+    storage = DataStorage(str(tmp_path))
+    rounds = [[{"id": 1, "players": ["A", "B", "C"], "size": 3}]] * 3
+    storage.save_schedule(rounds)
+    storage.save_schedule(rounds, 2, 0)
+    storage.save_schedule(rounds, 1, storage.load_schedule()["reached_round"])
+    schedule = storage.load_schedule()
+    assert schedule["current_round"] == 1
+    assert schedule["reached_round"] == 2
@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from core.data_storage import DataStorage
+from core.pair_counts import PairCounts, pack_pair, unpack_pair
+from core.player_registry import PlayerRegistry
+from core.sqlite_storage import SQLiteStorage
+
+
+def random_entry(rng, number):
+    names = rng.sample([f"P{i}" for i in range(12)], 8)
+    return {
+        "timestamp": f"2026-01-01T00:{number // 60:02d}:{number % 60:02d}",
+        "pods": [{"id": 1, "players": names[:4], "size": 4}, {"id": 2, "players": names[4:], "size": 4}]
+    }
+
+
+def as_dict(pair_counts):
+    return {tuple(sorted((a, b))): count for a, b, count in pair_counts.pairs()}
+
+
+def test_pack_pair_is_order_independent():
+    assert pack_pair(3, 9) == pack_pair(9, 3)
+    assert unpack_pair(pack_pair(9, 3)) == (3, 9)
+
+
+def test_add_and_remove_entry_cancel_out():
+    rng = random.Random(1)
+    pair_counts = PairCounts()
+    entries = [random_entry(rng, i) for i in range(3)]
+    for entry in entries:
+        pair_counts.add_entry(entry)
+    for entry in entries:
+        pair_counts.remove_entry(entry)
+    assert len(pair_counts) == 0
+
+
+def test_copy_is_not_changed_by_later_appends(tmp_path):
+    rng = random.Random(4)
+    storage = DataStorage(str(tmp_path))
+    storage.append_history(random_entry(rng, 0))
+    snapshot = storage.load_pair_counts().copy()
+    before = as_dict(snapshot)
+    storage.append_history(random_entry(rng, 1))
+    assert as_dict(snapshot) == before
+    assert as_dict(storage.load_pair_counts()) != before
+
+
+def test_keeps_empty_registry():
+    registry = PlayerRegistry()
+    assert PairCounts(registry).registry is registry
+
+
+@pytest.mark.parametrize("make_storage", [
+    lambda path: DataStorage(path, "jsonl"),
+    lambda path: DataStorage(path, "json"),
+    lambda path: SQLiteStorage(path),
+])
+def test_window_updates_match_a_rebuild(tmp_path, make_storage):
+    rng = random.Random(2)
+    storage = make_storage(str(tmp_path))
+    storage.max_history_items = 5
+    storage.load_pair_counts()  # Start tracking before the appends
+    
+    for i in range(12):
+        assert storage.append_history(random_entry(rng, i))
+        incremental = as_dict(storage.load_pair_counts())
+        rebuilt = as_dict(PairCounts.from_history(storage.load_history()))
+        assert incremental == rebuilt
+    assert len(storage.load_history()) == 5
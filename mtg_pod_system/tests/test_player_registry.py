@@ -0,0 +1,19 @@
+from core.player_registry import PlayerRegistry
+from core.pod_randomizer import PodRandomizer
+
+
+def test_intern_assigns_dense_ids():
+    registry = PlayerRegistry()
+    assert registry.intern("Alice") == 0
+    assert registry.intern("Bob") == 1
+    assert registry.intern("Alice") == 0
+    assert list(registry.intern_all(["Bob", "Cara"])) == [1, 2]
+    assert registry.names_of([2, 0]) == ["Cara", "Alice"]
+
+
+def test_randomizer_keeps_empty_registry():
+    registry = PlayerRegistry()
+    randomizer = PodRandomizer(registry)
+    assert randomizer.registry is registry
+    randomizer.create_pods(["A", "B", "C"], 3, 3, 3)
+    assert len(registry) == 3
@@ -0,0 +1,111 @@
+import random
+import time
+
+import pytest
+
+from core.pairing import search_worker
+from core.pod_randomizer import PodRandomizer
+
+
+def players_of(pods):
+    return [pod.players for pod in pods]
+
+
+def seated(pods):
+    return sorted(name for pod in pods for name in pod.players)
+
+
+class TestRepairPods:
+    def test_names_match_case_insensitively(self):
+        randomizer = PodRandomizer()
+        pods = randomizer.create_pods([f"P{i}" for i in range(8)], 4, 8, 3, seed=1)
+        repaired = randomizer.repair_pods(pods, ["P0", "p1"], ["p2"], 4, 8, 3)
+        assert seated(repaired) == ["P0", "P1", "P3", "P4", "P5", "P6", "P7"]
+
+    def test_repeated_arrivals_are_seated_once(self):
+        randomizer = PodRandomizer()
+        pods = randomizer.create_pods([f"P{i}" for i in range(8)], 4, 8, 3, seed=1)
+        repaired = randomizer.repair_pods(pods, ["New", "new", " New "], [], 4, 8, 3)
+        assert seated(repaired).count("New") == 1
+        assert len(seated(repaired)) == 9
+
+    def test_unknown_departure_raises(self):
+        randomizer = PodRandomizer()
+        pods = randomizer.create_pods([f"P{i}" for i in range(8)], 4, 8, 3, seed=1)
+        with pytest.raises(ValueError, match="Nobody"):
+            randomizer.repair_pods(pods, [], ["Nobody"], 4, 8, 3)
+
+    def test_leave_and_rejoin_keeps_player(self):
+        randomizer = PodRandomizer()
+        pods = randomizer.create_pods([f"P{i}" for i in range(8)], 4, 8, 3, seed=1)
+        repaired = randomizer.repair_pods(pods, ["P3"], ["p3"], 4, 8, 3)
+        assert seated(repaired) == seated(pods)
+
+    def test_input_pods_are_not_modified(self):
+        randomizer = PodRandomizer()
+        pods = randomizer.create_pods([f"P{i}" for i in range(12)], 4, 8, 3, seed=2)
+        before = players_of(pods)
+        randomizer.repair_pods(pods, ["A", "B"], ["P0", "P5", "P7"], 4, 8, 3)
+        assert players_of(pods) == before
+
+    def test_chained_repairs_stay_consistent(self):
+        rng = random.Random(7)
+        randomizer = PodRandomizer()
+        roster = [f"P{i}" for i in range(20)]
+        pods = randomizer.create_pods(roster, 4, 6, 3, seed=3)
+        next_name = 20
+        for _ in range(60):
+            leaving = rng.sample(roster, rng.randint(0, min(3, len(roster) - 6)))
+            arriving = [f"P{next_name + i}" for i in range(rng.randint(0, 3))]
+            next_name += len(arriving)
+            pods = randomizer.repair_pods(pods, arriving, leaving, 4, 6, 3)
+            roster = [name for name in roster if name not in leaving] + arriving
+            
+            assert seated(pods) == sorted(roster)
+            assert all(3 <= pod.size <= 6 for pod in pods)
+            assert [pod.id for pod in pods] == list(range(1, len(pods) + 1))
+
+
+class TestAdoptPods:
+    def test_adopted_pods_are_remembered(self):
+        worker = PodRandomizer()
+        pods = worker.create_pods([f"P{i}" for i in range(8)], 4, 8, 3, seed=1)
+        randomizer = PodRandomizer()
+        adopted = randomizer.adopt_pods(pods, worker)
+        assert players_of(adopted) == players_of(pods)
+        assert len(randomizer.history) == 1
+
+    def test_adopting_for_a_repair_remembers_only_the_repair(self):
+        worker = PodRandomizer()
+        pods = worker.create_pods([f"P{i}" for i in range(8)], 4, 8, 3, seed=1)
+        randomizer = PodRandomizer()
+        adopted = randomizer.adopt_pods(pods, worker, remember=False)
+        assert len(randomizer.history) == 0
+        repaired = randomizer.repair_pods(adopted, ["New"], [], 4, 8, 3)
+        assert list(randomizer.history) == [repaired]
+
+
+class TestParallelSearch:
+    def test_search_worker_stops_at_a_passed_deadline(self):
+        cost, groups, candidates, _, _ = search_worker(12, [4, 4, 4], [[0, 1, 2, 3]], 5, 0, time.time() - 1)
+        assert candidates == 1
+        assert sorted(p for group in groups for p in group) == list(range(12))
+
+    def test_parallel_search_keeps_to_its_budget(self):
+        randomizer = PodRandomizer()
+        roster = [f"P{i}" for i in range(60)]
+        history = [randomizer.build_history_entry(randomizer.create_pods(roster, 4, 8, 3, seed=s)) for s in range(5)]
+        pods = randomizer.create_pods_parallel(roster, history, 4, 8, 0.5, 3, workers=2, seed=1)
+        assert seated(pods) == sorted(roster)
+        assert randomizer.last_search_stats["elapsed"] < 1.5
+
+
+class TestAnytimeSearch:
+    def test_single_pod_with_repeats_finishes_at_once(self):
+        randomizer = PodRandomizer()
+        roster = [f"P{i}" for i in range(5)]
+        history = [randomizer.build_history_entry(randomizer.create_pods(roster, 5, 8, 3, seed=1))]
+        search = randomizer.create_pods_anytime(roster, history, 5, 8, 30.0, 3, seed=2)
+        assert search.wait(2.0)
+        assert search.repeat_pairs > 0
+        assert seated(search.pods) == sorted(roster)
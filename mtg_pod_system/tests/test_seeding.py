@@ -0,0 +1,113 @@
+import pytest
+
+from core.constraints import PodConstraints
+from core.data_storage import DataStorage
+from core.pod_randomizer import PodRandomizer
+
+ROSTER = [f"Player {i}" for i in range(18)]
+
+
+def players_of(pods):
+    return [pod.players for pod in pods]
+
+
+def test_same_seed_gives_same_pods_in_any_roster_order():
+    first = PodRandomizer().create_pods(ROSTER, 4, 8, 3, seed=42)
+    second = PodRandomizer().create_pods(list(reversed(ROSTER)), 4, 8, 3, seed=42)
+    assert players_of(first) == players_of(second)
+    assert players_of(first) != players_of(PodRandomizer().create_pods(ROSTER, 4, 8, 3, seed=43))
+
+
+def test_history_entry_regenerates_random_and_constrained_pods():
+    constraints = PodConstraints([["Player 1", "Player 2"]], [["Player 3", "Player 4"]])
+    for rules in (None, constraints):
+        randomizer = PodRandomizer()
+        pods = randomizer.create_pods(ROSTER, 4, 8, 3, rules)
+        entry = randomizer.build_history_entry(pods)
+        assert entry["seed"] is not None
+        assert players_of(PodRandomizer().regenerate_pods(entry)) == players_of(pods)
+
+
+def test_constrained_entry_keeps_its_own_rules():
+    randomizer = PodRandomizer()
+    rules = PodConstraints([["Player 1", "Player 2", "Player 3"]], [])
+    pods = randomizer.create_pods(ROSTER, 4, 8, 3, rules, seed=9)
+    entry = randomizer.build_history_entry(pods)
+    assert entry["constraints"] == {"keep_together": [["Player 1", "Player 2", "Player 3"]], "keep_apart": []}
+    # Rules configured later do not change the regenerated pods
+    assert players_of(PodRandomizer().regenerate_pods(entry)) == players_of(pods)
+    
+    del entry["constraints"]
+    with pytest.raises(ValueError, match="pairing rules"):
+        PodRandomizer().regenerate_pods(entry)
+
+
+def test_balanced_and_batch_pods_regenerate_with_their_inputs():
+    ratings = {name: 1200 + 37 * i for i, name in enumerate(ROSTER)}
+    randomizer = PodRandomizer()
+    balanced = randomizer.create_pods_balanced(ROSTER, ratings, 4, 8, 3)
+    entry = randomizer.build_history_entry(balanced)
+    assert players_of(PodRandomizer().regenerate_pods(entry, ratings=ratings)) == players_of(balanced)
+    with pytest.raises(ValueError):
+        PodRandomizer().regenerate_pods(entry)
+    
+    history = [entry]
+    batch = randomizer.create_pods_batch_search(ROSTER, history, 4, 8, 3, 32)
+    entry = randomizer.build_history_entry(batch)
+    assert players_of(PodRandomizer().regenerate_pods(entry, history=history)) == players_of(batch)
+
+
+@pytest.mark.parametrize("mode", ["avoid_repeats", "annealing", "anytime", "batch_search", "balanced"])
+def test_every_mode_records_its_seed(tmp_path, mode):
+    config = DataStorage(str(tmp_path)).load_config()
+    config.update({"pairing_mode": mode, "pairing_time_budget": 0.05, "anytime_time_budget": 0.05})
+    randomizer = PodRandomizer()
+    pods = randomizer.create_pods_for_config(ROSTER, config, [], 4, {}, seed=7)
+    entry = randomizer.build_history_entry(pods)
+    assert entry["seed"] == 7
+    assert entry["algorithm"] == mode
+    regenerated = PodRandomizer().regenerate_pods(entry, history=[], ratings={})
+    assert players_of(regenerated) == players_of(pods)
+
+
+def make_history(rounds):
+    randomizer = PodRandomizer()
+    return [
+        randomizer.build_history_entry(randomizer.create_pods(ROSTER, 4, 8, 3, seed=100 + i))
+        for i in range(rounds)
+    ]
+
+
+@pytest.mark.parametrize("mode", ["avoid_repeats", "annealing", "anytime", "parallel_search"])
+def test_time_budgeted_searches_replay_to_the_same_pods(tmp_path, mode):
+    config = DataStorage(str(tmp_path)).load_config()
+    config.update({"pairing_mode": mode, "pairing_time_budget": 0.2, "anytime_time_budget": 0.2})
+    history = make_history(8)
+    randomizer = PodRandomizer()
+    pods = randomizer.create_pods_for_config(ROSTER, config, history, 4, {}, seed=11)
+    entry = randomizer.build_history_entry(pods)
+    assert entry["search_steps"]
+    assert players_of(PodRandomizer().regenerate_pods(entry, history=history)) == players_of(pods)
+    
+    # Pods made against another history are not silently replayed
+    with pytest.raises(ValueError, match="history differs"):
+        PodRandomizer().regenerate_pods(entry, history=history[:-1])
+
+
+def test_balanced_pods_check_their_ratings():
+    ratings = {name: 1200 + 37 * i for i, name in enumerate(ROSTER)}
+    randomizer = PodRandomizer()
+    entry = randomizer.build_history_entry(randomizer.create_pods_balanced(ROSTER, ratings, 4, 8, 3))
+    ratings["Player 3"] += 500
+    with pytest.raises(ValueError, match="ratings differs"):
+        PodRandomizer().regenerate_pods(entry, ratings=ratings)
+
+
+def test_schedule_rounds_are_seeded_and_regenerate():
+    randomizer = PodRandomizer()
+    schedule = randomizer.create_schedule(ROSTER, 4, 4, 8, 3, 0.2, seed=3)
+    generation = randomizer.schedule_generation(schedule)
+    assert generation["algorithm"] == "schedule" and generation["seed"] == 3
+    
+    entry = randomizer.build_history_entry(schedule[2], {**generation, "schedule_round": 2})
+    assert players_of(PodRandomizer().regenerate_pods(entry)) == players_of(schedule[2])
@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from core.pod_randomizer import PodRandomizer
+from core.size_policy import SizePolicy, size_policy_from_config
+
+
+def sizes_of(pods):
+    return sorted(len(pod.players) for pod in pods)
+
+
+class TestSizePolicy:
+    def test_infeasible_counts(self):
+        policy = SizePolicy([3, 4])
+        assert not policy.is_feasible(5)
+        assert not policy.is_feasible(1)
+        with pytest.raises(ValueError):
+            policy.plan(5)
+    
+    def test_plan_splits_exactly(self):
+        policy = SizePolicy([3, 4])
+        assert dict(policy.plan(7)) == {4: 1, 3: 1}
+        for total in range(6, 200):
+            plan = policy.plan(total)
+            assert sum(size * count for size, count in plan) == total
+            assert all(size in (3, 4) for size, _ in plan)
+    
+    def test_weights_change_the_plan(self):
+        policy = SizePolicy([3, 4], weights={3: 0.0, 4: 10.0})
+        assert dict(policy.plan(12)) == {3: 4}
+    
+    def test_from_config(self):
+        assert size_policy_from_config({"allowed_pod_sizes": []}) is None
+        policy = size_policy_from_config({"allowed_pod_sizes": [4, 3, 4], "default_pod_size": 4})
+        assert policy.sizes == (4, 3)
+
+
+class TestPolicyInRepairs:
+    def test_create_pods_uses_the_policy(self):
+        randomizer = PodRandomizer()
+        pods = randomizer.create_pods([f"P{i}" for i in range(10)], 4, 8, 3, seed=1,
+                                      size_policy=SizePolicy([3, 4]))
+        assert sizes_of(pods) == [3, 3, 4]
+    
+    def test_arrival_never_makes_a_disallowed_pod(self):
+        policy = SizePolicy([3, 4])
+        randomizer = PodRandomizer()
+        pods = randomizer.create_pods([f"P{i}" for i in range(8)], 4, 8, 3, seed=1, size_policy=policy)
+        repaired = randomizer.repair_pods(pods, ["New"], [], 4, 8, 3, size_policy=policy)
+        assert sizes_of(repaired) == [3, 3, 3]
+    
+    def test_random_repairs_respect_the_policy(self):
+        rng = random.Random(11)
+        policy = SizePolicy([3, 4])
+        randomizer = PodRandomizer()
+        roster = [f"P{i}" for i in range(16)]
+        pods = randomizer.create_pods(roster, 4, 8, 3, seed=2, size_policy=policy)
+        next_name = 16
+        for _ in range(50):
+            leaving = rng.sample(roster, rng.randint(0, min(3, len(roster) - 8)))
+            arriving = [f"P{next_name + i}" for i in range(rng.randint(0, 3))]
+            next_name += len(arriving)
+            pods = randomizer.repair_pods(pods, arriving, leaving, 4, 8, 3, size_policy=policy)
+            roster = [name for name in roster if name not in leaving] + arriving
+            assert sorted(name for pod in pods for name in pod.players) == sorted(roster)
+            assert set(sizes_of(pods)) <= {3, 4}
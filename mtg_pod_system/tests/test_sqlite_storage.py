@@ -0,0 +1,62 @@
+import pytest
+
+from core.data_storage import DataStorage
+from core.sqlite_storage import SQLiteStorage, open_storage
+
+
+def entry(number):
+    return {
+        "timestamp": f"2026-01-01T00:00:{number:02d}",
+        "pods": [{"id": 1, "players": [f"P{number}", "A", "B"], "size": 3}]
+    }
+
+
+def switch_to_sqlite(storage):
+    config = storage.load_config()
+    config["storage_backend"] = "sqlite"
+    storage.save_config(config)
+
+
+@pytest.mark.parametrize("history_mode", ["jsonl", "json"])
+def test_switching_to_sqlite_keeps_history(tmp_path, history_mode):
+    storage = DataStorage(str(tmp_path), history_mode)
+    config = storage.load_config()
+    config["history_mode"] = history_mode
+    storage.save_config(config)
+    storage.save_players(["A", "B", "P0"])
+    for number in range(3):
+        storage.append_history(entry(number))
+    switch_to_sqlite(storage)
+    
+    migrated = open_storage(str(tmp_path))
+    try:
+        assert isinstance(migrated, SQLiteStorage)
+        assert migrated.count_assignments() == 3
+        assert [e["timestamp"] for e in migrated.load_history()] == [entry(n)["timestamp"] for n in range(3)]
+        assert migrated.load_players() == ["A", "B", "P0"]
+    finally:
+        migrated.close()
+
+
+def test_migration_reads_legacy_history_file_in_jsonl_mode(tmp_path):
+    storage = DataStorage(str(tmp_path), "json")
+    storage.save_history([entry(n) for n in range(2)])
+    switch_to_sqlite(storage)  # history_mode stays at its jsonl default
+    
+    migrated = open_storage(str(tmp_path))
+    try:
+        assert migrated.count_assignments() == 2
+    finally:
+        migrated.close()
+
+
+def test_migration_runs_only_once(tmp_path):
+    storage = DataStorage(str(tmp_path))
+    storage.append_history(entry(0))
+    switch_to_sqlite(storage)
+    open_storage(str(tmp_path)).close()
+    reopened = open_storage(str(tmp_path))
+    try:
+        assert reopened.count_assignments() == 1
+    finally:
+        reopened.close()
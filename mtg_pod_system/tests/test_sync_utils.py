@@ -0,0 +1,75 @@
+import os
+
+from core.data_storage import DataStorage
+from utils import sync_utils
+from utils.sync_utils import SyncManager
+
+
+def test_publish_appends_only_changed_records(tmp_path):
+    sync = SyncManager(str(tmp_path))
+    assert sync.sync_terminal_to_web(["Alice", "Bob"], {"default_pod_size": 4}, [])
+    assert sync.sync_terminal_to_web(["Alice", "Bob", "Cara"], {"default_pod_size": 4}, [])
+
+    assert not os.path.exists(sync.web_data_file)  # Nothing compacted yet
+    with open(sync.web_log_file) as f:
+        lines = f.readlines()
+    assert len(lines) == 2
+    assert '"player:cara"' in lines[1] and '"player:alice"' not in lines[1]
+
+    delta = SyncManager(str(tmp_path)).get_changes_since(1)
+    assert list(delta["changes"]) == ["player:cara"]
+    assert delta["revision"] == 2
+
+
+def test_unchanged_version_skips_publish(tmp_path):
+    sync = SyncManager(str(tmp_path))
+    sync.sync_terminal_to_web(["Alice"], {}, [], version=[1, 2])
+    # Different data under the same version is not even compared
+    sync.sync_terminal_to_web(["Alice", "Bob"], {}, [], version=[1, 2])
+    assert sync.get_head()["revision"] == 1
+    sync.sync_terminal_to_web(["Alice", "Bob"], {}, [], version=[1, 3])
+    assert sync.get_head()["revision"] == 2
+
+
+def test_compaction_prunes_applied_tombstones(tmp_path, monkeypatch):
+    monkeypatch.setattr(sync_utils, "SYNC_LOG_COMPACT_LINES", 3)
+    sync = SyncManager(str(tmp_path))
+    sync.sync_terminal_to_web(["Alice", "Bob"], {}, [])
+    sync.sync_terminal_to_web(["Alice"], {}, [])
+    sync.sync_terminal_to_web(["Alice", "Cara"], {}, [])
+
+    assert not os.path.exists(sync.web_log_file)
+    channel = SyncManager(str(tmp_path))._load_channel()
+    assert "player:bob" not in channel["records"]
+    assert channel["revision"] == 3
+
+    # A peer that predates the pruning gets a full snapshot
+    delta = sync.get_changes_since(1)
+    assert delta["full"]
+    assert set(delta["changes"]) == {"player:alice", "player:cara"}
+
+
+def test_web_changes_reach_terminal_storage(tmp_path):
+    storage = DataStorage(str(tmp_path / "terminal"))
+    storage.save_players(["Alice", "Bob"])
+    sync = SyncManager(str(tmp_path))
+    sync.sync_terminal_to_web(storage.load_players(), {}, [])
+    sync._publish(sync._build_records(["Alice", "Dan"], {}, []), "web")
+
+    assert sync.sync_web_to_terminal(storage)
+    assert sorted(storage.load_players()) == ["Alice", "Dan"]
+
+
+def test_unchanged_data_skips_reading_the_record_set(tmp_path, monkeypatch):
+    sync = SyncManager(str(tmp_path))
+    sync.sync_terminal_to_web(["Alice", "Bob"], {"default_pod_size": 4}, [])
+
+    def fail():
+        raise AssertionError("record set was read")
+
+    monkeypatch.setattr(sync, "_load_channel", fail)
+    assert sync.sync_terminal_to_web(["Bob", "Alice"], {"default_pod_size": 4}, [])
+    monkeypatch.undo()
+
+    sync.sync_terminal_to_web(["Alice", "Bob", "Cara"], {"default_pod_size": 4}, [])
+    assert sync.get_head()["revision"] == 2
@@ -0,0 +1,30 @@
+import threading
+
+from interfaces.web_server import WebAppState
+
+
+def test_other_requests_proceed_during_pod_search(tmp_path):
+    state = WebAppState(str(tmp_path))
+    state.add_players([f"Player {i}" for i in range(8)])
+    
+    searching, release = threading.Event(), threading.Event()
+    create = state.pod_randomizer.create_pods_for_config
+    
+    def slow_search(*args, **kwargs):
+        searching.set()
+        release.wait(5)
+        return create(*args, **kwargs)
+    
+    state.pod_randomizer.create_pods_for_config = slow_search
+    worker = threading.Thread(target=state.create_pods)
+    worker.start()
+    assert searching.wait(5)
+    
+    # Would deadlock until the search ends if it held the state lock
+    done = threading.Event()
+    threading.Thread(target=lambda: (state.get_players(), done.set()), daemon=True).start()
+    assert done.wait(1)
+    
+    release.set()
+    worker.join(5)
+    assert sum(len(pod["players"]) for pod in state.get_pods()["pods"]) == 8
@@ -1,32 +1,223 @@
+import hashlib
 import json
 import os
 import shutil
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
+
+# Delta lines appended before the record set is compacted into web_sync.json
+SYNC_LOG_COMPACT_LINES = 200
 
 class SyncManager:
-    """Handles synchronization between terminal and web interfaces"""
+    """Handles synchronization between terminal and web interfaces
+    
+    The shared record set holds one record per player, config key and
+    history entry, each stamped with the revision that last changed it.
+    Each publish appends only its changed records to web_sync_log.jsonl;
+    the log is periodically folded into web_sync.json, dropping tombstones
+    the terminal has already applied. A small head file carries the latest
+    revision and the data version each source last published, a hash of
+    its records unless the caller supplies one, so republishing unchanged
+    data skips the sync without reading the record set.
+    """
     
     def __init__(self, data_dir: str = "data"):
         self.data_dir = data_dir
         self.web_data_file = os.path.join(data_dir, "web_sync.json")
+        self.web_log_file = os.path.join(data_dir, "web_sync_log.jsonl")
+        self.web_head_file = os.path.join(data_dir, "web_sync_head.json")
         self.terminal_data_file = os.path.join(data_dir, "terminal_sync.json")
         self.sync_log_file = os.path.join(data_dir, "sync_log.json")
-        
-    def sync_terminal_to_web(self, players: List[str], config: Dict[str, Any], history: List[Dict]) -> bool:
-        """Sync terminal data to web format"""
+        # Record set replayed from disk, valid while the file signatures match
+        self._channel: Optional[Dict[str, Any]] = None
+        self._channel_signature: Any = None
+        self._log_lines = 0
+    
+    @staticmethod
+    def _build_records(players: List[str], config: Dict[str, Any], history: List[Dict]) -> Dict[str, Any]:
+        """Flatten data into keyed records"""
+        records = {}
+        for name in players:
+            records[f"player:{name.casefold()}"] = name
+        for key, value in config.items():
+            if key != "last_saved":  # Changes on every save
+                records[f"config:{key}"] = value
+        for entry in history:
+            records[f"history:{entry.get('timestamp', '')}"] = entry
+        return records
+    
+    @staticmethod
+    def _records_version(records: Dict[str, Any]) -> str:
+        """Hash of a record set, the data version when the caller has none"""
+        data = json.dumps(records, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+    
+    def _read_json(self, path: str, default: Any) -> Any:
+        """Read a JSON file, returning a default when it does not exist"""
+        if not os.path.exists(path):
+            return default
+        with open(path, 'r') as f:
+            return json.load(f)
+    
+    def _write_json(self, path: str, data: Any, indent: Optional[int] = 2):
+        """Write a JSON file atomically"""
+        with open(path + ".tmp", 'w') as f:
+            json.dump(data, f, indent=indent)
+        os.replace(path + ".tmp", path)
+    
+    @staticmethod
+    def _file_signature(path: str) -> Optional[Tuple[int, int]]:
+        """Modification time and size used to detect changes on disk"""
         try:
-            web_data = {
-                "players": players,
-                "config": config,
-                "history": history,
-                "last_sync": datetime.now().isoformat(),
-                "sync_source": "terminal",
-                "version": "1.0"
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _load_channel(self) -> Dict[str, Any]:
+        """Load the shared record set: the compacted base plus the delta log"""
+        signature = (self._file_signature(self.web_data_file), self._file_signature(self.web_log_file))
+        if self._channel is not None and signature == self._channel_signature:
+            return self._channel
+        
+        channel = self._read_json(self.web_data_file, {})
+        if "records" not in channel:
+            # Full snapshot from an older version: publish it as revision 1
+            records = self._build_records(
+                channel.get("players", []), channel.get("config", {}), channel.get("history", [])
+            )
+            channel = {
+                "revision": 1 if records else 0,
+                "records": {key: {"rev": 1, "value": value} for key, value in records.items()}
             }
+        
+        self._log_lines = 0
+        if os.path.exists(self.web_log_file):
+            with open(self.web_log_file, 'r') as f:
+                for line in f:
+                    try:
+                        delta = json.loads(line)
+                    except ValueError:
+                        continue  # Incomplete write
+                    self._log_lines += 1
+                    if delta["revision"] <= channel.get("revision", 0):
+                        continue  # Already folded into the base before a compaction was cut short
+                    channel["records"].update(delta["changes"])
+                    channel.update({key: delta[key] for key in ("revision", "last_sync", "sync_source")})
+        
+        self._channel, self._channel_signature = channel, signature
+        return channel
+    
+    def _channel_exists(self) -> bool:
+        """Whether anything has been published yet"""
+        return os.path.exists(self.web_data_file) or os.path.exists(self.web_log_file)
+    
+    def get_head(self) -> Dict[str, Any]:
+        """Latest revision and the data version each source last published"""
+        head = self._read_json(self.web_head_file, None)
+        if head is None:
+            head = {"revision": self._load_channel().get("revision", 0), "versions": {}}
+        return head
+    
+    def _publish(self, records: Dict[str, Any], source: str, version: Any = None) -> Optional[int]:
+        """Stamp changed records with a new revision, returns it or None when nothing changed
+        
+        A version (any JSON value identifying the caller's data, such as file
+        signatures) equal to the one this source last published skips the
+        comparison entirely. Without one the records' hash serves as the version.
+        """
+        if version is None:
+            version = self._records_version(records)
+        head = self.get_head()
+        versions = head.get("versions", {})
+        if versions.get(source) == version:
+            return None
+        
+        channel = self._load_channel()
+        revision = channel.get("revision", 0) + 1
+        stored = channel["records"]
+        
+        changes = {}
+        for key, value in records.items():
+            current = stored.get(key)
+            if current is None or current.get("deleted") or current.get("value") != value:
+                changes[key] = {"rev": revision, "value": value}
+        for key, current in stored.items():
+            if key not in records and not current.get("deleted"):
+                changes[key] = {"rev": revision, "deleted": True}
+        
+        versions[source] = version
+        if not changes:
+            self._write_json(self.web_head_file, {"revision": channel.get("revision", 0), "versions": versions})
+            return None
+        
+        delta = {
+            "revision": revision,
+            "last_sync": datetime.now().isoformat(),
+            "sync_source": source,
+            "changes": changes
+        }
+        with open(self.web_log_file, 'a') as f:
+            f.write(json.dumps(delta, separators=(',', ':')) + "\n")
+        stored.update(changes)
+        channel.update({key: delta[key] for key in ("revision", "last_sync", "sync_source")})
+        self._log_lines += 1
+        
+        if self._log_lines >= SYNC_LOG_COMPACT_LINES:
+            self._compact(channel)
+        self._channel_signature = (self._file_signature(self.web_data_file), self._file_signature(self.web_log_file))
+        self._write_json(self.web_head_file, {"revision": revision, "versions": versions})
+        return revision
+    
+    def _compact(self, channel: Dict[str, Any]):
+        """Fold the delta log into web_sync.json and drop tombstones every peer has seen"""
+        applied = min(self._load_terminal_state().get("applied_revision", 0), channel.get("revision", 0))
+        records = channel["records"]
+        pruned = [key for key, record in records.items() if record.get("deleted") and record["rev"] <= applied]
+        for key in pruned:
+            del records[key]
+        if pruned:
+            channel["pruned_revision"] = max(channel.get("pruned_revision", 0), applied)
+        channel["version"] = "2.1"
+        
+        self._write_json(self.web_data_file, channel)
+        if os.path.exists(self.web_log_file):
+            os.remove(self.web_log_file)
+        self._log_lines = 0
+    
+    def get_changes_since(self, revision: int) -> Dict[str, Any]:
+        """Records changed after the given revision, for a peer that has seen it
+        
+        A peer older than the last tombstone pruning gets every live record
+        with "full" set, since deletions it missed are no longer recorded.
+        """
+        head = self.get_head()
+        if head.get("revision", 0) <= revision:
+            return {"revision": head.get("revision", 0), "changes": {}}
+        
+        channel = self._load_channel()
+        if revision < channel.get("pruned_revision", 0):
+            live = {key: record for key, record in channel["records"].items() if not record.get("deleted")}
+            return {"revision": channel["revision"], "changes": live, "full": True}
+        changes = {key: record for key, record in channel["records"].items() if record["rev"] > revision}
+        return {"revision": channel["revision"], "changes": changes}
+    
+    def _load_terminal_state(self) -> Dict[str, Any]:
+        """Last web revision applied to terminal data"""
+        return self._read_json(self.terminal_data_file, {"applied_revision": 0})
+    
+    def sync_terminal_to_web(self, players: List[str], config: Dict[str, Any], history: List[Dict],
+                             version: Any = None) -> bool:
+        """Sync terminal data to web format; unchanged data or version returns without comparing records"""
+        try:
+            revision = self._publish(self._build_records(players, config, history), "terminal", version)
+            if revision is None:
+                return True  # Web data already matches
             
-            with open(self.web_data_file, 'w') as f:
-                json.dump(web_data, f, indent=2)
+            # Web data now mirrors the terminal, so there is nothing to pull back
+            state = self._load_terminal_state()
+            state["applied_revision"] = revision
+            self._write_json(self.terminal_data_file, state)
             
             self._log_sync("terminal_to_web", len(players), len(history))
             return True
@@ -37,36 +228,120 @@ class SyncManager:
     def sync_web_to_terminal(self, storage_manager) -> bool:
         """Sync web data to terminal format"""
         try:
-            if not os.path.exists(self.web_data_file):
+            if not self._channel_exists():
                 return False
             
-            with open(self.web_data_file, 'r') as f:
-                web_data = json.load(f)
+            state = self._load_terminal_state()
+            delta = self.get_changes_since(state.get("applied_revision", 0))
+            if not delta["changes"]:
+                return True  # Nothing new since the last sync
             
-            # Save players to terminal format
-            if 'players' in web_data:
-                storage_manager.save_players(web_data['players'])
-            
-            # Save config
-            if 'config' in web_data:
-                storage_manager.save_config(web_data['config'])
+            if delta.get("full"):
+                players_changed, config_changed, history_changed = self._apply_snapshot(storage_manager)
+            else:
+                players_changed, config_changed, history_changed = self._apply_changes(
+                    storage_manager, delta["changes"]
+                )
             
-            # Save history
-            if 'history' in web_data:
-                storage_manager.save_history(web_data['history'])
+            state["applied_revision"] = delta["revision"]
+            self._write_json(self.terminal_data_file, state)
             
-            self._log_sync("web_to_terminal", len(web_data.get('players', [])), len(web_data.get('history', [])))
+            self._log_sync("web_to_terminal", players_changed, history_changed)
             return True
         except Exception as e:
             print(f"Error syncing web to terminal: {e}")
             return False
     
+    def _apply_changes(self, storage_manager, changes: Dict[str, Any]) -> Tuple[int, int, int]:
+        """Apply changed records to the stores they belong to, returns change counts"""
+        player_changes = {}
+        config_changes = {}
+        history_changes = {}
+        for key, record in changes.items():
+            kind, _, name = key.partition(":")
+            if kind == "player":
+                player_changes[name] = record
+            elif kind == "config":
+                config_changes[name] = record
+            elif kind == "history":
+                history_changes[name] = record
+        
+        # Only stores with changes are loaded and rewritten
+        if player_changes:
+            players = [
+                p for p in storage_manager.load_players()
+                if p.casefold() not in player_changes or not player_changes[p.casefold()].get("deleted")
+            ]
+            known = {p.casefold() for p in players}
+            for key, record in sorted(player_changes.items(), key=lambda item: item[1]["rev"]):
+                if not record.get("deleted") and key not in known:
+                    players.append(record["value"])
+                    known.add(key)
+            storage_manager.save_players(players)
+        
+        if config_changes:
+            config = storage_manager.load_config()
+            for key, record in config_changes.items():
+                if record.get("deleted"):
+                    config.pop(key, None)
+                else:
+                    config[key] = record["value"]
+            storage_manager.save_config(config)
+        
+        if history_changes:
+            removed = {ts for ts, record in history_changes.items() if record.get("deleted")}
+            if removed:
+                history = [e for e in storage_manager.load_history() if e.get("timestamp", "") not in removed]
+                storage_manager.save_history(history)
+            
+            existing = {e.get("timestamp", "") for e in storage_manager.load_history()}
+            added = [
+                record["value"] for ts, record in sorted(history_changes.items())
+                if not record.get("deleted") and ts not in existing
+            ]
+            for entry in added:
+                storage_manager.append_history(entry)
+        
+        return len(player_changes), len(config_changes), len(history_changes)
+    
+    def _apply_snapshot(self, storage_manager) -> Tuple[int, int, int]:
+        """Replace terminal data with the full record set, returns change counts"""
+        snapshot = self._snapshot(self._load_channel())
+        storage_manager.save_players(snapshot["players"])
+        config = storage_manager.load_config()
+        config.update(snapshot["config"])
+        storage_manager.save_config(config)
+        storage_manager.save_history(snapshot["history"])
+        return len(snapshot["players"]), len(snapshot["config"]), len(snapshot["history"])
+    
+    def _snapshot(self, channel: Dict[str, Any]) -> Dict[str, Any]:
+        """Materialize a record set into players, config and history"""
+        players, config, history = [], {}, []
+        live = [(key, record) for key, record in channel.get("records", {}).items() if not record.get("deleted")]
+        for key, record in sorted(live, key=lambda item: (item[1]["rev"], item[0])):
+            kind, _, name = key.partition(":")
+            if kind == "player":
+                players.append(record["value"])
+            elif kind == "config":
+                config[name] = record["value"]
+            elif kind == "history":
+                history.append(record["value"])
+        history.sort(key=lambda entry: entry.get("timestamp", ""))
+        
+        return {
+            "players": players,
+            "config": config,
+            "history": history,
+            "revision": channel.get("revision", 0),
+            "last_sync": channel.get("last_sync"),
+            "sync_source": channel.get("sync_source")
+        }
+    
     def get_web_data(self) -> Optional[Dict[str, Any]]:
         """Get web-formatted data"""
         try:
-            if os.path.exists(self.web_data_file):
-                with open(self.web_data_file, 'r') as f:
-                    return json.load(f)
+            if self._channel_exists():
+                return self._snapshot(self._load_channel())
             return None
         except Exception as e:
             print(f"Error reading web data: {e}")
@@ -76,10 +351,13 @@ class SyncManager:
         """Create a sync file for easy sharing"""
         try:
             if data_type == "web":
-                source_file = self.web_data_file
-            else:
-                source_file = self.terminal_data_file
+                if not self._channel_exists():
+                    return False
+                # The base file alone misses deltas not yet compacted
+                self._write_json(file_path, self._load_channel())
+                return True
             
+            source_file = self.terminal_data_file
             if not os.path.exists(source_file):
                 return False
             
@@ -96,17 +374,25 @@ class SyncManager:
                 sync_data = json.load(f)
             
             if data_type == "web":
-                if merge and os.path.exists(self.web_data_file):
-                    with open(self.web_data_file, 'r') as f:
-                        existing_data = json.load(f)
+                if "records" in sync_data:
+                    sync_data = self._snapshot(sync_data)
+                
+                players = sync_data.get("players", [])
+                config = sync_data.get("config", {})
+                history = sync_data.get("history", [])
+                
+                if merge and self._channel_exists():
+                    existing_data = self._snapshot(self._load_channel())
                     
                     # Merge data
-                    if 'players' in sync_data and 'players' in existing_data:
-                        all_players = list(set(existing_data['players'] + sync_data['players']))
-                        sync_data['players'] = all_players
+                    known = {p.casefold() for p in existing_data["players"]}
+                    players = existing_data["players"] + [p for p in players if p.casefold() not in known]
+                    config = {**existing_data["config"], **config}
+                    timestamps = {e.get("timestamp") for e in history}
+                    history = [e for e in existing_data["history"] if e.get("timestamp") not in timestamps] + history
                 
-                with open(self.web_data_file, 'w') as f:
-                    json.dump(sync_data, f, indent=2)
+                # Publishing only bumps revisions for records that differ
+                self._publish(self._build_records(players, config, history), "import")
             
             return True
         except Exception as e:
@@ -143,10 +429,12 @@ class SyncManager:
     def get_sync_status(self) -> Dict[str, Any]:
         """Get synchronization status"""
         status = {
-            "web_sync_exists": os.path.exists(self.web_data_file),
-            "terminal_sync_exists": os.path.exists(self.terminal_sync_file),
+            "web_sync_exists": self._channel_exists(),
+            "terminal_sync_exists": os.path.exists(self.terminal_data_file),
             "last_sync": None,
-            "sync_count": 0
+            "sync_count": 0,
+            "revision": 0,
+            "applied_revision": 0
         }
         
         try:
@@ -156,6 +444,8 @@ class SyncManager:
                     if logs:
                         status["last_sync"] = logs[-1]["timestamp"]
                         status["sync_count"] = len(logs)
+            status["revision"] = self.get_head().get("revision", 0)
+            status["applied_revision"] = self._load_terminal_state().get("applied_revision", 0)
         except Exception:
             pass
         